@@ -1,4 +1,8 @@
 import logging
+import time
+
+# start of the import stage reported by `lgdash --profile`
+_import_started = time.perf_counter()
 
 __version__ = "0.1.3"
 
@@ -0,0 +1,257 @@
+"""
+Bulk download of past seasons.
+
+Fetching and normalizing are pipelined. A few threads wait on the
+network, paced to the rate limit, and fetch one whole season per
+request. Each response body goes straight to a process pool, which
+decodes the JSON, flattens the matches and writes one file per league
+and season, so parsing never holds up the next request. A checkpoint
+file records the seasons that are written and over, and a run that is
+interrupted picks up where it stopped.
+"""
+
+import gzip
+import importlib.util
+import json
+import logging
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .client import (
+    FINAL_STATUSES,
+    FootballDataClient,
+    FootballDataClientError,
+    RequestPacer,
+    build_matches_df,
+    match_record,
+)
+from .config import BACKFILL_REQUESTS_PER_MINUTE, MAX_CONCURRENT_REQUESTS
+
+logger = logging.getLogger(__name__)
+
+# file extension per format
+FORMATS = {"ndjson": ".ndjson.gz", "parquet": ".parquet"}
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def default_history_dir() -> str:
+    base = os.getenv("XDG_DATA_HOME") or os.path.join(
+        os.path.expanduser("~"), ".local", "share"
+    )
+    return os.path.join(base, "lgdash", "history")
+
+
+def parquet_available() -> bool:
+    return any(
+        importlib.util.find_spec(engine) for engine in ("pyarrow", "fastparquet")
+    )
+
+
+def season_path(directory: str, league: str, season: int, fmt: str) -> str:
+    return os.path.join(directory, league, f"{season}{FORMATS[fmt]}")
+
+
+def normalize_season(
+    content: bytes, league: str, season: int, path: str, fmt: str
+) -> Tuple[int, bool]:
+    """
+    Decode one season's response and write its matches to `path`. Runs
+    in a worker process, so only the counts travel back.
+
+    :param content: Response body of the season's matches
+    :param fmt: One of FORMATS
+    :return: Number of matches, and whether every one is over. A season
+        without fixtures yet writes nothing and is never over.
+    """
+    matches = json.loads(content).get("matches", [])
+    records = [dict(match_record(m), league=league, season=season) for m in matches]
+    if not records:
+        return 0, False
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    os.close(fd)
+    try:
+        if fmt == "parquet":
+            build_matches_df(records).to_parquet(tmp_path, index=False)
+        else:
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record) + "\n")
+        # readers only ever see whole files
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return len(records), all(m["status"] in FINAL_STATUSES for m in matches)
+
+
+class BackfillResult(NamedTuple):
+    league: str
+    season: int
+    matches: int = 0
+    # every match over, so the season won't be fetched again
+    complete: bool = False
+    # already in the checkpoint
+    skipped: bool = False
+    error: Optional[str] = None
+
+
+class Checkpoint:
+    """
+    Seasons already stored, kept as JSON next to the data and rewritten
+    atomically after each one.
+    """
+
+    def __init__(self, directory: str):
+        self.path = os.path.join(directory, CHECKPOINT_FILE)
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.done: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self.done = {}
+
+    @staticmethod
+    def _key(league: str, season: int) -> str:
+        return f"{league}/{season}"
+
+    def __contains__(self, unit: Tuple[str, int]) -> bool:
+        return self._key(*unit) in self.done
+
+    def mark(self, league: str, season: int, matches: int, fmt: str) -> None:
+        self.done[self._key(league, season)] = {"matches": matches, "format": fmt}
+        directory = os.path.dirname(self.path)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.done, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+
+class Backfill:
+    """
+    Downloads seasons for several leagues into a directory, one file per
+    league and season.
+    """
+
+    def __init__(
+        self,
+        client: FootballDataClient,
+        directory: Optional[str] = None,
+        fmt: str = "ndjson",
+        per_minute: float = BACKFILL_REQUESTS_PER_MINUTE,
+        fetchers: int = MAX_CONCURRENT_REQUESTS,
+        workers: Optional[int] = None,
+    ):
+        """
+        :param client: Client to fetch with
+        :param directory: Where files go, defaults to `default_history_dir()`
+        :param fmt: One of FORMATS, parquet needs pyarrow or fastparquet
+        :param per_minute: Requests to spend per minute
+        :param fetchers: Requests in flight at once
+        :param workers: Processes decoding and writing, defaults to one per CPU
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unknown format {fmt}")
+        if fmt == "parquet" and not parquet_available():
+            raise ValueError("Parquet output needs pyarrow or fastparquet installed")
+        self.client = client
+        self.directory = directory or default_history_dir()
+        self.fmt = fmt
+        self.pacer = RequestPacer(per_minute)
+        self.fetchers = fetchers
+        self.workers = workers or os.cpu_count() or 1
+        self.checkpoint = Checkpoint(self.directory)
+
+    def run(
+        self, leagues: List[str], seasons: List[int], resume: bool = True
+    ) -> List[BackfillResult]:
+        """
+        Fetch and store every league and season pair not yet done.
+
+        :param resume: Skip pairs in the checkpoint, else fetch them again
+        :return: One result per pair, skipped ones first
+        """
+        results = []
+        todo = []
+        for league in leagues:
+            for season in seasons:
+                if resume and (league, season) in self.checkpoint:
+                    done = self.checkpoint.done[f"{league}/{season}"]
+                    results.append(
+                        BackfillResult(
+                            league, season, done["matches"], True, skipped=True
+                        )
+                    )
+                else:
+                    todo.append((league, season))
+        if not todo:
+            return results
+
+        previous_pacer = self.client.pacer
+        self.client.pacer = self.pacer
+        # fetch threads are running when workers start, so no fork
+        context = multiprocessing.get_context("spawn")
+        try:
+            with ThreadPoolExecutor(max_workers=self.fetchers) as fetch_pool:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(todo)), mp_context=context
+                ) as process_pool:
+                    results.extend(self._pipeline(todo, fetch_pool, process_pool))
+        finally:
+            self.client.pacer = previous_pacer
+        return results
+
+    def _pipeline(
+        self,
+        todo: List[Tuple[str, int]],
+        fetch_pool: ThreadPoolExecutor,
+        process_pool: ProcessPoolExecutor,
+    ) -> List[BackfillResult]:
+        units: Dict[Future, Tuple[str, int]] = {
+            fetch_pool.submit(self.client.get_season_matches_raw, league, season): (
+                league,
+                season,
+            )
+            for league, season in todo
+        }
+        fetching = set(units)
+        pending = set(units)
+        results = []
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                league, season = units.pop(future)
+                try:
+                    if future in fetching:
+                        path = season_path(self.directory, league, season, self.fmt)
+                        normalizing = process_pool.submit(
+                            normalize_season,
+                            future.result(),
+                            league,
+                            season,
+                            path,
+                            self.fmt,
+                        )
+                        units[normalizing] = (league, season)
+                        pending.add(normalizing)
+                        continue
+                    matches, complete = future.result()
+                except (FootballDataClientError, OSError, ValueError) as e:
+                    logger.warning(f"Could not backfill {league} {season}: {e}")
+                    results.append(BackfillResult(league, season, error=str(e)))
+                    continue
+                if complete:
+                    # a season still being played is fetched again next run
+                    self.checkpoint.mark(league, season, matches, self.fmt)
+                results.append(BackfillResult(league, season, matches, complete))
+        return results
@@ -0,0 +1,256 @@
+"""
+Live board with every league on one screen.
+
+One pane per league with today's matches, plus a standings mini-pane,
+tiled to the terminal width. Each pane keeps the lines it last rendered
+and is drawn again only when the rows it shows change, so a refresh in
+which one score moved costs one table, not seven. Drawing stops once a
+frame's time budget is spent and the remaining panes wait for the next
+frame, which keeps slow displays responsive on a busy matchday.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+from rich import box
+from rich.console import Console, ConsoleOptions, Group, RenderableType, RenderResult
+from rich.segment import Segment
+from rich.table import Table
+from rich.text import Text
+
+from . import profiling
+from .config import BOARD_FRAME_BUDGET, BOARD_PANE_WIDTH, BOARD_STANDINGS_ROWS
+from .display import _extract_season_from_metadata, todays_matches_table
+from .leagues import COMPETITIONS
+
+# what the matches pane shows, a change anywhere else is not redrawn
+MATCH_KEY_COLUMNS = [
+    "home_team",
+    "away_team",
+    "home_score",
+    "away_score",
+    "clean_status",
+    "display_minutes",
+    "local_time",
+]
+STANDINGS_KEY_COLUMNS = ["position", "team", "played", "points", "goal_difference"]
+
+
+def frame_key(df: pd.DataFrame, columns: List[str]) -> Tuple:
+    """
+    Fingerprint of the displayed columns, one hash per row. Equal keys
+    draw the same pane, missing scores included.
+    """
+    if df.empty:
+        return ()
+    return tuple(pd.util.hash_pandas_object(df[columns], index=False))
+
+
+def _league_title(league_code: str) -> Text:
+    league = COMPETITIONS[league_code]
+    return Text(f"{league['icon'].strip()} {league['name']}", style="bold")
+
+
+def matches_pane(league_code: str, df: pd.DataFrame) -> RenderableType:
+    if df.empty:
+        body = Text("No matches today", style="italic")
+    else:
+        body = todays_matches_table(df.copy(), "")
+    return Group(_league_title(league_code), body)
+
+
+def standings_pane(
+    league_code: str, df: pd.DataFrame, metadata: Dict, rows: int
+) -> RenderableType:
+    title = Text.assemble(_league_title(league_code), " Standings")
+    if df.empty:
+        return Group(title, Text("No standings found", style="italic"))
+    season = _extract_season_from_metadata(metadata) if metadata else ""
+    table = Table(title=season or None, box=box.HORIZONTALS, show_header=True)
+    table.add_column("", justify="right")
+    table.add_column("Team", justify="left")
+    table.add_column("Played", justify="right")
+    table.add_column("Points", justify="right")
+    table.add_column("GD", justify="right")
+    for _, row in df.head(rows).iterrows():
+        table.add_row(
+            str(row["position"]),
+            row["team"],
+            str(row["played"]),
+            str(row["points"]),
+            str(row["goal_difference"]),
+        )
+    return Group(title, table)
+
+
+class Pane:
+    """
+    A region of the board and the lines it was last drawn as.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.key: Optional[Tuple] = None
+        self.build: Optional[Callable[[], RenderableType]] = None
+        self.lines: List[List[Segment]] = []
+        self.width = 0
+        # panes with something live go first when the budget is tight
+        self.live = False
+        self.dirty = False
+
+    def set(self, key: Tuple, build: Callable[[], RenderableType]) -> bool:
+        """
+        :param key: Fingerprint of the data, see `frame_key`
+        :param build: Makes the renderable, only called when drawing
+        :return: Whether the pane changed
+        """
+        if key == self.key and self.build is not None:
+            return False
+        self.key = key
+        self.build = build
+        self.dirty = True
+        return True
+
+    def draw(self, console: Console, width: int) -> None:
+        options = console.options.update_width(width)
+        renderable = self.build() if self.build else Text("Loading...")
+        self.lines = console.render_lines(renderable, options, pad=True)
+        self.width = width
+        self.dirty = False
+
+
+@dataclass
+class BoardStats:
+    frames: int = 0
+    # panes drawn, and updates that left a pane as it was
+    drawn: int = 0
+    unchanged: int = 0
+    # frames that ran out of budget with panes still to draw
+    deferred: int = 0
+    # process CPU spent drawing
+    cpu: float = 0.0
+
+
+class LiveBoard:
+    """
+    Matches for several leagues and one league's standings, laid out in
+    a grid. Rendering it yields the cached lines of every pane, so rich's
+    `Live` can refresh it for the cost of copying segments.
+    """
+
+    def __init__(
+        self,
+        leagues: List[str],
+        standings_league: Optional[str] = None,
+        console: Optional[Console] = None,
+        pane_width: int = BOARD_PANE_WIDTH,
+        standings_rows: int = BOARD_STANDINGS_ROWS,
+    ):
+        """
+        :param leagues: League codes, one matches pane each
+        :param standings_league: League for the standings pane, if any
+        :param console: Console the board is drawn for
+        :param pane_width: Narrowest a pane may be
+        :param standings_rows: Teams in the standings pane
+        """
+        self.console = console or Console()
+        self.leagues = leagues
+        self.standings_league = standings_league
+        self.pane_width = pane_width
+        self.standings_rows = standings_rows
+        self.panes: Dict[str, Pane] = {code: Pane(code) for code in leagues}
+        if standings_league:
+            self.panes["standings"] = Pane("standings")
+        self.updated: Optional[str] = None
+        self.stats = BoardStats()
+
+    def _pending(self) -> List[Pane]:
+        # changed panes, and any drawn for a different terminal width
+        _, width = self._pane_width(self.console.width)
+        return [
+            pane for pane in self.panes.values() if pane.dirty or pane.width != width
+        ]
+
+    @property
+    def dirty(self) -> bool:
+        return bool(self._pending())
+
+    def update_matches(self, league_code: str, df: pd.DataFrame) -> bool:
+        """
+        :param df: Today's matches, as from `get_local_matches`
+        :return: Whether the pane will be redrawn
+        """
+        pane = self.panes[league_code]
+        pane.live = not df.empty and bool((df["clean_status"] == "Live").any())
+        changed = pane.set(
+            frame_key(df, MATCH_KEY_COLUMNS), lambda: matches_pane(league_code, df)
+        )
+        if not changed:
+            self.stats.unchanged += 1
+        return changed
+
+    def update_standings(self, df: pd.DataFrame, metadata: Dict) -> bool:
+        """
+        :param df: Standings for `standings_league`
+        :return: Whether the pane will be redrawn
+        """
+        changed = self.panes["standings"].set(
+            frame_key(df, STANDINGS_KEY_COLUMNS),
+            lambda: standings_pane(
+                self.standings_league, df, metadata, self.standings_rows
+            ),
+        )
+        if not changed:
+            self.stats.unchanged += 1
+        return changed
+
+    def _pane_width(self, width: int) -> Tuple[int, int]:
+        columns = max(1, min(len(self.panes), width // self.pane_width))
+        return columns, width // columns
+
+    @profiling.timed("render")
+    def frame(self, budget: float = BOARD_FRAME_BUDGET) -> int:
+        """
+        Draw changed panes, live ones first, until `budget` seconds are
+        spent. At least one pane is drawn so a tiny budget still makes
+        progress.
+
+        :return: Number of panes drawn, 0 means the screen is current
+        """
+        started, cpu_started = time.perf_counter(), time.process_time()
+        _, width = self._pane_width(self.console.width)
+        todo = sorted(self._pending(), key=lambda pane: not pane.live)
+        drawn = 0
+        for pane in todo:
+            if drawn and time.perf_counter() - started >= budget:
+                self.stats.deferred += 1
+                break
+            pane.draw(self.console, width)
+            drawn += 1
+
+        if drawn:
+            self.stats.frames += 1
+            self.stats.drawn += drawn
+        self.stats.cpu += time.process_time() - cpu_started
+        return drawn
+
+    def __rich_console__(
+        self, console: Console, options: ConsoleOptions
+    ) -> RenderResult:
+        columns, width = self._pane_width(options.max_width)
+        panes = list(self.panes.values())
+        blank = [Segment(" " * width)]
+        for start in range(0, len(panes), columns):
+            row = panes[start : start + columns]
+            for i in range(max(len(pane.lines) for pane in row)):
+                for pane in row:
+                    # a pane drawn for another width waits for its frame
+                    line = pane.lines[i] if i < len(pane.lines) else blank
+                    if pane.width != width:
+                        line = Segment.adjust_line_length(line, width)
+                    yield from line
+                yield Segment.line()
+        if self.updated:
+            yield Text(f"Updated {self.updated}", style="dim")
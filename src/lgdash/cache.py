@@ -0,0 +1,266 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import time
+import zlib
+from contextlib import contextmanager
+from datetime import date
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows, entries are still written atomically
+    fcntl = None
+
+from .config import FBD_BASE_URL, FBD_BASE_URL_ENV_VAR
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_ENV_VAR = "LGDASH_CACHE_DIR"
+# a directory every account on the host shares, see `SharedCache`
+SHARED_CACHE_ENV_VAR = "LGDASH_SHARED_CACHE_DIR"
+
+# seconds to wait for another process filling an entry before fetching
+# anyway, longer than a request can take
+LOCK_TIMEOUT = 30
+LOCK_POLL_INTERVAL = 0.05
+
+
+def api_namespace(base_url: Optional[str] = None) -> Optional[str]:
+    """
+    Subdirectory for data from an API other than the real one, e.g. the
+    fake server, so its teams and scores never reach the real cache.
+
+    :param base_url: API root, defaults to $LGDASH_API_URL or the real API
+    :return: None for the real API
+    """
+    base_url = (base_url or os.getenv(FBD_BASE_URL_ENV_VAR) or "").rstrip("/")
+    if not base_url or base_url == FBD_BASE_URL:
+        return None
+    return "api-" + hashlib.sha1(base_url.encode("utf-8")).hexdigest()[:12]
+
+
+def _namespaced(directory: str, base_url: Optional[str] = None) -> str:
+    namespace = api_namespace(base_url)
+    return os.path.join(directory, namespace) if namespace else directory
+
+
+def default_cache_dir(base_url: Optional[str] = None) -> str:
+    """
+    :param base_url: API the data comes from, see `api_namespace`
+    """
+    if os.getenv(CACHE_DIR_ENV_VAR):
+        return _namespaced(os.environ[CACHE_DIR_ENV_VAR], base_url)
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return _namespaced(os.path.join(base, "lgdash"), base_url)
+
+
+def utc_date_key(league: str, day: date) -> str:
+    """
+    Key of one UTC date of a league's matches, as cached by the client.
+    """
+    return f"matches/{league}/{day.isoformat()}"
+
+
+def default_cache(base_url: Optional[str] = None) -> "FileCache":
+    """
+    The host's shared cache if $LGDASH_SHARED_CACHE_DIR is set, otherwise
+    the user's own. Either is kept apart for an API other than the real one.
+
+    :param base_url: API the client talks to, pass the client's own
+        `base_url` when it doesn't come from $LGDASH_API_URL
+    """
+    shared = os.getenv(SHARED_CACHE_ENV_VAR)
+    if shared:
+        return SharedCache(_namespaced(shared, base_url))
+    return FileCache(default_cache_dir(base_url))
+
+
+class FileCache:
+    """
+    JSON-serializable values on disk with a per-entry time to live.
+
+    Entries are written to a temporary file and renamed into place, so a
+    reader sees either the old entry or the new one.
+    """
+
+    suffix = ".json"
+    # permissions of entry files, None leaves them to the umask
+    file_mode: Optional[int] = None
+
+    def __init__(self, directory: Optional[str] = None):
+        """
+        :param directory: Where entries live, defaults to `~/.cache/lgdash`
+        """
+        self.directory = directory or default_cache_dir()
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}{self.suffix}")
+
+    def _encode(self, entry: Dict) -> bytes:
+        return json.dumps(entry).encode("utf-8")
+
+    def _decode(self, data: bytes) -> Dict:
+        return json.loads(data)
+
+    def _make_directory(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get(
+        self, key: str, allow_expired: bool = False, fresh_for: float = 0
+    ) -> Optional[Any]:
+        """
+        :param allow_expired: Also return expired entries, for parts of a
+            value that don't go stale, like kickoff times
+        :param fresh_for: Treat entries expiring within this many seconds
+            as expired already
+        :return: The cached value, or None if missing or expired
+        """
+        try:
+            with open(self._path(key), "rb") as f:
+                entry = self._decode(f.read())
+        except (OSError, ValueError, zlib.error):
+            return None
+        if entry["expires"] < time.time() + fresh_for and not allow_expired:
+            logger.debug(f"Cache expired for {key}")
+            return None
+        logger.debug(f"Cache hit for {key}")
+        return entry["value"]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """
+        :param ttl: Seconds until the entry expires
+        """
+        entry = {"key": key, "expires": time.time() + ttl, "value": value}
+        tmp_path = None
+        try:
+            self._make_directory()
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._encode(entry))
+            if self.file_mode is not None:
+                os.chmod(tmp_path, self.file_mode)
+            os.replace(tmp_path, self._path(key))
+        except OSError as e:
+            # caching is best effort
+            logger.warning(f"Could not write cache entry for {key}: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        Held while a missing entry is fetched and stored. A user's own
+        processes don't wait on each other, see `SharedCache`.
+        """
+        yield
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(self.suffix):
+                os.remove(os.path.join(self.directory, name))
+
+
+class SharedCache(FileCache):
+    """
+    One cache directory for every lgdash process on a host, across user
+    accounts, so each resource is fetched once per time to live for the
+    whole host rather than once per process or user.
+
+    Entries are zlib-compressed JSON, and like `FileCache` are renamed
+    into place, so readers never see half an entry. Filling a missing or
+    expired entry happens under a lock on that key: one process fetches
+    while the others wait, then read its entry instead of calling the API
+    too. Files are created group-writable, so give the directory to a
+    group the accounts share.
+    """
+
+    suffix = ".json.z"
+    file_mode = 0o664
+    # setgid, so new files take the directory's group
+    directory_mode = 0o2775
+
+    def __init__(self, directory: str, lock_timeout: float = LOCK_TIMEOUT):
+        """
+        :param directory: Directory shared by every account
+        :param lock_timeout: Seconds to wait for another process's fetch
+        """
+        super().__init__(directory)
+        self.lock_timeout = lock_timeout
+
+    def _encode(self, entry: Dict) -> bytes:
+        return zlib.compress(super()._encode(entry))
+
+    def _decode(self, data: bytes) -> Dict:
+        return super()._decode(zlib.decompress(data))
+
+    def _make_directory(self) -> None:
+        if os.path.isdir(self.directory):
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            # makedirs applies the umask
+            os.chmod(self.directory, self.directory_mode)
+        except OSError:
+            pass
+
+    @contextmanager
+    def lock(self, key: str) -> Iterator[None]:
+        """
+        An exclusive lock on `key` across processes. If the holder takes
+        longer than `lock_timeout`, e.g. it hung, the caller goes ahead
+        without the lock.
+        """
+        if fcntl is None:
+            yield
+            return
+        self._make_directory()
+        path = self._path(key) + ".lock"
+        try:
+            # read-only is enough for flock, so another account's lock
+            # file works even if its mode ended up narrower
+            fd = os.open(path, os.O_RDONLY | os.O_CREAT, self.file_mode)
+        except OSError as e:
+            logger.warning(f"No lock on {key}, fetching without it: {e}")
+            yield
+            return
+        try:
+            # os.open applies the umask
+            os.fchmod(fd, self.file_mode)
+        except OSError:
+            # someone else's file
+            pass
+        locked = False
+        try:
+            deadline = time.monotonic() + self.lock_timeout
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    locked = True
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.warning(f"Gave up waiting for the lock on {key}")
+                        break
+                    time.sleep(LOCK_POLL_INTERVAL)
+                except OSError as e:
+                    logger.warning(f"No lock on {key}, fetching without it: {e}")
+                    break
+            yield
+        finally:
+            if locked:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
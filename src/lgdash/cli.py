@@ -1,113 +1,1049 @@
 import click
+import json
 import os
+import time
+from dataclasses import asdict
 from datetime import datetime, timedelta
-import pandas as pd
-from typing import Optional
-
-from lgdash.client import FootballDataClient
-from lgdash.config import FBD_ENV_VAR
-from lgdash.display import LeagueDashboard
-from lgdash.leagues import SUPPORTED_LEAGUES, DEFAULT_LEAGUE
-from lgdash import __version__
-
-# TODO: should move this logic so user can use --help without the API key
-api_token = os.getenv(FBD_ENV_VAR)
-if not api_token:
-    # TODO: fail more gracefully
-    raise ValueError(
-        f"API token not found. Please set the {FBD_ENV_VAR} environment variable."
+from functools import lru_cache
+
+from lgdash.completion import complete_league, complete_team, update_index
+from lgdash.config import (
+    BACKFILL_REQUESTS_PER_MINUTE,
+    BOARD_FRAME_BUDGET,
+    BOARD_REFRESH_RATE,
+    DEFAULT_FORM_LENGTH,
+    FBD_ENV_VAR,
+    FS_ENV_VAR,
+    MAX_CONCURRENT_REQUESTS,
+    PROJECTION_SIMULATIONS,
+    SCORERS_TTL,
+    SEASON_MATCHES_TTL,
+    STANDINGS_TTL,
+    TEAMS_TTL,
+    WARM_DAYS,
+    WARM_REQUESTS_PER_MINUTE,
+)
+from lgdash.leagues import COMPETITIONS, SUPPORTED_LEAGUES, DEFAULT_LEAGUE
+from lgdash import __version__, metrics, output, profiling
+import lgdash
+
+# pandas, rich and the API client load on first use, so --help and
+# shell completion start fast and work without the API key
+profiling.record("import", time.perf_counter() - lgdash._import_started)
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    from lgdash.cache import default_cache
+    from lgdash.client import FootballDataClient
+
+    api_token = os.getenv(FBD_ENV_VAR)
+    if not api_token:
+        raise click.ClickException(
+            f"API token not found. Please set the {FBD_ENV_VAR} environment variable."
+        )
+    client = FootballDataClient(api_token)
+    # namespaced on the URL the client resolved, not just $LGDASH_API_URL
+    client.cache = default_cache(client.base_url)
+    return client
+
+
+def _is_league(code: str) -> bool:
+    """
+    Whether a competition code is known. The default leagues and the
+    cached competition list come first, so a default league needs no
+    token, and only a code missing from both asks the client.
+    """
+    if code in COMPETITIONS:
+        return True
+    if not os.getenv(FBD_ENV_VAR):
+        return False
+    return code in get_client().competitions
+
+
+@lru_cache(maxsize=None)
+def get_provider():
+    """
+    football-data.org first, FootyStats as the fallback when a key is set.
+    """
+    client = get_client()
+    footystats_key = os.getenv(FS_ENV_VAR)
+    if not footystats_key:
+        return client
+
+    from lgdash.footystats import FootyStatsClient
+    from lgdash.providers import ProviderRouter
+
+    return ProviderRouter(
+        [client, FootyStatsClient(footystats_key, cache=client.cache)],
+        cache=client.cache,
     )
-client = FootballDataClient(api_token)
-dashboard = LeagueDashboard()
 
 
-def _filter_to_team(df: pd.DataFrame, team: Optional[str]) -> pd.DataFrame:
-    # TODO: normalize team names to allow for case-insensitive matching
-    team_lower = team.lower()
-    if team:
-        return df[
-            (df["home_team"].str.lower() == team_lower)
-            | (df["away_team"].str.lower() == team_lower)
-        ]
-    return df
+@lru_cache(maxsize=None)
+def get_dashboard():
+    from lgdash.display import LeagueDashboard
+
+    return LeagueDashboard()
+
+
+def _query_or_exit(**filters):
+    """
+    A `MatchQuery`, with its validation errors as usage errors.
+    """
+    from lgdash.query import MatchQuery
+
+    try:
+        return MatchQuery(**filters)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+
+
+def _print_query(query, output_format: str, render) -> None:
+    if output_format != "table":
+        rows = get_client().iter_query_matches(query)
+        output.write_rows(rows, output_format, output.MATCH_COLUMNS)
+        return
+    df, _ = get_client().query_matches(query)
+    render(df)
+
+
+def _report_profile():
+    total = time.perf_counter() - lgdash._import_started
+    get_dashboard().profile(profiling.timings(), total)
 
 
 @click.group(invoke_without_command=True)
 @click.version_option(__version__)
 @click.pass_context
-@click.option("--league", "-l", default=DEFAULT_LEAGUE, help="League code.")
-def cli(ctx, league):
+@click.option(
+    "--league",
+    "-l",
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code.",
+)
+@click.option("--profile", is_flag=True, help="Print time spent in each stage.")
+@click.option(
+    "--profile-out",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write a profile of the whole run to this file.",
+)
+@click.option(
+    "--profile-mode",
+    type=click.Choice(["cprofile", "sample"]),
+    default="cprofile",
+    help="cProfile stats or sampled stacks in folded format.",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format for today's matches.",
+)
+@click.option(
+    "--date",
+    "match_date",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Show this local date instead of today, e.g. yesterday's results.",
+)
+def cli(ctx, league, profile, profile_out, profile_mode, output_format, match_date):
     """
     Command line tool for displaying live soccer scores and statistics.
     Default behavior is to show today's matches.
     """
+    # close callbacks run last-in first-out, so the profiler stops first
+    ctx.call_on_close(metrics.REGISTRY.flush)
+    if profile:
+        ctx.call_on_close(_report_profile)
+    if profile_out:
+        from lgdash.profiling import RunProfiler
+
+        profiler = RunProfiler(profile_out, mode=profile_mode)
+        profiler.start()
+        ctx.call_on_close(profiler.stop)
+
     if not ctx.invoked_subcommand:
-        if league in SUPPORTED_LEAGUES.keys():
+        if _is_league(league):
             today = datetime.now().strftime("%Y-%m-%d")
-            df, _ = client.get_matches(start_date=today, end_date=today, league=league)
+            day = match_date.strftime("%Y-%m-%d") if match_date else today
+            if output_format != "table":
+                rows = get_client().iter_local_matches(
+                    start_date=day, end_date=day, league=league
+                )
+                output.write_rows(rows, output_format, output.MATCH_COLUMNS)
+                return
+            df, _ = get_client().get_local_matches(
+                start_date=day, end_date=day, league=league
+            )
 
-            dashboard.today(league, df)
+            title = "Today's Matches" if day == today else f"Matches on {day}"
+            get_dashboard().today(league, df, title=title)
         else:
             click.echo(f"League code {league} is not supported.")
 
 
 @cli.command()
-@click.option("--league", "-l", type=str, default=DEFAULT_LEAGUE, help="League code")
-@click.option("--team", "-t", type=str, help="Team name, as it appears in the app")
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--team",
+    "-t",
+    type=str,
+    shell_complete=complete_team,
+    help="Team name, as it appears in the app",
+)
 @click.option("--days", "-d", type=int, default=7, help="Days in future")
-def schedule(league, team, days):
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+def schedule(league, team, days, output_format):
     """
     Scheduled matches after today. Defaults to next 14 days.
     """
-    if league in SUPPORTED_LEAGUES.keys():
+    if _is_league(league):
         now = datetime.now()
-        start_date = now.strftime("%Y-%m-%d")
-        end_date = (now + timedelta(days=days)).strftime("%Y-%m-%d")
-        df, _ = client.get_matches(
-            start_date=start_date, end_date=end_date, league=league
+        query = _query_or_exit(
+            league=league,
+            status=["upcoming"],
+            team=team,
+            date_from=now.strftime("%Y-%m-%d"),
+            date_to=(now + timedelta(days=days)).strftime("%Y-%m-%d"),
         )
+        _print_query(
+            query, output_format, lambda df: get_dashboard().schedule(league, df)
+        )
+    else:
+        click.echo(f"League code {league} is not supported.")
 
-        # okay if df becomes empty, dashboard handles that case
-        if team:
-            df = df if df.empty else _filter_to_team(df, team)
 
-        dashboard.schedule(league, df)
-    else:
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--status",
+    "-s",
+    type=click.Choice(["live", "upcoming", "finished", "postponed"]),
+    multiple=True,
+    help="Match status, can be repeated",
+)
+@click.option(
+    "--team",
+    "-t",
+    type=str,
+    shell_complete=complete_team,
+    help="Team name or three letter code",
+)
+@click.option("--matchday", "-m", type=int, help="Matchday")
+@click.option(
+    "--from",
+    "date_from",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="First local date",
+)
+@click.option(
+    "--to",
+    "date_to",
+    type=click.DateTime(formats=["%Y-%m-%d"]),
+    help="Last local date",
+)
+@click.option(
+    "--home/--away",
+    "home",
+    default=None,
+    help="Only the team's home or away matches",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+def matches(league, status, team, matchday, date_from, date_to, home, output_format):
+    """
+    This season's matches, filtered. The API does the filtering where it
+    can, so only matching matches are downloaded.
+    """
+    venue = None if home is None else ("home" if home else "away")
+    query = _query_or_exit(
+        league=league,
+        status=list(status) or None,
+        team=team,
+        matchday=matchday,
+        date_from=date_from.strftime("%Y-%m-%d") if date_from else None,
+        date_to=date_to.strftime("%Y-%m-%d") if date_to else None,
+        venue=venue,
+    )
+    if not _is_league(league):
         click.echo(f"League code {league} is not supported.")
+        return
+    _print_query(query, output_format, lambda df: get_dashboard().matches(league, df))
 
 
 @cli.command()
-@click.option("--league", "-l", default=DEFAULT_LEAGUE, help="")
-def standings(league):
+@click.option(
+    "--league",
+    "-l",
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="",
+)
+@click.option(
+    "--live",
+    is_flag=True,
+    help="Compute the table from match results, counting matches in progress",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+@click.option("--race", is_flag=True, help="Ask every data provider, use the first")
+@click.option(
+    "--as-of",
+    "as_of",
+    type=click.IntRange(min=1),
+    help="The table after this matchday instead",
+)
+def standings(league, live, output_format, race, as_of):
     """
     Current standings for the league.
     """
-    if league in SUPPORTED_LEAGUES.keys():
-        df, metadata = client.get_standings(league=league)
+    from lgdash.providers import ProviderRouter
+
+    if live and as_of:
+        raise click.UsageError("Use either --live or --as-of.")
+    if _is_league(league):
+        provider = get_provider()
+        if isinstance(provider, ProviderRouter):
+            provider.race = race
+        if as_of:
+            from lgdash.standings import season_metadata
 
-        dashboard.standings(league, df, metadata=metadata)
+            timeline, metadata = _season_timeline(league)
+            try:
+                df = timeline.table(as_of)
+            except ValueError as e:
+                raise click.BadParameter(str(e), param_hint="--as-of")
+            if output_format != "table":
+                output.write_rows(
+                    df.to_dict("records"), output_format, output.STANDINGS_COLUMNS
+                )
+                return
+            get_dashboard().standings(
+                league,
+                df,
+                metadata=season_metadata(metadata),
+                title=f"Standings after Matchday {as_of}",
+            )
+            return
+        if live:
+            from lgdash.standings import LiveTable, season_metadata
+
+            season_df, metadata = get_client().get_matches(
+                league=league, ttl=SEASON_MATCHES_TTL
+            )
+            if season_df.empty:
+                df = season_df
+            else:
+                table = LiveTable(season_df, league)
+                # the season pull may be cached, today's scores are not
+                today = datetime.now().strftime("%Y-%m-%d")
+                today_df, _ = get_client().get_local_matches(
+                    start_date=today, end_date=today, league=league
+                )
+                table.update(today_df)
+                df = table.table()
+            if output_format != "table":
+                output.write_rows(
+                    df.to_dict("records"), output_format, output.STANDINGS_COLUMNS
+                )
+                return
+            get_dashboard().standings(
+                league, df, metadata=season_metadata(metadata), title="Live Standings"
+            )
+            return
+        # through the provider, so every format gets failover and --race
+        df, metadata = provider.get_standings(league=league, ttl=STANDINGS_TTL)
+        if output_format != "table":
+            output.write_rows(
+                df.to_dict("records"), output_format, output.STANDINGS_COLUMNS
+            )
+            return
+        get_dashboard().standings(league, df, metadata=metadata)
     else:
         click.echo(f"League code {league} is not supported.")
 
 
+def _season_timeline(league: str):
+    """
+    The season's `StandingsTimeline`, from one cached season of matches.
+    """
+    from lgdash.standings import StandingsTimeline
+
+    season_df, metadata = get_client().get_matches(
+        league=league, ttl=SEASON_MATCHES_TTL
+    )
+    return StandingsTimeline(season_df, league), metadata
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--last", "-n", type=click.IntRange(min=1), help="Only the latest matchdays"
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+def timeline(league, last, output_format):
+    """
+    Every team's position after each matchday this season.
+    """
+    if not _is_league(league):
+        click.echo(f"League code {league} is not supported.")
+        return
+
+    from lgdash.standings import season_metadata
+
+    season_timeline, metadata = _season_timeline(league)
+    if output_format != "table":
+        rows = season_timeline.records()
+        output.write_rows(rows, output_format, output.TIMELINE_COLUMNS)
+        return
+    get_dashboard().timeline(
+        league, season_timeline.positions(last), metadata=season_metadata(metadata)
+    )
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    "league_codes",
+    type=str,
+    multiple=True,
+    shell_complete=complete_league,
+    help="League code, can be repeated",
+)
+@click.option("--all", "all_leagues", is_flag=True, help="All supported leagues")
+@click.option(
+    "--simulations",
+    "-n",
+    type=click.IntRange(min=1),
+    default=PROJECTION_SIMULATIONS,
+    show_default=True,
+    help="Seasons simulated per league",
+)
+@click.option(
+    "--seed", type=click.IntRange(min=0), default=0, help="Same seed, same odds"
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    help="Processes simulating, defaults to one per CPU",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+def projections(league_codes, all_leagues, simulations, seed, workers, output_format):
+    """
+    Title, top places and relegation odds from simulating the rest of the season.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    from lgdash.projections import Projector
+
+    if all_leagues:
+        league_codes = list(SUPPORTED_LEAGUES.keys())
+    league_codes = list(dict.fromkeys(league_codes)) or [DEFAULT_LEAGUE]
+    unsupported = [code for code in league_codes if not _is_league(code)]
+    if unsupported:
+        click.echo(f"League code {unsupported[0]} is not supported.")
+        return
+
+    def fetch(league: str):
+        df, _ = get_client().get_matches(league=league, ttl=SEASON_MATCHES_TTL)
+        return df
+
+    with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+        seasons = dict(zip(league_codes, pool.map(fetch, league_codes)))
+    projector = Projector(
+        cache=get_client().cache, simulations=simulations, seed=seed, workers=workers
+    )
+    odds = projector.run(seasons)
+
+    if output_format != "table":
+        rows = [
+            {"league": league, **row}
+            for league, df in odds.items()
+            for row in df.to_dict("records")
+        ]
+        output.write_rows(rows, output_format, output.PROJECTIONS_COLUMNS)
+        return
+    for league, df in odds.items():
+        get_dashboard().projections(league, df, simulations)
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--interval", "-i", type=float, default=60, help="Seconds between refreshes"
+)
+@click.option(
+    "--record",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Save the session to a recording file",
+)
+@click.option(
+    "--replay",
+    type=click.Path(exists=True, dir_okay=False),
+    help="Play back a recording instead of calling the API",
+)
+@click.option("--speed", type=float, default=1.0, help="Playback speed for --replay")
+def watch(league, interval, record, replay, speed):
+    """
+    Today's matches, refreshed in place with goal and status notifications.
+    """
+    if _is_league(league):
+        from lgdash.events import GoalEvent, MatchEventEngine
+        from lgdash.recording import ReplayClient, SessionRecorder
+
+        source = ReplayClient(replay, speed=speed) if replay else get_client()
+        engine = MatchEventEngine()
+        engine.subscribe(get_dashboard().notify, GoalEvent)
+        source.add_matches_hook(engine.update)
+        recorder = SessionRecorder(record) if record else None
+        if recorder:
+            recorder.attach(source)
+        try:
+            while True:
+                if replay:
+                    # recordings are played back as captured, whatever the date
+                    df, _ = source.get_matches(league=league)
+                else:
+                    today = datetime.now().strftime("%Y-%m-%d")
+                    df, _ = source.get_local_matches(
+                        start_date=today, end_date=today, league=league
+                    )
+                get_dashboard().watch(league, df, engine.recent)
+                if replay and source.finished:
+                    break
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            source.remove_matches_hook(engine.update)
+            if recorder:
+                recorder.detach(source)
+                recorder.close()
+    else:
+        click.echo(f"League code {league} is not supported.")
+
+
+def _update_board(live_board, today: str) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from lgdash.providers import ProviderError
+
+    def fetch(league: str):
+        df, _ = get_client().get_local_matches(
+            start_date=today, end_date=today, league=league
+        )
+        return df
+
+    try:
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            frames = list(pool.map(fetch, live_board.leagues))
+        for league, df in zip(live_board.leagues, frames):
+            live_board.update_matches(league, df)
+        if live_board.standings_league:
+            df, metadata = get_provider().get_standings(
+                league=live_board.standings_league, ttl=STANDINGS_TTL
+            )
+            live_board.update_standings(df, metadata)
+    except ProviderError:
+        # keep showing the last good data, the next refresh may work
+        live_board.updated = f"{live_board.updated or '-'}, update failed"
+        return
+    live_board.updated = datetime.now().strftime("%H:%M:%S")
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    "league_codes",
+    type=str,
+    multiple=True,
+    shell_complete=complete_league,
+    help="League code, can be repeated, defaults to all",
+)
+@click.option(
+    "--standings",
+    "standings_league",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League for the standings pane",
+)
+@click.option(
+    "--interval", "-i", type=float, default=60, help="Seconds between refreshes"
+)
+@click.option(
+    "--fps",
+    type=click.FloatRange(min=0, min_open=True),
+    default=BOARD_REFRESH_RATE,
+    help="Most frames drawn per second",
+)
+@click.option(
+    "--budget",
+    type=click.FloatRange(min=0),
+    default=BOARD_FRAME_BUDGET * 1000,
+    help="Milliseconds of drawing per frame, more waits for the next one",
+)
+@click.option("--stats", "show_stats", is_flag=True, help="Print CPU use on exit")
+def board(league_codes, standings_league, interval, fps, budget, show_stats):
+    """
+    Today's matches in every league on one screen, with standings.
+    """
+    league_codes = list(league_codes) or list(SUPPORTED_LEAGUES.keys())
+    unsupported = [
+        code for code in league_codes + [standings_league] if not _is_league(code)
+    ]
+    if unsupported:
+        click.echo(f"League code {unsupported[0]} is not supported.")
+        return
+
+    from rich.live import Live
+
+    from lgdash.board import LiveBoard
+
+    dashboard = get_dashboard()
+    live_board = LiveBoard(league_codes, standings_league, console=dashboard.console)
+    started, cpu_started = time.perf_counter(), time.process_time()
+    with Live(
+        live_board, console=dashboard.console, screen=True, auto_refresh=False
+    ) as live:
+        try:
+            next_update = 0.0
+            while True:
+                updated = time.monotonic() >= next_update
+                if updated:
+                    today = datetime.now().strftime("%Y-%m-%d")
+                    _update_board(live_board, today)
+                    next_update = time.monotonic() + interval
+                if live_board.frame(budget / 1000) or updated:
+                    live.refresh()
+                # once the screen is current, only a resize needs a frame
+                # before the next update
+                if live_board.dirty:
+                    time.sleep(1 / fps)
+                else:
+                    time.sleep(min(1.0, max(0.0, next_update - time.monotonic())))
+        except KeyboardInterrupt:
+            pass
+    if show_stats:
+        dashboard.board_stats(
+            asdict(live_board.stats),
+            time.process_time() - cpu_started,
+            time.perf_counter() - started,
+        )
+
+
 @cli.command()
 def leagues():
     """
-    Supported leagues and their codes for reference.
+    Supported leagues and their codes for reference. With an API token,
+    every competition the API serves is listed too.
     """
-    dashboard.leagues()
+    if os.getenv(FBD_ENV_VAR):
+        # loads the competition list, from the cache unless a week old
+        len(get_client().competitions)
+    get_dashboard().leagues()
 
 
 @cli.command()
-@click.option("--league", "-l", default=DEFAULT_LEAGUE, help="")
-def teams(league):
+@click.option(
+    "--league",
+    "-l",
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table"] + output.FORMATS),
+    default="table",
+    help="Output format",
+)
+def teams(league, output_format):
     """
     List of teams in the league for reference.
     """
-    if league in SUPPORTED_LEAGUES.keys():
-        df, _ = client.get_teams(league=league)
+    if _is_league(league):
+        if output_format != "table":
+            rows = list(get_client().iter_teams(league=league, ttl=TEAMS_TTL))
+            update_index(league, rows)
+            output.write_rows(rows, output_format, output.TEAMS_COLUMNS)
+            return
+        df, _ = get_client().get_teams(league=league, ttl=TEAMS_TTL)
+        # keeps shell completion in step with what was just shown
+        update_index(league, df.to_dict("records"))
+
+        get_dashboard().teams(league, df)
+    else:
+        click.echo(f"League code {league} is not supported.")
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    "league_codes",
+    type=str,
+    multiple=True,
+    shell_complete=complete_league,
+    help="League code, can be repeated",
+)
+@click.option("--all", "all_leagues", is_flag=True, help="All supported leagues")
+@click.option("--limit", "-n", type=int, default=10, help="Number of players")
+@click.option("--race", is_flag=True, help="Ask every data provider, use the first")
+def scorers(league_codes, all_leagues, limit, race):
+    """
+    Top scorers for one or more leagues.
+    """
+    from lgdash.providers import ProviderRouter
+
+    if all_leagues:
+        league_codes = list(SUPPORTED_LEAGUES.keys())
+    league_codes = list(league_codes) or [DEFAULT_LEAGUE]
+    unsupported = [code for code in league_codes if not _is_league(code)]
+    if unsupported:
+        click.echo(f"League code {unsupported[0]} is not supported.")
+        return
+
+    provider = get_provider()
+    if isinstance(provider, ProviderRouter):
+        provider.race = race
+
+    if len(league_codes) == 1:
+        df, _ = provider.get_scorers(league_codes[0], limit=limit, ttl=SCORERS_TTL)
+    else:
+        df, _ = provider.get_scorers_for_leagues(
+            league_codes, limit=limit, ttl=SCORERS_TTL
+        )
+    get_dashboard().scorers(league_codes, df)
+
+
+@cli.command()
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["table", "prometheus", "json"]),
+    default="table",
+    help="Output format",
+)
+@click.option(
+    "--textfile",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Also write a Prometheus textfile here",
+)
+@click.option("--reset", is_flag=True, help="Clear recorded metrics")
+def stats(output_format, textfile, reset):
+    """
+    Request latency, errors, cache hit rate and quota across past runs.
+    """
+    path = metrics.default_metrics_path()
+    if reset:
+        if os.path.exists(path):
+            os.remove(path)
+        click.echo("Metrics cleared.")
+        return
+
+    registry = metrics.load(path)
+    if textfile:
+        metrics.write_textfile(registry, textfile)
+    if output_format == "prometheus":
+        click.echo(registry.to_prometheus(), nl=False)
+    elif output_format == "json":
+        click.echo(json.dumps(registry.snapshot(), indent=2))
+    else:
+        quota = next(
+            (
+                g["value"]
+                for g in registry.snapshot()["gauges"]
+                if g["name"] == "lgdash_quota_remaining"
+            ),
+            None,
+        )
+        get_dashboard().metrics(registry.summary(), registry.cache_hit_rate(), quota)
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    "league_codes",
+    type=str,
+    multiple=True,
+    shell_complete=complete_league,
+    help="League code, can be repeated",
+)
+@click.option("--all", "all_leagues", is_flag=True, help="All supported leagues")
+@click.option(
+    "--days", "-d", type=int, default=WARM_DAYS, help="Days of fixtures to fetch"
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=WARM_REQUESTS_PER_MINUTE,
+    help="Requests to spend per minute",
+)
+@click.option("--force", is_flag=True, help="Warm even while matches are on")
+def warm(league_codes, all_leagues, days, rate, force):
+    """
+    Prefetch fixtures, standings and teams while no matches are on, e.g.
+    from cron, so later commands are served from the cache.
+    """
+    if all_leagues:
+        league_codes = list(SUPPORTED_LEAGUES.keys())
+    league_codes = list(league_codes) or [DEFAULT_LEAGUE]
+    unsupported = [code for code in league_codes if not _is_league(code)]
+    if unsupported:
+        click.echo(f"League code {unsupported[0]} is not supported.")
+        return
+
+    from lgdash.warm import CacheWarmer, next_window
+
+    warmer = CacheWarmer(get_client(), league_codes, days=days, per_minute=rate)
+    peak = warmer.current_peak()
+    if peak and not force:
+        get_dashboard().warm([], peak, in_peak=True)
+        return
+    results = warmer.run(force=force)
+    for result in results:
+        if result.item == "teams" and result.error is None:
+            # served from the entries just warmed
+            rows = get_client().iter_teams(league=result.league, ttl=TEAMS_TTL)
+            update_index(result.league, rows)
+    get_dashboard().warm(results, next_window(warmer.windows(), warmer.clock()))
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    "league_codes",
+    type=str,
+    multiple=True,
+    shell_complete=complete_league,
+    help="League code, can be repeated, defaults to all",
+)
+@click.option(
+    "--season",
+    "-s",
+    "seasons",
+    type=int,
+    multiple=True,
+    required=True,
+    help="Starting year of a season, e.g. 2023 for 2023/24, can be repeated",
+)
+@click.option(
+    "--out",
+    "-o",
+    type=click.Path(file_okay=False, writable=True),
+    help="Directory for the data, defaults to ~/.local/share/lgdash/history",
+)
+@click.option(
+    "--format",
+    "output_format",
+    type=click.Choice(["ndjson", "parquet"]),
+    default="ndjson",
+    help="Gzipped NDJSON, or Parquet if pyarrow is installed",
+)
+@click.option(
+    "--rate",
+    type=click.FloatRange(min=0, min_open=True),
+    default=BACKFILL_REQUESTS_PER_MINUTE,
+    help="Requests to spend per minute",
+)
+@click.option(
+    "--workers", type=click.IntRange(min=1), help="Processes parsing responses"
+)
+@click.option("--restart", is_flag=True, help="Ignore the checkpoint, fetch it all")
+def backfill(league_codes, seasons, out, output_format, rate, workers, restart):
+    """
+    Download past seasons' matches, one file per league and season.
+    Interrupted runs resume where they stopped.
+    """
+    league_codes = list(league_codes) or list(SUPPORTED_LEAGUES.keys())
+    unsupported = [code for code in league_codes if not _is_league(code)]
+    if unsupported:
+        click.echo(f"League code {unsupported[0]} is not supported.")
+        return
+
+    from lgdash.backfill import Backfill
+
+    try:
+        job = Backfill(
+            get_client(), out, fmt=output_format, per_minute=rate, workers=workers
+        )
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    results = job.run(league_codes, sorted(set(seasons)), resume=not restart)
+    get_dashboard().backfill(results, job.directory)
+
+
+def _season_stats(league: str):
+    from lgdash.stats import season_stats
+
+    client = get_client()
+    df, metadata = client.get_matches(league=league, ttl=SEASON_MATCHES_TTL)
+    season = metadata.get("filters", {}).get("season")
+    return None if df.empty else season_stats(df, league, season, client.cache)
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--team",
+    "-t",
+    type=str,
+    shell_complete=complete_team,
+    help="Team name or three letter code",
+)
+@click.option(
+    "--last", "-n", type=int, default=DEFAULT_FORM_LENGTH, help="Number of matches"
+)
+def form(league, team, last):
+    """
+    Recent results for each team in the league.
+    """
+    if _is_league(league):
+        import pandas as pd
+
+        stats = _season_stats(league)
+        try:
+            df = stats.form(team=team, last=last) if stats else pd.DataFrame()
+        except ValueError as e:
+            click.echo(str(e))
+            return
+        get_dashboard().form(league, df, last)
+    else:
+        click.echo(f"League code {league} is not supported.")
+
+
+@cli.command()
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+@click.option(
+    "--team",
+    "-t",
+    type=str,
+    shell_complete=complete_team,
+    help="Team name or three letter code",
+)
+def splits(league, team):
+    """
+    Home and away records for each team in the league.
+    """
+    if _is_league(league):
+        import pandas as pd
+
+        stats = _season_stats(league)
+        try:
+            df = stats.splits(team=team) if stats else pd.DataFrame()
+        except ValueError as e:
+            click.echo(str(e))
+            return
+        get_dashboard().splits(league, df)
+    else:
+        click.echo(f"League code {league} is not supported.")
+
+
+@cli.command()
+@click.argument("team", shell_complete=complete_team)
+@click.argument("opponent", shell_complete=complete_team)
+@click.option(
+    "--league",
+    "-l",
+    type=str,
+    default=DEFAULT_LEAGUE,
+    shell_complete=complete_league,
+    help="League code",
+)
+def h2h(team, opponent, league):
+    """
+    This season's meetings between two teams.
+    """
+    if _is_league(league):
+        import pandas as pd
 
-        dashboard.teams(league, df)
+        stats = _season_stats(league)
+        if stats is None:
+            get_dashboard().head_to_head(league, {}, pd.DataFrame())
+            return
+        try:
+            summary, df = stats.head_to_head(team, opponent)
+        except ValueError as e:
+            click.echo(str(e))
+            return
+        get_dashboard().head_to_head(league, summary, df)
     else:
         click.echo(f"League code {league} is not supported.")
 
@@ -1,17 +1,45 @@
 import requests
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import threading
+import time
+from contextlib import ExitStack
+from itertools import islice
+from datetime import date, datetime, timedelta, timezone, tzinfo
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# from datetime import datetime, timedelta
 import pandas as pd
 from tzlocal import get_localzone
 
-from .leagues import SUPPORTED_LEAGUES
-from .config import FBD_BASE_URL
+from . import profiling
+from .cache import FileCache, utc_date_key
+from .leagues import (
+    COMPETITIONS,
+    COMPETITIONS_CACHE_KEY,
+    CompetitionRegistry,
+)
+from .metrics import REGISTRY, MetricsRegistry
+from .providers import DataProvider, ProviderError
+from .query import MatchQuery, plan_query, predicates
+from .standings import STANDINGS_COLUMNS
+from .config import (
+    COMPETITIONS_TTL,
+    FBD_BASE_URL,
+    FBD_BASE_URL_ENV_VAR,
+    FINISHED_MATCHES_TTL,
+    LIVE_MATCHES_TTL,
+    REQUEST_TIMEOUT,
+    SCORERS_PAGE_SIZE,
+    TEAMS_TTL,
+    UPCOMING_MATCHES_TTL,
+)
 
 logger = logging.getLogger(__name__)
 
 
+SCORERS_COLUMNS = ["name", "team", "tla", "played", "goals", "assists", "penalties"]
+
+
 def format_status(status: Optional[str]) -> str:
     if status == "IN_PLAY":
         return "Live"
@@ -36,50 +64,310 @@ def format_display_minutes(minutes: Optional[int], injury_time: Optional[int]) -
     return f"{minutes}+{injury_time}'"
 
 
-class FootballDataClientError(Exception):
+def match_record(match: Dict) -> Dict:
+    """
+    Flatten one raw match into the base columns of the matches frame.
+    """
+    return {
+        "id": match["id"],
+        "home_team_id": match["homeTeam"]["id"],
+        "away_team_id": match["awayTeam"]["id"],
+        "home_team": match["homeTeam"]["shortName"],
+        "home_team_code": match["homeTeam"]["tla"],
+        "home_score": match["score"]["fullTime"]["home"],
+        "away_team": match["awayTeam"]["shortName"],
+        "away_team_code": match["awayTeam"]["tla"],
+        "away_score": match["score"]["fullTime"]["away"],
+        "status": match["status"],
+        "minute": match["minute"],
+        "injury_time": match["injuryTime"],
+        "matchday": match["matchday"],
+        "stage": match.get("stage"),
+        "utc_datetime": match["utcDate"],
+    }
+
+
+def standing_record(team: Dict) -> Dict:
+    return {
+        "position": team["position"],
+        "team": team["team"]["shortName"],
+        "tla": team["team"]["tla"],
+        "crest": team["team"]["crest"],
+        "points": team["points"],
+        "played": team["playedGames"],
+        "won": team["won"],
+        "draw": team["draw"],
+        "lost": team["lost"],
+        "goals_for": team["goalsFor"],
+        "goals_against": team["goalsAgainst"],
+        "goal_difference": team["goalDifference"],
+        # "form": team["form"],
+    }
+
+
+def team_record(team: Dict) -> Dict:
+    return {
+        "id": team["id"],
+        "team": team["shortName"],
+        "team_long": team["name"],
+        "tla": team["tla"],
+        "area": team["area"]["name"],
+    }
+
+
+def build_standings_df(records: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Standings frame in the normalized schema, from `standing_record`
+    shaped dicts. Shared by every provider.
+    """
+    df = pd.DataFrame.from_records(records, columns=STANDINGS_COLUMNS)
+
+    # format columns
+    df["points"] = df["points"].astype("Int64")
+    df["played"] = df["played"].astype("Int64")
+    df["won"] = df["won"].astype("Int64")
+    df["draw"] = df["draw"].astype("Int64")
+    df["lost"] = df["lost"].astype("Int64")
+    df["goals_for"] = df["goals_for"].astype("Int64")
+    df["goals_against"] = df["goals_against"].astype("Int64")
+    df["goal_difference"] = df["goal_difference"].astype("Int64")
+
+    return df
+
+
+def build_scorers_df(records: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Scorers frame in the normalized schema, from dicts keyed by
+    SCORERS_COLUMNS. Shared by every provider.
+    """
+    df = pd.DataFrame.from_records(records, columns=SCORERS_COLUMNS)
+
+    # format columns
+    df["played"] = df["played"].astype("Int64")
+    df["goals"] = df["goals"].astype("Int64").fillna(0)
+    df["assists"] = df["assists"].astype("Int64").fillna(0)
+    df["penalties"] = df["penalties"].astype("Int64").fillna(0)
+
+    return df
+
+
+def build_matches_df(records: Iterable[Dict]) -> pd.DataFrame:
+    """
+    Matches frame with only the columns from `match_record`, in UTC.
+    """
+    df = pd.DataFrame(list(records))
+
+    # format columns
+    df["utc_datetime"] = pd.to_datetime(df["utc_datetime"])
+    # nullable integers
+    df["home_score"] = df["home_score"].astype("Int64")
+    df["away_score"] = df["away_score"].astype("Int64")
+    df["minute"] = df["minute"].astype("Int64")
+    df["injury_time"] = df["injury_time"].astype("Int64")
+    df["matchday"] = df["matchday"].astype("Int64")
+
+    return df
+
+
+FINAL_STATUSES = {"FINISHED", "AWARDED", "POSTPONED", "CANCELLED", "SUSPENDED"}
+
+
+def _contiguous_runs(days: List[date]) -> List[List[date]]:
+    """
+    Sorted dates split into runs of consecutive days.
+    """
+    runs: List[List[date]] = []
+    for day in days:
+        if runs and day - runs[-1][-1] == timedelta(days=1):
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+def _utc_date_ttl(
+    day: date,
+    matches: List[Dict],
+    now: datetime,
+    upcoming_ttl: int = UPCOMING_MATCHES_TTL,
+) -> int:
+    """
+    How long one UTC date of matches can be reused. Anything live or
+    about to kick off is refreshed almost every time, a date where every
+    match is over is good for a day.
+
+    :param upcoming_ttl: Cap for dates with matches still to come
+    """
+    pending = [m for m in matches if m["status"] not in FINAL_STATUSES]
+    if not pending:
+        return FINISHED_MATCHES_TTL if day < now.date() else upcoming_ttl
+    if any(m["status"] in ("IN_PLAY", "PAUSED") for m in pending):
+        return LIVE_MATCHES_TTL
+    next_kickoff = min(datetime.fromisoformat(m["utcDate"]) for m in pending)
+    until_kickoff = (next_kickoff - now).total_seconds()
+    return int(max(LIVE_MATCHES_TTL, min(upcoming_ttl, until_kickoff)))
+
+
+def match_row(match: Dict, timezone: tzinfo) -> Dict:
+    """
+    Same fields as a matches frame row, computed for a single match
+    without pandas, for streaming output. Datetimes are ISO strings.
+    """
+    row = match_record(match)
+    local = datetime.fromisoformat(row["utc_datetime"]).astimezone(timezone)
+    row["clean_status"] = format_status(row["status"])
+    row["display_minutes"] = format_display_minutes(row["minute"], row["injury_time"])
+    row["local_datetime"] = local.isoformat()
+    row["local_date"] = local.strftime("%Y-%m-%d")
+    row["local_time"] = local.strftime("%H:%M")
+    row["local_tz"] = local.strftime("%Z")
+    return row
+
+
+class FootballDataClientError(ProviderError):
     """Custom exception for football-data.com API errors."""
 
     pass
 
 
-class FootballDataClient:
-    def __init__(self, api_token: str):
+class RequestPacer:
+    """
+    Spaces API calls at least `60 / per_minute` seconds apart, across
+    threads, so a batch of requests is spread over the rate limit window
+    instead of spending it in one burst.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        :param per_minute: Requests allowed per minute
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.interval = 60 / per_minute
+        self.requests = 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """
+        Block until the next request may go out, and claim its slot.
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+            self.requests += 1
+        if start > now:
+            logger.debug(f"Pacing request for {start - now:.1f}s")
+            time.sleep(start - now)
+
+
+class FootballDataClient(DataProvider):
+    name = "football-data.org"
+
+    def __init__(
+        self,
+        api_token: str,
+        cache: Optional[FileCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        pacer: Optional[RequestPacer] = None,
+        base_url: Optional[str] = None,
+    ):
         """
         Initialize the football-data.org API client.
 
         :param api_key: Your API key for football-data.org
+        :param cache: Optional cache for responses requested with a ttl
+        :param metrics: Registry to record into, defaults to the global one
+        :param pacer: Optional limit on how fast requests go out
+        :param base_url: API root, defaults to $LGDASH_API_URL or the real API
         """
-        self.base_url = FBD_BASE_URL
+        self.base_url = (
+            base_url or os.getenv(FBD_BASE_URL_ENV_VAR) or FBD_BASE_URL
+        ).rstrip("/")
         self.api_token = api_token
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else REGISTRY
+        self.pacer = pacer
+        # seconds a cached response must have left to be used, raised by
+        # `CacheWarmer` so entries about to expire are fetched again
+        self.fresh_for = 0
+        self._timezone: Optional[tzinfo] = None
+        self._matches_hooks: List[Callable[[List[Dict]], None]] = []
+        self._response_hooks: List[Callable[[str, Dict, Dict], None]] = []
+        self.competitions = CompetitionRegistry(self._load_competitions)
+
+    @property
+    def leagues(self) -> CompetitionRegistry:
+        return self.competitions
+
+    def _load_competitions(self) -> List[Dict]:
+        """
+        The competitions the API serves, cached for COMPETITIONS_TTL. If
+        the list can't be refreshed, the last one is used.
+        """
+        if self.cache is not None:
+            competitions = self.cache.get(COMPETITIONS_CACHE_KEY)
+            if competitions is not None:
+                return competitions
+        try:
+            data = self.make_request("/v4/competitions")
+        except FootballDataClientError as e:
+            logger.warning(f"Competition list unavailable: {e}")
+            if self.cache is None:
+                return []
+            return self.cache.get(COMPETITIONS_CACHE_KEY, allow_expired=True) or []
+
+        competitions = [
+            {
+                "code": competition["code"],
+                "name": competition["name"],
+                "type": competition.get("type"),
+                "area": {"name": (competition.get("area") or {}).get("name")},
+            }
+            for competition in data.get("competitions", [])
+            if competition.get("code")
+        ]
+        logger.debug(f"Retrieved {len(competitions)} competitions")
+        if self.cache is not None:
+            self.cache.set(COMPETITIONS_CACHE_KEY, competitions, COMPETITIONS_TTL)
+            # display and completion read what was just stored
+            COMPETITIONS.reload()
+        return competitions
+
+    @property
+    def timezone(self) -> tzinfo:
+        """
+        System timezone, looked up once per client.
+        """
+        if self._timezone is None:
+            self._timezone = get_localzone()
+            logger.debug(f"Detected timezone {self._timezone}")
+        return self._timezone
 
-    def _build_matches_df(self, matches: List[Dict]) -> pd.DataFrame:
-        matches_flat = []
-        for match in matches:
-            matches_flat.append(
-                {
-                    "home_team": match["homeTeam"]["shortName"],
-                    "home_team_code": match["homeTeam"]["tla"],
-                    "home_score": match["score"]["fullTime"]["home"],
-                    "away_team": match["awayTeam"]["shortName"],
-                    "away_team_code": match["awayTeam"]["tla"],
-                    "away_score": match["score"]["fullTime"]["away"],
-                    "status": match["status"],
-                    "minute": match["minute"],
-                    "injury_time": match["injuryTime"],
-                    "matchday": match["matchday"],
-                    "utc_datetime": match["utcDate"],
-                }
-            )
-        df = pd.DataFrame(matches_flat)
+    def add_matches_hook(self, hook: Callable[[List[Dict]], None]) -> None:
+        """
+        Register a callable that receives the raw match dicts of every
+        `get_matches` response, e.g. `MatchEventEngine.update`.
+        """
+        self._matches_hooks.append(hook)
 
-        # format columns
-        df["utc_datetime"] = pd.to_datetime(df["utc_datetime"])
-        # nullable integers
-        df["home_score"] = df["home_score"].astype("Int64")
-        df["away_score"] = df["away_score"].astype("Int64")
-        df["minute"] = df["minute"].astype("Int64")
-        df["injury_time"] = df["injury_time"].astype("Int64")
-        df["matchday"] = df["matchday"].astype("Int64")
+    def remove_matches_hook(self, hook: Callable[[List[Dict]], None]) -> None:
+        self._matches_hooks.remove(hook)
+
+    def add_response_hook(self, hook: Callable[[str, Dict, Dict], None]) -> None:
+        """
+        Register a callable that receives `(endpoint, params, data)` for
+        every successful API response, e.g. `SessionRecorder.record`.
+        """
+        self._response_hooks.append(hook)
+
+    def remove_response_hook(self, hook: Callable[[str, Dict, Dict], None]) -> None:
+        self._response_hooks.remove(hook)
+
+    @profiling.timed("build")
+    def _build_matches_df(self, matches: List[Dict]) -> pd.DataFrame:
+        df = build_matches_df(match_record(match) for match in matches)
 
         # convert values for new columns
         df["clean_status"] = df["status"].apply(format_status)
@@ -89,171 +377,524 @@ class FootballDataClient:
         )
 
         # dates and times
-        system_timezone = get_localzone()
-        logger.debug(f"Detected timezone {system_timezone}")
-        df["local_datetime"] = df["utc_datetime"].dt.tz_convert(system_timezone)
+        df["local_datetime"] = df["utc_datetime"].dt.tz_convert(self.timezone)
         df["local_date"] = df["local_datetime"].dt.strftime("%Y-%m-%d")
         df["local_time"] = df["local_datetime"].dt.strftime("%H:%M")
         df["local_tz"] = df["local_datetime"].dt.strftime("%Z")
 
         return df
 
+    @profiling.timed("build")
     def _build_standings_df(self, standings: List[Dict]) -> pd.DataFrame:
-        standings_flat = []
-        for team in standings:
-            standings_flat.append(
-                {
-                    "position": team["position"],
-                    "team": team["team"]["shortName"],
-                    "tla": team["team"]["tla"],
-                    "crest": team["team"]["crest"],
-                    "points": team["points"],
-                    "played": team["playedGames"],
-                    "won": team["won"],
-                    "draw": team["draw"],
-                    "lost": team["lost"],
-                    "goals_for": team["goalsFor"],
-                    "goals_against": team["goalsAgainst"],
-                    "goal_difference": team["goalDifference"],
-                    # "form": team["form"],
-                }
-            )
-        df = pd.DataFrame(standings_flat)
-
-        # format columns
-        df["points"] = df["points"].astype("Int64")
-        df["played"] = df["played"].astype("Int64")
-        df["won"] = df["won"].astype("Int64")
-        df["draw"] = df["draw"].astype("Int64")
-        df["lost"] = df["lost"].astype("Int64")
-        df["goals_for"] = df["goals_for"].astype("Int64")
-        df["goals_against"] = df["goals_against"].astype("Int64")
-        df["goal_difference"] = df["goal_difference"].astype("Int64")
-
-        return df
+        return build_standings_df(standing_record(team) for team in standings)
 
+    @profiling.timed("build")
     def _build_teams_df(self, teams: List[Dict]) -> pd.DataFrame:
-        teams_flat = []
-        for team in teams:
-            teams_flat.append(
-                {
-                    "id": team["id"],
-                    "team": team["shortName"],
-                    "team_long": team["name"],
-                    "tla": team["tla"],
-                    "area": team["area"]["name"],
-                }
-            )
-        df = pd.DataFrame(teams_flat)
+        df = pd.DataFrame([team_record(team) for team in teams])
         df["id"] = df["id"].astype("str")
 
         return df
 
-    # def _build_scorers_df(self, scorers: List[Dict]) -> pd.DataFrame:
-    #     scorers_flat = []
-    #     for scorer in scorers:
-    #         scorers_flat.append(
-    #             {
-    #                 "name": scorer["player"]["name"],
-    #                 "team": scorer["team"]["shortName"],
-    #                 "goals": scorer["goals"],
-    #                 "assists": scorer["assists"],
-    #                 "penalties": scorer["penalties"],
-    #             }
-    #         )
-    #     df = pd.DataFrame(scorers_flat)
-
-    #     # format columns
-    #     df["goals"] = df["goals"].astype("Int64").fillna(0)
-    #     df["assists"] = df["assists"].astype("Int64").fillna(0)
-    #     df["penalties"] = df["penalties"].astype("Int64").fillna(0)
-
-    #     return df
-
-    def make_request(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
+    @profiling.timed("build")
+    def _build_scorers_df(self, scorers: Iterable[Dict]) -> pd.DataFrame:
+        # consumed row by row, no intermediate list of flat dicts
+        return build_scorers_df(
+            {
+                "name": scorer["player"]["name"],
+                "team": scorer["team"]["shortName"],
+                "tla": scorer["team"]["tla"],
+                "played": scorer.get("playedMatches"),
+                "goals": scorer["goals"],
+                "assists": scorer.get("assists"),
+                "penalties": scorer.get("penalties"),
+            }
+            for scorer in scorers
+        )
+
+    def _record_response(
+        self, endpoint: str, response: requests.Response, seconds: float
+    ) -> None:
+        self.metrics.observe("lgdash_request_seconds", seconds, endpoint=endpoint)
+        self.metrics.inc(
+            "lgdash_requests_total", endpoint=endpoint, status=response.status_code
+        )
+        self.metrics.inc(
+            "lgdash_response_bytes_total", len(response.content), endpoint=endpoint
+        )
+        remaining = response.headers.get("X-Requests-Available-Minute")
+        if remaining is not None:
+            self.metrics.set("lgdash_quota_remaining", float(remaining))
+
+    @staticmethod
+    def _cache_key(endpoint: str, params: Dict) -> str:
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        return f"{endpoint}?{query}"
+
+    def make_request(
+        self, endpoint: str, params: Optional[Dict] = None, ttl: Optional[int] = None
+    ) -> Dict:
         """
         Make a request to the API.
 
         :param endpoint: The API endpoint
         :param params: Additional parameters for the request
+        :param ttl: Seconds a response may be served from the cache, if any
         :return: Parsed JSON response as a dictionary
         """
         if params is None:
             params = {}
+        if self.cache is None or not ttl:
+            data = self._get_json(endpoint, params)
+        else:
+            cache_key = self._cache_key(endpoint, params)
+            with profiling.stage("cache"):
+                data = self.cache.get(cache_key, fresh_for=self.fresh_for)
+            hit = data is not None
+            if not hit:
+                # with a shared cache one process fetches, the rest wait
+                # for its entry
+                with self.cache.lock(cache_key):
+                    with profiling.stage("cache"):
+                        data = self.cache.get(cache_key, fresh_for=self.fresh_for)
+                    hit = data is not None
+                    if not hit:
+                        data = self._get_json(endpoint, params)
+                        with profiling.stage("cache"):
+                            self.cache.set(cache_key, data, ttl)
+            self.metrics.inc(
+                "lgdash_cache_requests_total", result="hit" if hit else "miss"
+            )
+        for hook in self._response_hooks:
+            hook(endpoint, params, data)
+        return data
+
+    def _get_json(self, endpoint: str, params: Dict) -> Dict:
+        response = self._send(endpoint, params)
+        started = time.perf_counter()
+        try:
+            with profiling.stage("json"):
+                data = response.json()
+        except ValueError as e:
+            logger.error(f"Invalid JSON from {endpoint}: {e}")
+            raise FootballDataClientError(
+                "Invalid response from football-data.org API."
+            ) from e
+        self.metrics.observe(
+            "lgdash_parse_seconds", time.perf_counter() - started, endpoint=endpoint
+        )
+        if "error" in data:
+            raise FootballDataClientError(data["error"])
+        return data
+
+    def _send(self, endpoint: str, params: Dict) -> requests.Response:
+        """
+        One GET to the API, paced and recorded in the metrics.
+
+        :raises FootballDataClientError: On a network error or bad status
+        """
         headers = {"X-Auth-Token": self.api_token}
-        url = f"{self.base_url}/{endpoint}"
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+
+        if self.pacer is not None:
+            self.pacer.wait()
 
         try:
             logger.debug(f"Making request to {url}")
-            response = requests.get(url, params=params, headers=headers)
+            started = time.perf_counter()
+            with profiling.stage("http"):
+                response = requests.get(
+                    url, params=params, headers=headers, timeout=REQUEST_TIMEOUT
+                )
+            self._record_response(endpoint, response, time.perf_counter() - started)
             response.raise_for_status()
-            data = response.json()
-            if "error" in data:
-                raise FootballDataClientError(data["error"])
-            return data
+            return response
         except requests.exceptions.RequestException as e:
+            if getattr(e, "response", None) is None:
+                # never got an HTTP status back
+                self.metrics.inc(
+                    "lgdash_requests_total", endpoint=endpoint, status="error"
+                )
             logger.error(f"Request failed: {e}")
             raise FootballDataClientError(
                 "Failed to communicate with football-data.org API."
             ) from e
 
+    def make_raw_request(self, endpoint: str, params: Optional[Dict] = None) -> bytes:
+        """
+        Like `make_request`, but returns the undecoded body and skips the
+        cache and hooks, for callers that decode elsewhere, e.g. in
+        another process.
+        """
+        return self._send(endpoint, params or {}).content
+
+    def _fetch_matches(
+        self,
+        league: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        matchday: Optional[int],
+        ttl: Optional[int],
+    ) -> Tuple[List[Dict], Dict]:
+        if league not in self.competitions:
+            raise ValueError(f"League {league} not supported")
+
+        endpoint = f"/v4/competitions/{league}/matches"
+
+        params = {}
+        if matchday:
+            params["matchday"] = matchday
+        elif start_date and end_date:
+            params["dateFrom"] = start_date
+            params["dateTo"] = end_date
+        data = self.make_request(endpoint, params=params, ttl=ttl)
+
+        matches = data.get("matches", [])
+        logger.debug(f"Retrieved {len(matches)} matches")
+        for hook in self._matches_hooks:
+            hook(matches)
+
+        metadata = {}
+        for key in data:
+            if key != "matches":
+                metadata[key] = data[key]
+
+        return matches, metadata
+
     def get_matches(
         self,
         league: str = "PL",
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         matchday: Optional[int] = None,
+        ttl: Optional[int] = None,
     ) -> Tuple[pd.DataFrame, Dict]:
         """
-        Fetch and process matches.
+        Fetch and process matches. With no dates or matchday, the whole
+        current season is returned.
 
         :param start_date: start_date
         :param end_date: end_date
+        :param ttl: Seconds the response may be served from the cache
         :return: DataFrame containing matches
         """
+        matches, metadata = self._fetch_matches(
+            league, start_date, end_date, matchday, ttl
+        )
+        matches_df = self._build_matches_df(matches) if matches else pd.DataFrame()
+
+        return matches_df, metadata
+
+    def iter_matches(
+        self,
+        league: str = "PL",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        matchday: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ) -> Iterator[Dict]:
+        """
+        Like `get_matches`, but yields one flat row per match without
+        building a DataFrame.
+        """
+        matches, _ = self._fetch_matches(league, start_date, end_date, matchday, ttl)
+        for match in matches:
+            yield match_row(match, self.timezone)
 
-        if league not in SUPPORTED_LEAGUES:
+    def get_season_matches_raw(self, league: str, season: int) -> bytes:
+        """
+        Every match of a season in one request, as the undecoded response
+        body. Not cached, past seasons are fetched once and stored.
+
+        :param season: Starting year, e.g. 2023 for 2023/2024
+        """
+        if league not in self.competitions:
             raise ValueError(f"League {league} not supported")
+        return self.make_raw_request(
+            f"/v4/competitions/{league}/matches", params={"season": season}
+        )
 
-        endpoint = f"/v4/competitions/{league}/matches"
+    def _local_days_to_utc_dates(self, start_date: str, end_date: str) -> List[date]:
+        """
+        UTC dates that together cover local midnight on `start_date` to
+        local midnight after `end_date`.
+        """
+        start = datetime.combine(
+            date.fromisoformat(start_date), datetime.min.time(), tzinfo=self.timezone
+        )
+        end = datetime.combine(
+            date.fromisoformat(end_date) + timedelta(days=1),
+            datetime.min.time(),
+            tzinfo=self.timezone,
+        ) - timedelta(microseconds=1)
+        first = start.astimezone(timezone.utc).date()
+        last = end.astimezone(timezone.utc).date()
+        return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+    def _fetch_utc_dates(
+        self,
+        league: str,
+        utc_dates: List[date],
+        upcoming_ttl: int = UPCOMING_MATCHES_TTL,
+    ) -> Tuple[Dict[date, List[Dict]], Dict]:
+        """
+        Matches per UTC date, from the cache where possible. Missing dates
+        are fetched in as few contiguous date-range requests as possible,
+        then split up and cached one entry per date.
+        """
+        by_date: Dict[date, List[Dict]] = {}
+        metadata: Dict = {}
+        missing = []
+        for day in utc_dates:
+            entry = None
+            if self.cache is not None:
+                with profiling.stage("cache"):
+                    entry = self.cache.get(
+                        utc_date_key(league, day), fresh_for=self.fresh_for
+                    )
+                self.metrics.inc(
+                    "lgdash_cache_requests_total",
+                    result="miss" if entry is None else "hit",
+                )
+            if entry is None:
+                missing.append(day)
+            else:
+                by_date[day] = entry["matches"]
+                metadata = entry["metadata"]
+
+        now = datetime.now(timezone.utc)
+        for run in _contiguous_runs(missing):
+            if self.cache is None:
+                metadata = self._fetch_utc_run(league, run, now, upcoming_ttl, by_date)
+                continue
+            with ExitStack() as locks:
+                # a lock per date, taken in date order, so runs that
+                # overlap wait for each other without deadlocking
+                for day in run:
+                    locks.enter_context(self.cache.lock(utc_date_key(league, day)))
+                # another process may have fetched some of the dates while
+                # this one waited for the locks
+                still_missing = []
+                for day in run:
+                    with profiling.stage("cache"):
+                        entry = self.cache.get(
+                            utc_date_key(league, day), fresh_for=self.fresh_for
+                        )
+                    if entry is None:
+                        still_missing.append(day)
+                    else:
+                        by_date[day] = entry["matches"]
+                        metadata = entry["metadata"]
+                for rest in _contiguous_runs(still_missing):
+                    metadata = self._fetch_utc_run(
+                        league, rest, now, upcoming_ttl, by_date
+                    )
+
+        return by_date, metadata
+
+    def _fetch_utc_run(
+        self,
+        league: str,
+        run: List[date],
+        now: datetime,
+        upcoming_ttl: int,
+        by_date: Dict[date, List[Dict]],
+    ) -> Dict:
+        """
+        One request for consecutive UTC dates, split into `by_date` and
+        cached one entry per date.
 
-        params = {}
-        if matchday:
-            params["matchday"] = matchday
-        elif start_date and end_date:
-            params["dateFrom"] = start_date
-            params["dateTo"] = end_date
+        :return: The response's metadata
+        """
+        endpoint = f"/v4/competitions/{league}/matches"
+        params = {"dateFrom": run[0].isoformat(), "dateTo": run[-1].isoformat()}
         data = self.make_request(endpoint, params=params)
+        metadata = {k: v for k, v in data.items() if k != "matches"}
+        fetched: Dict[date, List[Dict]] = {day: [] for day in run}
+        for match in data.get("matches", []):
+            day = date.fromisoformat(match["utcDate"][:10])
+            fetched.setdefault(day, []).append(match)
+        for day, matches in fetched.items():
+            by_date[day] = matches
+            if self.cache is not None:
+                entry = {"matches": matches, "metadata": metadata}
+                with profiling.stage("cache"):
+                    self.cache.set(
+                        utc_date_key(league, day),
+                        entry,
+                        _utc_date_ttl(day, matches, now, upcoming_ttl),
+                    )
+        return metadata
+
+    def _fetch_local_matches(
+        self,
+        league: str,
+        start_date: str,
+        end_date: str,
+        upcoming_ttl: int = UPCOMING_MATCHES_TTL,
+    ) -> Tuple[List[Dict], Dict]:
+        if league not in self.competitions:
+            raise ValueError(f"League {league} not supported")
 
-        # import pickle
+        utc_dates = self._local_days_to_utc_dates(start_date, end_date)
+        by_date, metadata = self._fetch_utc_dates(league, utc_dates, upcoming_ttl)
 
-        # with open("live_matches_arsenal_20251221.pkl", "wb") as file:
-        #     pickle.dump(data, file)
+        matches = []
+        for day in utc_dates:
+            for match in by_date.get(day, []):
+                kickoff = datetime.fromisoformat(match["utcDate"])
+                local_date = kickoff.astimezone(self.timezone).date().isoformat()
+                if start_date <= local_date <= end_date:
+                    matches.append(match)
+        logger.debug(f"Retrieved {len(matches)} matches for local dates")
+        for hook in self._matches_hooks:
+            hook(matches)
 
-        matches = data.get("matches", [])
-        logger.debug(f"Retrieved {len(matches)} matches")
+        return matches, metadata
+
+    def get_local_matches(
+        self,
+        league: str = "PL",
+        start_date: str = "",
+        end_date: str = "",
+        upcoming_ttl: int = UPCOMING_MATCHES_TTL,
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Matches kicking off on local calendar days `start_date` through
+        `end_date`, inclusive.
+
+        The API filters on UTC dates, so the smallest set of UTC dates
+        covering the local days is fetched and trimmed locally. Each UTC
+        date is cached on its own, so overlapping windows, e.g. today
+        and then the week's schedule, only download the dates not
+        already seen. Dates with live or imminent matches expire in
+        seconds, finished dates last a day.
+
+        :param start_date: First local date, YYYY-MM-DD
+        :param end_date: Last local date, YYYY-MM-DD
+        :param upcoming_ttl: Cap on how long dates with matches still to
+            come are cached, never past their first kickoff
+        :return: DataFrame containing matches
+        """
+        matches, metadata = self._fetch_local_matches(
+            league, start_date, end_date, upcoming_ttl
+        )
         matches_df = self._build_matches_df(matches) if matches else pd.DataFrame()
+        return matches_df, metadata
 
-        metadata = {}
-        for key in data:
-            if key != "matches":
-                metadata[key] = data[key]
+    def iter_local_matches(
+        self, league: str = "PL", start_date: str = "", end_date: str = ""
+    ) -> Iterator[Dict]:
+        """
+        Like `get_local_matches`, but yields one flat row per match.
+        """
+        matches, _ = self._fetch_local_matches(league, start_date, end_date)
+        for match in matches:
+            yield match_row(match, self.timezone)
 
-        return matches_df, metadata
+    def find_team(self, league: str, team: str) -> Optional[Dict]:
+        """
+        The team in `league` whose name, short name or three letter code
+        is `team`, ignoring case, from the cached team list.
+        """
+        needle = team.lower()
+        teams, _ = self._fetch_teams(league, TEAMS_TTL)
+        for candidate in teams:
+            names = (candidate.get(k) for k in ("shortName", "name", "tla"))
+            if needle in {name.lower() for name in names if name}:
+                return candidate
+        return None
+
+    def _cached_utc_dates(
+        self, league: str, utc_dates: List[date]
+    ) -> Optional[Tuple[List[Dict], Dict]]:
+        """
+        Matches on `utc_dates` if every one of them is fresh in the cache.
+        """
+        matches: List[Dict] = []
+        metadata: Dict = {}
+        with profiling.stage("cache"):
+            for day in utc_dates:
+                entry = self.cache.get(utc_date_key(league, day))
+                if entry is None:
+                    return None
+                matches.extend(entry["matches"])
+                metadata = entry["metadata"]
+        self.metrics.inc("lgdash_cache_requests_total", len(utc_dates), result="hit")
+        return matches, metadata
+
+    def _fetch_query(self, query: MatchQuery) -> Tuple[List[Dict], Dict]:
+        if query.league not in self.competitions:
+            raise ValueError(f"League {query.league} not supported")
+
+        utc_dates = None
+        if query.date_from:
+            utc_dates = self._local_days_to_utc_dates(query.date_from, query.date_to)
+            # days already cached one by one cost no request, every filter
+            # then runs locally
+            cached = None
+            if self.cache is not None:
+                cached = self._cached_utc_dates(query.league, utc_dates)
+            if cached is not None:
+                tests = predicates(query, self.timezone).values()
+                matches = [m for m in cached[0] if all(t(m) for t in tests)]
+                for hook in self._matches_hooks:
+                    hook(matches)
+                return matches, cached[1]
+
+        team = self.find_team(query.league, query.team) if query.team else None
+        plan = plan_query(
+            query,
+            self.timezone,
+            utc_range=(utc_dates[0], utc_dates[-1]) if utc_dates else None,
+            team_id=team["id"] if team else None,
+        )
+        may_be_live = not query.status or "live" in query.status
+        data = self.make_request(
+            plan.endpoint,
+            params=plan.params,
+            ttl=LIVE_MATCHES_TTL if may_be_live else UPCOMING_MATCHES_TTL,
+        )
+
+        matches = [m for m in data.get("matches", []) if plan.accepts(m)]
+        logger.debug(f"Kept {len(matches)} of {len(data.get('matches', []))} matches")
+        for hook in self._matches_hooks:
+            hook(matches)
+
+        metadata = {k: v for k, v in data.items() if k != "matches"}
+        return matches, metadata
 
-    def get_standings(self, league: str = "PL") -> Tuple[pd.DataFrame, Dict]:
+    def query_matches(self, query: MatchQuery) -> Tuple[pd.DataFrame, Dict]:
         """
-        Fetch and process the most current league standings.
+        Matches narrowed by `query`, filtered by the API where it can be.
 
-        :param season: Season/Year (e.g. 2024 for 2024/2025)
-        :return: DataFrame containing standings
+        Status, matchday and dates become request parameters, and a team
+        found in the league's team list is fetched from its own endpoint,
+        which also filters home or away. Anything the request can't
+        express is applied to the raw matches before the frame is built.
+
+        :param query: See `MatchQuery`
+        :return: DataFrame containing matches
         """
+        matches, metadata = self._fetch_query(query)
+        matches_df = self._build_matches_df(matches) if matches else pd.DataFrame()
+        return matches_df, metadata
+
+    def iter_query_matches(self, query: MatchQuery) -> Iterator[Dict]:
+        """
+        Like `query_matches`, but yields one flat row per match.
+        """
+        matches, _ = self._fetch_query(query)
+        for match in matches:
+            yield match_row(match, self.timezone)
+
+    def _fetch_standings(
+        self, league: str, ttl: Optional[int]
+    ) -> Tuple[List[Dict], Dict]:
         endpoint = f"/v4/competitions/{league}/standings"
         params = {}
-        data = self.make_request(endpoint, params=params)
+        data = self.make_request(endpoint, params=params, ttl=ttl)
 
         standings = data.get("standings", [])
-        # print(standings)
         # is this going to need to be different for different leagues?
         for standing in standings:
             if standing["type"] == "TOTAL":
@@ -266,18 +907,35 @@ class FootballDataClient:
             if key != "standings":
                 metadata[key] = data[key]
 
-        return self._build_standings_df(standings), metadata
+        return standings, metadata
 
-    def get_teams(self, league: str = "PL") -> Tuple[pd.DataFrame, Dict]:
+    def get_standings(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
         """
         Fetch and process the most current league standings.
 
         :param season: Season/Year (e.g. 2024 for 2024/2025)
+        :param ttl: Seconds the response may be served from the cache
         :return: DataFrame containing standings
         """
+        standings, metadata = self._fetch_standings(league, ttl)
+        return self._build_standings_df(standings), metadata
+
+    def iter_standings(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Like `get_standings`, but yields one flat row per team.
+        """
+        standings, _ = self._fetch_standings(league, ttl)
+        for team in standings:
+            yield standing_record(team)
+
+    def _fetch_teams(self, league: str, ttl: Optional[int]) -> Tuple[List[Dict], Dict]:
         endpoint = f"/v4/competitions/{league}/teams"
         params = {}
-        data = self.make_request(endpoint, params=params)
+        data = self.make_request(endpoint, params=params, ttl=ttl)
 
         teams = data.get("teams", [])
         logger.debug(f"Retrieved teams with {len(teams)} teams")
@@ -287,35 +945,61 @@ class FootballDataClient:
             if key != "teams":
                 metadata[key] = data[key]
 
+        return teams, metadata
+
+    def get_teams(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Fetch and process the teams in a league.
+
+        :param ttl: Seconds the response may be served from the cache
+        :return: DataFrame containing teams
+        """
+        teams, metadata = self._fetch_teams(league, ttl)
         return self._build_teams_df(teams), metadata
 
-    # def get_scorers(
-    #     self, limit: Optional[int] = 10
-    # ) -> Tuple[Dict, pd.DataFrame]:
-    #     """
-    #     Fetch and process the most current top scorers.
-
-    #     :param season: Season/Year (e.g. 2024 for 2024/2025)
-    #     :return: DataFrame containing top scorers
-    #     """
-    #     endpoint = "/v4/competitions/PL/scorers"
-    #     params = {"limit": limit}
-    #     data = self.make_request(endpoint, params=params)
-
-    #     season_metadata = data.get("season", {})
-    #     if season_metadata:
-    #         stages = season_metadata.get("stages", [])
-    #         if len(stages) > 1:
-    #             raise NotImplementedError(
-    #                 "Multiple stages found in season, not yet fully supported"
-    #             )
-
-    #     scorers = data.get("scorers", [])
-    #     logger.debug(f"Retrieved {len(scorers)} top scorers")
-
-    #     metadata = {}
-    #     for key in data:
-    #         if key != "scorers":
-    #             metadata[key] = data[key]
-
-    #     return metadata, self._build_scorers_df(scorers)
+    def iter_teams(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Iterator[Dict]:
+        """
+        Like `get_teams`, but yields one flat row per team.
+        """
+        teams, _ = self._fetch_teams(league, ttl)
+        for team in teams:
+            yield team_record(team)
+
+    def get_scorers(
+        self, league: str = "PL", limit: int = 10, ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Fetch and process the most current top scorers.
+
+        The endpoint only takes a `limit`, so it is rounded up to whole
+        pages of SCORERS_PAGE_SIZE. Boards of different lengths then share
+        one cached response.
+
+        :param league: League code
+        :param limit: Number of players
+        :param ttl: Seconds the response may be served from the cache
+        :return: DataFrame containing top scorers
+        """
+        if league not in self.competitions:
+            raise ValueError(f"League {league} not supported")
+
+        endpoint = f"/v4/competitions/{league}/scorers"
+        pages = max(1, -(-limit // SCORERS_PAGE_SIZE))
+        params = {"limit": pages * SCORERS_PAGE_SIZE}
+        data = self.make_request(endpoint, params=params, ttl=ttl)
+
+        # scorers come back as one list even for multi-stage seasons like
+        # the Champions League, stages are only listed in the metadata
+        scorers = data.get("scorers", [])
+        logger.debug(f"Retrieved {len(scorers)} top scorers")
+
+        metadata = {}
+        for key in data:
+            if key != "scorers":
+                metadata[key] = data[key]
+
+        return self._build_scorers_df(islice(scorers, limit)), metadata
@@ -0,0 +1,202 @@
+"""
+Shell completion for league codes and team names.
+
+Completion runs on every key press, so it only reads a small index of
+team names and three letter codes per league, kept as one JSON file in
+the cache directory. Nothing here imports pandas or the API client, or
+makes a request. When the index is missing or stale, a detached
+`python -m lgdash.completion` rebuilds it from `get_teams` while the
+shell carries on with what is there.
+"""
+
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional
+
+from click.shell_completion import CompletionItem
+
+from .cache import default_cache_dir
+from .config import FBD_ENV_VAR, TEAMS_TTL
+from .leagues import COMPETITIONS, DEFAULT_LEAGUE, SUPPORTED_LEAGUES
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "completion.json"
+# present while a background refresh runs
+REFRESH_MARKER = "completion.refresh"
+# a refresh that hasn't finished in this long is assumed dead
+REFRESH_TIMEOUT = 600
+
+
+def index_path(directory: Optional[str] = None) -> str:
+    return os.path.join(directory or default_cache_dir(), INDEX_FILE)
+
+
+def load_index(directory: Optional[str] = None) -> Dict:
+    """
+    :return: `{"updated": {code: seconds}, "leagues": {code: [[team, tla], ...]}}`,
+        empty if there is no readable index
+    """
+    try:
+        with open(index_path(directory), "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return {"updated": {}, "leagues": {}}
+    if not isinstance(index.get("updated"), dict):
+        # older indexes kept one time for every league
+        index["updated"] = dict.fromkeys(index["leagues"], index.get("updated", 0))
+    return index
+
+
+def update_index(
+    league: str, teams: Iterable[Dict], directory: Optional[str] = None
+) -> None:
+    """
+    Replace one league's teams in the index.
+
+    :param teams: Rows with `team` and `tla`, e.g. from `iter_teams`
+    """
+    index = load_index(directory)
+    index["leagues"][league] = sorted([team["team"], team["tla"]] for team in teams)
+    index["updated"][league] = time.time()
+    path = index_path(directory)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write completion index: {e}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def match_teams(teams: List[List[str]], incomplete: str) -> List[List[str]]:
+    """
+    Teams whose name, any word of it, or code starts with `incomplete`,
+    ignoring case.
+    """
+    prefix = incomplete.lower()
+    return [
+        [team, tla]
+        for team, tla in teams
+        if (tla or "").lower().startswith(prefix)
+        or any(
+            word.startswith(prefix) for word in [team.lower()] + team.lower().split()
+        )
+    ]
+
+
+def refresh_in_background(
+    directory: Optional[str] = None, league: Optional[str] = None
+) -> bool:
+    """
+    Start rebuilding the index in a detached process, unless one is
+    already running or the last one couldn't refresh anything.
+
+    :param league: Also index this league, if not a supported one
+    :return: Whether a refresh was started
+    """
+    import subprocess
+
+    directory = directory or default_cache_dir()
+    marker = os.path.join(directory, REFRESH_MARKER)
+    try:
+        if time.time() - os.path.getmtime(marker) < REFRESH_TIMEOUT:
+            return False
+    except OSError:
+        pass
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(marker, "w"):
+            pass
+        subprocess.Popen(
+            [sys.executable, "-m", "lgdash.completion", directory]
+            + ([league] if league else []),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError as e:
+        logger.debug(f"Could not start completion refresh: {e}")
+        return False
+    return True
+
+
+def _league_from_context(ctx) -> str:
+    # the subcommand's --league, then the group's, then the default
+    while ctx is not None:
+        codes = ctx.params.get("league_codes")
+        league = ctx.params.get("league") or (codes[-1] if codes else None)
+        if league:
+            return league
+        ctx = ctx.parent
+    return DEFAULT_LEAGUE
+
+
+def complete_league(ctx, param, incomplete: str) -> List[CompletionItem]:
+    prefix = incomplete.upper()
+    return [
+        CompletionItem(code, help=league["name"])
+        for code, league in COMPETITIONS.items()
+        if code.startswith(prefix)
+    ]
+
+
+def complete_team(ctx, param, incomplete: str) -> List[CompletionItem]:
+    index = load_index()
+    league = _league_from_context(ctx)
+    # each league by its own time, a refresh may have skipped some
+    if time.time() - index["updated"].get(league, 0) > TEAMS_TTL:
+        refresh_in_background(league=league)
+    teams = index["leagues"].get(league, [])
+    return [
+        CompletionItem(team, help=tla) for team, tla in match_teams(teams, incomplete)
+    ]
+
+
+def refresh(directory: Optional[str] = None, leagues: Iterable[str] = ()) -> bool:
+    """
+    Rebuild the index for every supported league. Teams are cached for a
+    day, so after a `warm` this costs no requests.
+
+    :param leagues: More leagues to index. One without teams gets an
+        empty entry, so completion doesn't ask for it again until stale.
+    :return: Whether every supported league was indexed
+    """
+    from .cache import FileCache, default_cache
+    from .client import FootballDataClient, FootballDataClientError
+
+    api_token = os.getenv(FBD_ENV_VAR)
+    if not api_token:
+        return False
+    client = FootballDataClient(api_token)
+    client.cache = FileCache(directory) if directory else default_cache(client.base_url)
+    complete = True
+    for league in dict.fromkeys([*SUPPORTED_LEAGUES, *leagues]):
+        try:
+            update_index(league, client.iter_teams(league, ttl=TEAMS_TTL), directory)
+        except (FootballDataClientError, ValueError) as e:
+            logger.warning(f"Could not refresh teams for {league}: {e}")
+            if league in SUPPORTED_LEAGUES:
+                complete = False
+            else:
+                update_index(league, [], directory)
+    return complete
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else None
+    # a failed refresh keeps the marker, so completion doesn't start
+    # another one on every key press until REFRESH_TIMEOUT
+    if refresh(directory, sys.argv[2:]):
+        try:
+            os.remove(os.path.join(directory or default_cache_dir(), REFRESH_MARKER))
+        except OSError:
+            pass
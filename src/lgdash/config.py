@@ -1,2 +1,59 @@
 FBD_BASE_URL = "https://api.football-data.org"
+# point the client elsewhere, e.g. at `python -m lgdash.fake_api`
+FBD_BASE_URL_ENV_VAR = "LGDASH_API_URL"
 FBD_ENV_VAR = "FOOTBALLDATA_API_TOKEN"
+
+FS_BASE_URL = "https://api.football-data-api.com"
+FS_ENV_VAR = "FOOTYSTATS_API_KEY"
+
+# seconds before a request with no response is given up on
+REQUEST_TIMEOUT = 10
+# consecutive failures before a provider is skipped, and for how long
+FAILOVER_THRESHOLD = 2
+FAILOVER_COOLDOWN = 60
+
+# the free tier allows 10 requests a minute, stay well inside it
+MAX_CONCURRENT_REQUESTS = 4
+SCORERS_PAGE_SIZE = 20
+
+# cache lifetimes, in seconds
+SEASON_MATCHES_TTL = 60 * 60
+SCORERS_TTL = 30 * 60
+LIVE_MATCHES_TTL = 15
+UPCOMING_MATCHES_TTL = 10 * 60
+FINISHED_MATCHES_TTL = 24 * 60 * 60
+STANDINGS_TTL = 5 * 60
+TEAMS_TTL = 24 * 60 * 60
+FOOTYSTATS_SEASONS_TTL = 7 * 24 * 60 * 60
+# competitions come and go with the plan, rarely
+COMPETITIONS_TTL = 7 * 24 * 60 * 60
+
+# matches in a form guide
+DEFAULT_FORM_LENGTH = 5
+
+# backfill, the whole free tier since nothing else should be running
+BACKFILL_REQUESTS_PER_MINUTE = 10
+
+# live board, frames per second at most and seconds of drawing per frame
+BOARD_REFRESH_RATE = 4
+BOARD_FRAME_BUDGET = 0.05
+# narrowest a pane gets, sets how many fit side by side
+BOARD_PANE_WIDTH = 56
+BOARD_STANDINGS_ROWS = 8
+
+# season projections, simulated seasons per league and per batch; odds
+# are cached until a new result changes the inputs
+PROJECTION_SIMULATIONS = 20000
+PROJECTION_BATCH_SIZE = 5000
+PROJECTIONS_TTL = 7 * 24 * 60 * 60
+# form and splits tables, keyed on the results they were computed from
+STATS_TTL = 7 * 24 * 60 * 60
+
+# cache warming, at half the free tier so interactive use still fits
+WARM_REQUESTS_PER_MINUTE = 5
+WARM_DAYS = 7
+# longest an entry written off-peak is trusted
+WARM_MAX_TTL = 12 * 60 * 60
+# everyone refreshes from shortly before kickoff until the result is in
+PEAK_BEFORE_KICKOFF = 30 * 60
+PEAK_AFTER_KICKOFF = 2 * 60 * 60 + 30 * 60
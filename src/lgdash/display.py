@@ -1,14 +1,30 @@
 import pandas as pd
-from typing import Dict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 from rich.console import Console
 from rich.table import Table
 from rich import box
 from rich.text import Text
 
-from .leagues import SUPPORTED_LEAGUES
+from . import profiling
+from .client import format_status
+from .leagues import COMPETITIONS
+from .projections import DEFAULT_ZONES, ZONES
+from .events import (
+    MatchEvent,
+    GoalEvent,
+    ScoreCorrectionEvent,
+    StatusChangeEvent,
+    MinuteUpdateEvent,
+)
+from .backfill import BackfillResult
+from .warm import WarmResult
 
 # MATCH_STATUS_ORDER = ["Live", "HT", "FT", "Upcoming", "Postponed"]
 
+# positions drawn as bars, the leader tallest
+RANK_BARS = "█▇▆▅▄▃▂▁"
+
 
 def _extract_season_from_metadata(metadata: Dict) -> str:
     season_start_year = metadata["season"]["startDate"][:4]
@@ -36,6 +52,37 @@ def _extract_time_from_row(row: pd.Series) -> str:
     return row["clean_status"]
 
 
+def _format_event(event: MatchEvent) -> Text:
+    minute = f" {event.minute}'" if event.minute is not None else ""
+    if isinstance(event, GoalEvent):
+        return Text(
+            f"⚽ Goal {event.scoring_team}! {event.scoreline}{minute}",
+            style="bold orange1",
+        )
+    if isinstance(event, ScoreCorrectionEvent):
+        return Text(f"Score corrected: {event.scoreline}{minute}", style="italic")
+    if isinstance(event, StatusChangeEvent):
+        if event.is_kickoff:
+            return Text(f"Kickoff: {event.scoreline}", style="blue")
+        if event.is_full_time:
+            return Text(f"Full time: {event.scoreline}", style="bold blue")
+        if event.is_half_time:
+            return Text(f"Half time: {event.scoreline}", style="blue")
+        label = format_status(event.status)
+        return Text(f"{label}: {event.scoreline}{minute}", style="blue")
+    return Text(f"{event.scoreline}{minute}")
+
+
+def print_events(console: Console, events: Iterable[MatchEvent], limit: int = 10):
+    # minute ticks are too chatty to show as notifications
+    notable = [e for e in events if not isinstance(e, MinuteUpdateEvent)]
+    if not notable:
+        return
+    console.print(Text("Latest", style="bold"))
+    for event in notable[-limit:]:
+        console.print(_format_event(event))
+
+
 def print_dataframe(console: Console, df: pd.DataFrame, title: str):
     """
     Mainly used for interactive debugging and introspection.
@@ -50,7 +97,9 @@ def print_dataframe(console: Console, df: pd.DataFrame, title: str):
     console.print(table)
 
 
-def print_todays_matches(console: Console, df: pd.DataFrame, title: str):
+def todays_matches_table(
+    df: pd.DataFrame, title: str, show_date: bool = False
+) -> Table:
 
     # def _sort_matches(matches_df: pd.DataFrame) -> pd.DataFrame:
     #     return matches_df.sort_values(
@@ -69,6 +118,8 @@ def print_todays_matches(console: Console, df: pd.DataFrame, title: str):
     table.add_column("Home", justify="right")
     table.add_column("Score", justify="center")
     table.add_column("Away", justify="left")
+    if show_date:
+        table.add_column("Date", justify="left")
     table.add_column("Time", justify="left")
 
     for _, row in df.iterrows():
@@ -89,22 +140,25 @@ def print_todays_matches(console: Console, df: pd.DataFrame, title: str):
                 home_display.stylize("blue")
                 away_display.stylize("blue")
 
+        date_display = [row["local_date"]] if show_date else []
         table.add_row(
             home_display,
             score_display,
             away_display,
+            *date_display,
             time_display,
         )
 
-    console.print(table)
+    return table
+
+
+def print_todays_matches(console: Console, df: pd.DataFrame, title: str):
+    console.print(todays_matches_table(df, title))
 
 
 def print_upcoming_matches(console: Console, df: pd.DataFrame, title: str):
 
     df.sort_values(by=["utc_datetime"], inplace=True)
-    # only show upcoming matches
-    # as of now timezones can make today's matches show up otherwise
-    df = df[df["clean_status"] == "Upcoming"]
 
     table = Table(title=title, box=box.HORIZONTALS, show_header=True)
     table.add_column("Home", justify="left")
@@ -129,9 +183,11 @@ def print_upcoming_matches(console: Console, df: pd.DataFrame, title: str):
     console.print(table)
 
 
-def print_standings(console: Console, df: pd.DataFrame, metadata: Dict):
+def print_standings(
+    console: Console, df: pd.DataFrame, metadata: Dict, title: str = "Standings"
+):
     season_str = _extract_season_from_metadata(metadata)
-    title = f"Standings ({season_str})" if season_str else "Standings"
+    title = f"{title} ({season_str})" if season_str else title
 
     table = Table(title=title, box=box.HORIZONTALS, show_header=True)
     table.add_column("", justify="right")
@@ -162,12 +218,90 @@ def print_standings(console: Console, df: pd.DataFrame, metadata: Dict):
     console.print(table)
 
 
+def rank_sparkline(positions: Iterable[int], teams: int) -> str:
+    """
+    One bar per matchday, taller the higher the position.
+    """
+    return "".join(
+        RANK_BARS[(position - 1) * len(RANK_BARS) // teams] for position in positions
+    )
+
+
+def print_timeline(
+    console: Console, df: pd.DataFrame, metadata: Dict, title: str = "Positions"
+):
+    season_str = _extract_season_from_metadata(metadata)
+    title = f"{title} ({season_str})" if season_str else title
+    first, last = df.columns[0], df.columns[-1]
+
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("", justify="right")
+    table.add_column("Team", justify="left")
+    table.add_column(f"Matchday {first}-{last}", justify="left")
+    table.add_column("Best", justify="right")
+    table.add_column("Worst", justify="right")
+
+    for team, positions in df.iterrows():
+        table.add_row(
+            str(positions[last]),
+            team,
+            Text(rank_sparkline(positions, len(df)), style="blue"),
+            str(positions.min()),
+            str(positions.max()),
+        )
+
+    console.print(table)
+
+
+def _percent(share: float) -> str:
+    if share == 0:
+        return "-"
+    if share < 0.001:
+        return "<0.1%"
+    if share > 0.999 and share < 1:
+        return ">99.9%"
+    return f"{share:.1%}"
+
+
+def print_projections(
+    console: Console,
+    df: pd.DataFrame,
+    top: int,
+    relegated: int,
+    title: str = "Projections",
+):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("", justify="right")
+    table.add_column("Team", justify="left")
+    table.add_column("Pts", justify="right")
+    table.add_column("Proj", justify="right")
+    table.add_column("Title", justify="right")
+    table.add_column(f"Top {top}", justify="right")
+    if relegated:
+        table.add_column("Relegated", justify="right")
+
+    for rank, (_, row) in enumerate(df.iterrows(), start=1):
+        cells = [
+            str(rank),
+            row["team"],
+            str(row["points"]),
+            f"{row['projected_points']:.1f}",
+            _percent(row["title"]),
+            _percent(row["top"]),
+        ]
+        if relegated:
+            cells.append(_percent(row["relegated"]))
+        table.add_row(*cells)
+
+    console.print(table)
+
+
 def print_leagues(console: Console):
     table = Table(title="Supported Leagues", box=box.HORIZONTALS)
     table.add_column("Name")
     table.add_column("Code")
-    for league in SUPPORTED_LEAGUES:
-        table.add_row(SUPPORTED_LEAGUES[league]["name"], league)
+    for code, league in COMPETITIONS.items():
+        table.add_row(league["name"], code)
     console.print(table)
 
 
@@ -184,29 +318,211 @@ def print_teams(console: Console, df: pd.DataFrame):
     console.print(table)
 
 
-# def top_scorers(console: Console, df: pd.DataFrame, title: str):
-#     # console.print(Text(f"⚽ lgdash v{version}\n", style="bold"))
-#     console.print(Text("🏴󠁧󠁢󠁥󠁮󠁧󠁿 Premier League"))
-#     console.print("")
-#     table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+def _form_text(form: str) -> Text:
+    colors = {"W": "orange1", "D": "blue", "L": "grey50"}
+    text = Text()
+    for result in form:
+        text.append(result, style=colors.get(result, ""))
+    return text
 
-#     table.add_column("Player", justify="left")
-#     table.add_column("Team", justify="left")
-#     table.add_column("Goals", justify="right")
-#     table.add_column("Assists", justify="right")
-#     # table.add_column("Penalties", justify="right")
 
-#     for index, row in df.iterrows():
-#         table.add_row(
-#             row["name"],
-#             row["team"],
-#             str(row["goals"]),
-#             str(row["assists"]),
-#             # str(row["penalties"]),
-#         )
+def print_form(console: Console, df: pd.DataFrame, title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("Team", justify="left")
+    table.add_column("Form", justify="left")
+    table.add_column("Points", justify="right")
+    table.add_column("GF", justify="right")
+    table.add_column("GA", justify="right")
+
+    for _, row in df.iterrows():
+        table.add_row(
+            row["team"],
+            _form_text(row["form"]),
+            str(row["points"]),
+            str(row["goals_for"]),
+            str(row["goals_against"]),
+        )
+
+    console.print(table)
+
+
+def print_splits(console: Console, df: pd.DataFrame, title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("Team", justify="left")
+    for venue in ["Home", "Away"]:
+        table.add_column(f"{venue} P", justify="right")
+        table.add_column("W-D-L", justify="center")
+        table.add_column("GD", justify="right")
+        table.add_column("Pts", justify="right")
+
+    for _, row in df.iterrows():
+        cells = [row["team"]]
+        for venue in ["home", "away"]:
+            cells += [
+                str(row[f"{venue}_played"]),
+                f"{row[f'{venue}_won']}-{row[f'{venue}_draw']}-{row[f'{venue}_lost']}",
+                str(row[f"{venue}_goal_difference"]),
+                str(row[f"{venue}_points"]),
+            ]
+        table.add_row(*cells)
+
+    console.print(table)
+
+
+def print_head_to_head(console: Console, summary: Dict, df: pd.DataFrame):
+    title = f"{summary['team']} vs {summary['opponent']}"
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("Date", justify="left")
+    table.add_column("Home", justify="right")
+    table.add_column("Score", justify="center")
+    table.add_column("Away", justify="left")
+
+    for _, row in df.iterrows():
+        if row["venue"] == "HOME":
+            home, away = row["team"], row["opponent"]
+            score = f"{row['goals_for']} - {row['goals_against']}"
+        else:
+            home, away = row["opponent"], row["team"]
+            score = f"{row['goals_against']} - {row['goals_for']}"
+        table.add_row(row["utc_datetime"].strftime("%Y-%m-%d"), home, score, away)
+
+    console.print(table)
+    console.print(
+        Text(
+            f"{summary['team']}: {summary['won']}W {summary['draw']}D "
+            f"{summary['lost']}L, {summary['goals_for']}-{summary['goals_against']}"
+        )
+    )
+
+
+def print_scorers(console: Console, df: pd.DataFrame, title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    multi_league = "league" in df.columns
+
+    table.add_column("", justify="right")
+    table.add_column("Player", justify="left")
+    table.add_column("Team", justify="left")
+    if multi_league:
+        table.add_column("League", justify="left")
+    table.add_column("Goals", justify="right")
+    table.add_column("Assists", justify="right")
+    table.add_column("Pens", justify="right")
+
+    for rank, (_, row) in enumerate(df.iterrows(), start=1):
+        cells = [str(rank), row["name"], row["team"]]
+        if multi_league:
+            cells.append(COMPETITIONS[row["league"]]["name"])
+        cells += [str(row["goals"]), str(row["assists"]), str(row["penalties"])]
+        table.add_row(*cells)
+
+    console.print(table)
+
+
+def _format_seconds(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if seconds == float("inf"):
+        return "slow"
+    return f"{seconds * 1000:.0f} ms"
+
+
+def print_metrics(console: Console, summary: List[Dict], title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("Endpoint", justify="left")
+    table.add_column("Requests", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("429s", justify="right")
+    table.add_column("Avg", justify="right")
+    table.add_column("p95", justify="right")
+    table.add_column("Parse", justify="right")
+    table.add_column("KB", justify="right")
+
+    for row in summary:
+        table.add_row(
+            row["endpoint"].removeprefix("/v4/competitions/"),
+            str(int(row["requests"])),
+            str(int(row["errors"])),
+            str(int(row["rate_limited"])),
+            _format_seconds(row["avg_seconds"]),
+            # bucket upper bound, so "<="
+            "<= " + _format_seconds(row["p95_seconds"]),
+            _format_seconds(row["avg_parse_seconds"]),
+            f"{row['bytes'] / 1024:.0f}",
+        )
+
+    console.print(table)
 
-#     console.print(table)
-#     console.print("")
+
+def print_profile(console: Console, timings: Dict, total: float):
+    table = Table(title="Profile", box=box.HORIZONTALS, show_header=True)
+    table.add_column("Stage", justify="left")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Calls", justify="right")
+    table.add_column("%", justify="right")
+
+    for name, (seconds, calls) in timings.items():
+        share = 100 * seconds / total if total else 0
+        table.add_row(name, f"{seconds:.3f}", str(calls), f"{share:.0f}")
+    table.add_row(Text("total", style="bold"), f"{total:.3f}", "", "")
+
+    console.print(table)
+
+
+def print_warm(console: Console, results: List[WarmResult], title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("League", justify="left")
+    table.add_column("Item", justify="left")
+    table.add_column("Requests", justify="right")
+    table.add_column("Seconds", justify="right")
+    table.add_column("", justify="left")
+
+    for result in results:
+        table.add_row(
+            result.league,
+            result.item,
+            str(result.requests),
+            f"{result.seconds:.2f}",
+            Text(result.error or "", style="red"),
+        )
+
+    console.print(table)
+
+
+def print_backfill(console: Console, results: List[BackfillResult], title: str):
+    table = Table(title=title, box=box.HORIZONTALS, show_header=True)
+    table.add_column("League", justify="left")
+    table.add_column("Season", justify="left")
+    table.add_column("Matches", justify="right")
+    table.add_column("", justify="left")
+
+    for result in results:
+        if result.error:
+            status = Text(result.error, style="red")
+        elif result.skipped:
+            status = Text("already stored", style="dim")
+        elif not result.complete:
+            status = Text("in progress, fetched again next run", style="italic")
+        else:
+            status = Text("")
+        table.add_row(result.league, str(result.season), str(result.matches), status)
+
+    console.print(table)
+
+
+def print_board_stats(console: Console, stats: Dict, cpu: float, wall: float):
+    table = Table(title="Board", box=box.HORIZONTALS, show_header=False)
+    table.add_column("", justify="left")
+    table.add_column("", justify="right")
+
+    table.add_row("Frames", str(stats["frames"]))
+    table.add_row("Panes drawn", str(stats["drawn"]))
+    table.add_row("Updates skipped, unchanged", str(stats["unchanged"]))
+    table.add_row("Frames over budget", str(stats["deferred"]))
+    table.add_row("Drawing CPU", f"{stats['cpu']:.3f} s")
+    share = 100 * cpu / wall if wall else 0
+    table.add_row("Process CPU", f"{cpu:.3f} s ({share:.1f}% of {wall:.0f} s)")
+
+    console.print(table)
 
 
 class LeagueDashboard:
@@ -215,30 +531,74 @@ class LeagueDashboard:
 
     def _league_header(self, league_code: str):
         league_header = (
-            SUPPORTED_LEAGUES[league_code]["icon"]
-            + " "
-            + SUPPORTED_LEAGUES[league_code]["name"]
+            COMPETITIONS[league_code]["icon"] + " " + COMPETITIONS[league_code]["name"]
         )
         self.console.print(Text(league_header))
 
-    def today(self, league_code: str, df: pd.DataFrame):
+    @profiling.timed("render")
+    def today(self, league_code: str, df: pd.DataFrame, title: str = "Today's Matches"):
         self._league_header(league_code)
         self.console.print("")
         if df.empty:
             self.console.print(Text("No matches today ¯\\_(ツ)_/¯", style="italic"))
         else:
-            print_todays_matches(self.console, df, "Today's Matches")
+            print_todays_matches(self.console, df, title)
         self.console.print("")
 
-    def standings(self, league_code: str, df: pd.DataFrame, metadata: Dict):
+    @profiling.timed("render")
+    def matches(self, league_code: str, df: pd.DataFrame, title: str = "Matches"):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty:
+            self.console.print(Text("No matches found ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            self.console.print(todays_matches_table(df, title, show_date=True))
+        self.console.print("")
+
+    @profiling.timed("render")
+    def standings(
+        self,
+        league_code: str,
+        df: pd.DataFrame,
+        metadata: Dict,
+        title: str = "Standings",
+    ):
         self._league_header(league_code)
         self.console.print("")
         if df.empty:
             self.console.print(Text("No standings found ¯\\_(ツ)_/¯", style="italic"))
         else:
-            print_standings(self.console, df, metadata)
+            print_standings(self.console, df, metadata, title=title)
+        self.console.print("")
+
+    @profiling.timed("render")
+    def timeline(self, league_code: str, df: pd.DataFrame, metadata: Dict):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty or df.columns.empty:
+            self.console.print(Text("No matchdays played ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            print_timeline(self.console, df, metadata)
         self.console.print("")
 
+    @profiling.timed("render")
+    def projections(self, league_code: str, df: pd.DataFrame, simulations: int):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty:
+            self.console.print(Text("No season to project ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            top, relegated = ZONES.get(league_code, DEFAULT_ZONES)
+            print_projections(
+                self.console,
+                df,
+                top,
+                relegated,
+                f"Projections ({simulations:,} simulations)",
+            )
+        self.console.print("")
+
+    @profiling.timed("render")
     def schedule(self, league_code: str, df: pd.DataFrame):
         self._league_header(league_code)
         self.console.print("")
@@ -250,13 +610,122 @@ class LeagueDashboard:
             print_upcoming_matches(self.console, df, "Upcoming Matches")
         self.console.print("")
 
+    @profiling.timed("render")
     def leagues(self):
         self.console.print("")
         print_leagues(self.console)
         self.console.print("")
 
+    @profiling.timed("render")
+    def watch(self, league_code: str, df: pd.DataFrame, events: Iterable[MatchEvent]):
+        self.console.clear()
+        self.today(league_code, df)
+        print_events(self.console, events)
+
+    def backfill(self, results: List[BackfillResult], directory: str):
+        self.console.print("")
+        print_backfill(self.console, results, "Backfill")
+        self.console.print(Text(f"Stored in {directory}"))
+        self.console.print("")
+
+    def board_stats(self, stats: Dict, cpu: float, wall: float):
+        self.console.print("")
+        print_board_stats(self.console, stats, cpu, wall)
+        self.console.print("")
+
+    def notify(self, event: MatchEvent):
+        if isinstance(event, GoalEvent):
+            self.console.bell()
+
+    @profiling.timed("render")
+    def form(self, league_code: str, df: pd.DataFrame, last: int):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty:
+            self.console.print(Text("No results found ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            print_form(self.console, df, f"Form (Last {last})")
+        self.console.print("")
+
+    @profiling.timed("render")
+    def splits(self, league_code: str, df: pd.DataFrame):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty:
+            self.console.print(Text("No results found ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            print_splits(self.console, df, "Home / Away")
+        self.console.print("")
+
+    @profiling.timed("render")
+    def head_to_head(self, league_code: str, summary: Dict, df: pd.DataFrame):
+        self._league_header(league_code)
+        self.console.print("")
+        if df.empty:
+            self.console.print(
+                Text("No meetings this season ¯\\_(ツ)_/¯", style="italic")
+            )
+        else:
+            print_head_to_head(self.console, summary, df)
+        self.console.print("")
+
+    @profiling.timed("render")
+    def scorers(self, league_codes: List[str], df: pd.DataFrame):
+        if len(league_codes) == 1:
+            self._league_header(league_codes[0])
+        else:
+            icons = " ".join(
+                COMPETITIONS[code]["icon"].strip() for code in league_codes
+            )
+            self.console.print(Text(f"{icons} All Leagues"))
+        self.console.print("")
+        if df.empty:
+            self.console.print(Text("No scorers found ¯\\_(ツ)_/¯", style="italic"))
+        else:
+            print_scorers(self.console, df, "Top Scorers")
+        self.console.print("")
+
+    @profiling.timed("render")
     def teams(self, league_code: str, df: pd.DataFrame):
         self._league_header(league_code)
         self.console.print("")
         print_teams(self.console, df)
         self.console.print("")
+
+    def profile(self, timings: Dict, total: float):
+        self.console.print("")
+        print_profile(self.console, timings, total)
+        self.console.print("")
+
+    def metrics(
+        self, summary: List[Dict], hit_rate: Optional[float], quota: Optional[float]
+    ):
+        self.console.print("")
+        if not summary and hit_rate is None:
+            self.console.print(Text("No metrics recorded yet", style="italic"))
+        else:
+            print_metrics(self.console, summary, "Requests")
+            hits = "-" if hit_rate is None else f"{hit_rate:.0%}"
+            self.console.print(Text(f"Cache hit rate: {hits}"))
+            if quota is not None:
+                self.console.print(Text(f"Quota left this minute: {quota:.0f}"))
+        self.console.print("")
+
+    def warm(
+        self,
+        results: List[WarmResult],
+        peak: Optional[Tuple[datetime, datetime]],
+        in_peak: bool = False,
+    ):
+        self.console.print("")
+        if in_peak:
+            until = peak[1].astimezone().strftime("%H:%M")
+            self.console.print(
+                Text(f"Matches on until {until}, not warming", style="italic")
+            )
+        else:
+            print_warm(self.console, results, "Cache Warmed")
+            if peak is not None:
+                start = peak[0].astimezone().strftime("%a %H:%M")
+                self.console.print(Text(f"Next match window opens {start}"))
+        self.console.print("")
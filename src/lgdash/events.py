@@ -0,0 +1,212 @@
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, Iterable, List, NamedTuple, Optional, Type
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUFFER_SIZE = 256
+
+KICKOFF_FROM = {"TIMED", "SCHEDULED"}
+LIVE_STATUSES = {"IN_PLAY", "PAUSED"}
+
+
+class _MatchState(NamedTuple):
+    """
+    The handful of fields we diff between snapshots, kept per match id.
+    """
+
+    last_updated: Optional[str]
+    status: Optional[str]
+    home_score: Optional[int]
+    away_score: Optional[int]
+    minute: Optional[int]
+    injury_time: Optional[int]
+    home_team: str
+    away_team: str
+
+
+def _state_from_match(match: Dict) -> _MatchState:
+    full_time = match["score"]["fullTime"]
+    return _MatchState(
+        last_updated=match.get("lastUpdated"),
+        status=match["status"],
+        home_score=full_time["home"],
+        away_score=full_time["away"],
+        minute=match.get("minute"),
+        injury_time=match.get("injuryTime"),
+        home_team=match["homeTeam"]["tla"],
+        away_team=match["awayTeam"]["tla"],
+    )
+
+
+@dataclass(frozen=True)
+class MatchEvent:
+    match_id: int
+    home_team: str
+    away_team: str
+    home_score: Optional[int]
+    away_score: Optional[int]
+    minute: Optional[int]
+
+    @property
+    def scoreline(self) -> str:
+        home = "-" if self.home_score is None else self.home_score
+        away = "-" if self.away_score is None else self.away_score
+        return f"{self.home_team} {home}-{away} {self.away_team}"
+
+
+@dataclass(frozen=True)
+class GoalEvent(MatchEvent):
+    # "HOME" or "AWAY"
+    side: str
+
+    @property
+    def scoring_team(self) -> str:
+        return self.home_team if self.side == "HOME" else self.away_team
+
+
+@dataclass(frozen=True)
+class ScoreCorrectionEvent(MatchEvent):
+    """A score went down, e.g. a goal ruled out after the fact."""
+
+    previous_home_score: Optional[int]
+    previous_away_score: Optional[int]
+
+
+@dataclass(frozen=True)
+class StatusChangeEvent(MatchEvent):
+    previous_status: Optional[str]
+    status: str
+
+    @property
+    def is_kickoff(self) -> bool:
+        return self.previous_status in KICKOFF_FROM and self.status in LIVE_STATUSES
+
+    @property
+    def is_half_time(self) -> bool:
+        return self.status == "PAUSED"
+
+    @property
+    def is_full_time(self) -> bool:
+        return self.status == "FINISHED"
+
+
+@dataclass(frozen=True)
+class MinuteUpdateEvent(MatchEvent):
+    injury_time: Optional[int]
+
+
+def _diff(match_id: int, old: _MatchState, new: _MatchState) -> List[MatchEvent]:
+    common = dict(
+        match_id=match_id,
+        home_team=new.home_team,
+        away_team=new.away_team,
+        home_score=new.home_score,
+        away_score=new.away_score,
+        minute=new.minute,
+    )
+    events: List[MatchEvent] = []
+
+    if new.status != old.status:
+        events.append(
+            StatusChangeEvent(**common, previous_status=old.status, status=new.status)
+        )
+
+    old_home, old_away = old.home_score or 0, old.away_score or 0
+    new_home, new_away = new.home_score or 0, new.away_score or 0
+    if new_home < old_home or new_away < old_away:
+        events.append(
+            ScoreCorrectionEvent(
+                **common,
+                previous_home_score=old.home_score,
+                previous_away_score=old.away_score,
+            )
+        )
+    else:
+        # one event per goal so a missed poll doesn't swallow one
+        events.extend(
+            GoalEvent(**common, side="HOME") for _ in range(new_home - old_home)
+        )
+        events.extend(
+            GoalEvent(**common, side="AWAY") for _ in range(new_away - old_away)
+        )
+
+    if new.minute != old.minute or new.injury_time != old.injury_time:
+        events.append(MinuteUpdateEvent(**common, injury_time=new.injury_time))
+
+    return events
+
+
+class MatchEventEngine:
+    """
+    Turns successive raw match snapshots into typed events.
+
+    The previous snapshot is kept keyed by match id. Matches whose
+    `lastUpdated` stamp has not moved are skipped without looking at the
+    rest of the payload, so the work done per poll tracks what changed.
+    """
+
+    def __init__(self, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        :param buffer_size: Number of recent events to keep around
+        """
+        self._state: Dict[int, _MatchState] = {}
+        self._listeners: List[tuple] = []
+        self.recent: Deque[MatchEvent] = deque(maxlen=buffer_size)
+
+    def subscribe(
+        self,
+        callback: Callable[[MatchEvent], None],
+        event_type: Type[MatchEvent] = MatchEvent,
+    ) -> None:
+        """
+        Register a callback for events of the given type (and subclasses).
+        """
+        self._listeners.append((event_type, callback))
+
+    def unsubscribe(self, callback: Callable[[MatchEvent], None]) -> None:
+        # equality, not identity: each `obj.method` is a new bound method
+        self._listeners = [(t, cb) for t, cb in self._listeners if cb != callback]
+
+    def _emit(self, event: MatchEvent) -> None:
+        self.recent.append(event)
+        for event_type, callback in self._listeners:
+            if isinstance(event, event_type):
+                try:
+                    callback(event)
+                except Exception:
+                    # a broken listener shouldn't stop the feed
+                    logger.exception(f"Event listener {callback!r} failed")
+
+    def update(self, matches: Iterable[Dict]) -> List[MatchEvent]:
+        """
+        Diff a snapshot against the previous one and emit the changes.
+
+        Matches seen for the first time only seed the state.
+
+        :param matches: Raw match dicts as returned by the API
+        :return: Events emitted for this snapshot, in order
+        """
+        emitted = []
+        for match in matches:
+            match_id = match["id"]
+            old = self._state.get(match_id)
+            stamp = match.get("lastUpdated")
+            # without a stamp on both sides there's nothing to go by
+            if old is not None and stamp and old.last_updated == stamp:
+                continue
+            new = _state_from_match(match)
+            self._state[match_id] = new
+            if old is None:
+                continue
+            for event in _diff(match_id, old, new):
+                self._emit(event)
+                emitted.append(event)
+        if emitted:
+            logger.debug(f"Emitted {len(emitted)} match events")
+        return emitted
+
+    def reset(self) -> None:
+        self._state.clear()
+        self.recent.clear()
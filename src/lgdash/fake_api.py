@@ -0,0 +1,713 @@
+"""
+A stand-in for the football-data.org API, for load tests without the
+network.
+
+    python -m lgdash.fake_api --port 8080 --speed 10
+    LGDASH_API_URL=http://localhost:8080 lgdash watch
+
+Seasons are synthetic and fixed by a seed. Match states are derived
+from a virtual clock rather than stored, so live progression needs no
+background thread and any number of request threads can read them.
+Rate limit headers, 429s, latency and 5xx faults follow the options
+given to `FakeFootballData`.
+"""
+
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import click
+
+from .leagues import SUPPORTED_LEAGUES
+
+logger = logging.getLogger(__name__)
+
+CITIES = [
+    "Ashford",
+    "Brampton",
+    "Carlow",
+    "Dunmore",
+    "Eastwick",
+    "Fairhaven",
+    "Glenmoor",
+    "Hollowell",
+    "Ironbridge",
+    "Juniper",
+    "Kingsbury",
+    "Larkhill",
+    "Millbrook",
+    "Northgate",
+    "Oakridge",
+    "Pinecrest",
+    "Queensbay",
+    "Riverton",
+    "Stonehaven",
+    "Thornbury",
+]
+# distinct initials, so city prefix plus suffix initial is a unique TLA
+SUFFIXES = [
+    "United",
+    "City",
+    "Athletic",
+    "Rovers",
+    "Town",
+    "Wanderers",
+    "Forest",
+    "Harbour",
+    "Palace",
+    "Vale",
+]
+MAX_TEAMS = len(CITIES) * len(SUFFIXES)
+
+# minutes after kickoff, virtual time
+FIRST_HALF_END = 48
+SECOND_HALF_START = 63
+FULL_TIME = 113
+# kickoffs within a matchday, minutes after the first
+KICKOFF_SLOTS = [0, 150, 300, 450]
+
+HOME_GOALS_MEAN = 1.5
+AWAY_GOALS_MEAN = 1.2
+
+STAGES = {"CL": "LEAGUE_STAGE"}
+
+Response = Tuple[int, Dict[str, str], Dict]
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def round_robin(n: int) -> List[List[Tuple[int, int]]]:
+    """
+    Double round robin by the circle method, second half mirrored.
+
+    :return: Matchdays of (home, away) team indexes
+    """
+    ids: List[Optional[int]] = list(range(n)) + ([None] if n % 2 else [])
+    rounds = []
+    for r in range(len(ids) - 1):
+        pairs = []
+        for i in range(len(ids) // 2):
+            a, b = ids[i], ids[-1 - i]
+            if a is None or b is None:
+                continue
+            pairs.append((a, b) if r % 2 == 0 else (b, a))
+        rounds.append(pairs)
+        ids = [ids[0], ids[-1]] + ids[1:-1]
+    return rounds + [[(b, a) for a, b in pairs] for pairs in rounds]
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    # Knuth, fine for small means
+    limit, k, p = math.exp(-mean), 0, rng.random()
+    while p > limit:
+        k += 1
+        p *= rng.random()
+    return k
+
+
+class SyntheticSeason:
+    """
+    One competition's teams and fixtures, with goals decided up front.
+    """
+
+    def __init__(
+        self,
+        code: str,
+        teams: int = 20,
+        seed: int = 0,
+        anchor: Optional[datetime] = None,
+        current_matchday: Optional[int] = None,
+    ):
+        """
+        :param code: Competition code
+        :param teams: Number of teams, up to MAX_TEAMS
+        :param seed: Same seed, same season
+        :param anchor: First kickoff of the current matchday, defaults
+            to half an hour ago so matches are live straight away
+        :param current_matchday: Defaults to the middle of the season
+        """
+        if not 2 <= teams <= MAX_TEAMS:
+            raise ValueError(f"teams must be between 2 and {MAX_TEAMS}")
+        self.code = code
+        self.index = list(SUPPORTED_LEAGUES).index(code)
+        self.name = SUPPORTED_LEAGUES[code]["name"]
+        self.stage = STAGES.get(code, "REGULAR_SEASON")
+        rng = random.Random(f"{seed}:{code}")
+
+        self.teams = []
+        for i in range(teams):
+            # each league starts at a different city
+            slot = (i + 3 * self.index) % MAX_TEAMS
+            city, suffix = CITIES[slot % len(CITIES)], SUFFIXES[slot // len(CITIES)]
+            self.teams.append(
+                {
+                    "id": 1000 * (self.index + 1) + i,
+                    "name": f"{city} {suffix} FC",
+                    "shortName": f"{city} {suffix}",
+                    "tla": (city[:2] + suffix[0]).upper(),
+                    "crest": "",
+                }
+            )
+        strength = [rng.uniform(0.7, 1.4) for _ in self.teams]
+
+        matchdays = round_robin(teams)
+        current = current_matchday or (len(matchdays) + 1) // 2
+        anchor = anchor or datetime.now(timezone.utc) - timedelta(minutes=30)
+        first = anchor.replace(microsecond=0) - timedelta(weeks=current - 1)
+        self.current_matchday = current
+        self.start_date = first.date()
+        self.end_date = (first + timedelta(weeks=len(matchdays) - 1)).date()
+
+        self.fixtures = []
+        for day, pairs in enumerate(matchdays):
+            for j, (home, away) in enumerate(pairs):
+                ratio = strength[home] / strength[away]
+                self.fixtures.append(
+                    {
+                        "id": 1_000_000 * (self.index + 1) + len(self.fixtures),
+                        "matchday": day + 1,
+                        "kickoff": first
+                        + timedelta(
+                            weeks=day, minutes=KICKOFF_SLOTS[j % len(KICKOFF_SLOTS)]
+                        ),
+                        "home": home,
+                        "away": away,
+                        "home_goals": sorted(
+                            rng.randint(1, 90)
+                            for _ in range(_poisson(rng, HOME_GOALS_MEAN * ratio))
+                        ),
+                        "away_goals": sorted(
+                            rng.randint(1, 90)
+                            for _ in range(_poisson(rng, AWAY_GOALS_MEAN / ratio))
+                        ),
+                    }
+                )
+
+    @property
+    def competition(self) -> Dict:
+        return {
+            "id": 2000 + self.index,
+            "name": self.name,
+            "code": self.code,
+            "type": "LEAGUE",
+            "emblem": "",
+        }
+
+    @property
+    def season(self) -> Dict:
+        return {
+            "id": 3000 + self.index,
+            "startDate": self.start_date.isoformat(),
+            "endDate": self.end_date.isoformat(),
+            "currentMatchday": self.current_matchday,
+            "winner": None,
+        }
+
+    def match(self, fixture: Dict, now: datetime) -> Dict:
+        """
+        A fixture as the API would return it at `now`.
+        """
+        kickoff = fixture["kickoff"]
+        elapsed = (now - kickoff).total_seconds() / 60
+        minute = injury = None
+        played = 0
+        if elapsed < 0:
+            status = "TIMED"
+            updated = kickoff - timedelta(days=1)
+        elif elapsed >= FULL_TIME:
+            status, minute, injury, played = "FINISHED", 90, 5, 90
+            updated = kickoff + timedelta(minutes=FULL_TIME)
+        elif FIRST_HALF_END <= elapsed < SECOND_HALF_START:
+            status, minute, played = "PAUSED", 45, 45
+            updated = kickoff + timedelta(minutes=FIRST_HALF_END)
+        else:
+            status = "IN_PLAY"
+            if elapsed < FIRST_HALF_END:
+                played = int(elapsed) + 1
+                cap = 45
+            else:
+                played = 46 + int(elapsed - SECOND_HALF_START)
+                cap = 90
+            minute = min(played, cap)
+            injury = played - cap if played > cap else None
+            played = minute
+            updated = kickoff + timedelta(minutes=int(elapsed))
+
+        home_score = away_score = None
+        half_time = {"home": None, "away": None}
+        if status != "TIMED":
+            home_score = sum(1 for m in fixture["home_goals"] if m <= played)
+            away_score = sum(1 for m in fixture["away_goals"] if m <= played)
+            half_time = {
+                "home": sum(1 for m in fixture["home_goals"] if m <= min(played, 45)),
+                "away": sum(1 for m in fixture["away_goals"] if m <= min(played, 45)),
+            }
+        winner = None
+        if status == "FINISHED":
+            winner = (
+                "HOME_TEAM"
+                if home_score > away_score
+                else "AWAY_TEAM" if away_score > home_score else "DRAW"
+            )
+
+        home, away = self.teams[fixture["home"]], self.teams[fixture["away"]]
+        return {
+            "area": {"id": 2000, "name": "Nowhere", "code": "NWH"},
+            "competition": self.competition,
+            "season": self.season,
+            "id": fixture["id"],
+            "utcDate": _iso(kickoff),
+            "status": status,
+            "minute": minute,
+            "injuryTime": injury,
+            "matchday": fixture["matchday"],
+            "stage": self.stage,
+            "group": None,
+            "lastUpdated": _iso(updated),
+            "homeTeam": dict(home),
+            "awayTeam": dict(away),
+            "score": {
+                "winner": winner,
+                "duration": "REGULAR",
+                "fullTime": {"home": home_score, "away": away_score},
+                "halfTime": half_time,
+            },
+        }
+
+    def matches(
+        self,
+        now: datetime,
+        date_from: Optional[date] = None,
+        date_to: Optional[date] = None,
+        matchday: Optional[int] = None,
+        statuses: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        selected = []
+        for fixture in self.fixtures:
+            day = fixture["kickoff"].date()
+            if date_from and day < date_from or date_to and day > date_to:
+                continue
+            if matchday and fixture["matchday"] != matchday:
+                continue
+            match = self.match(fixture, now)
+            if statuses and match["status"] not in statuses:
+                continue
+            selected.append(match)
+        return selected
+
+    def table(self, now: datetime) -> List[Dict]:
+        rows = {
+            i: dict.fromkeys(
+                ["playedGames", "won", "draw", "lost", "goalsFor", "goalsAgainst"], 0
+            )
+            for i in range(len(self.teams))
+        }
+        for fixture in self.fixtures:
+            if (now - fixture["kickoff"]).total_seconds() / 60 < FULL_TIME:
+                continue
+            home_goals, away_goals = len(fixture["home_goals"]), len(
+                fixture["away_goals"]
+            )
+            for team, scored, conceded in [
+                (fixture["home"], home_goals, away_goals),
+                (fixture["away"], away_goals, home_goals),
+            ]:
+                row = rows[team]
+                row["playedGames"] += 1
+                row["goalsFor"] += scored
+                row["goalsAgainst"] += conceded
+                if scored > conceded:
+                    row["won"] += 1
+                elif scored == conceded:
+                    row["draw"] += 1
+                else:
+                    row["lost"] += 1
+
+        for row in rows.values():
+            row["points"] = 3 * row["won"] + row["draw"]
+            row["goalDifference"] = row["goalsFor"] - row["goalsAgainst"]
+        order = sorted(
+            rows,
+            key=lambda i: (
+                -rows[i]["points"],
+                -rows[i]["goalDifference"],
+                -rows[i]["goalsFor"],
+                self.teams[i]["shortName"],
+            ),
+        )
+        return [
+            {"position": position, "team": dict(self.teams[i]), "form": None, **rows[i]}
+            for position, i in enumerate(order, start=1)
+        ]
+
+
+class VirtualClock:
+    """
+    UTC time that runs `speed` times faster than the wall clock.
+    """
+
+    def __init__(self, speed: float = 1.0, start: Optional[datetime] = None):
+        self.speed = speed
+        self.start = start or datetime.now(timezone.utc)
+        self._started = time.monotonic()
+
+    def __call__(self) -> datetime:
+        elapsed = (time.monotonic() - self._started) * self.speed
+        return self.start + timedelta(seconds=elapsed)
+
+
+class RateLimiter:
+    """
+    Fixed one-minute windows per token, like the real API.
+    """
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.per_minute = per_minute
+        self.clock = clock
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, token: str) -> Tuple[bool, int, int]:
+        """
+        :return: Whether the request is allowed, requests left in the
+            window and seconds until it resets
+        """
+        now = self.clock()
+        with self._lock:
+            start, count = self._windows.get(token, (now, 0))
+            if now - start >= 60:
+                start, count = now, 0
+            allowed = count < self.per_minute
+            if allowed:
+                count += 1
+            self._windows[token] = (start, count)
+        return allowed, self.per_minute - count, max(1, math.ceil(start + 60 - now))
+
+
+class FakeFootballData:
+    """
+    Routes API paths to synthetic seasons, with faults injected.
+    Independent of HTTP, so it can be called directly in tests.
+    """
+
+    def __init__(
+        self,
+        leagues: Optional[List[str]] = None,
+        teams: int = 20,
+        seed: int = 0,
+        speed: float = 1.0,
+        current_matchday: Optional[int] = None,
+        rate_limit: int = 10,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        """
+        :param leagues: Competition codes, defaults to all supported
+        :param teams: Teams per competition
+        :param seed: Seed for seasons and faults
+        :param speed: Virtual minutes per real minute
+        :param current_matchday: Matchday under way when the server starts
+        :param rate_limit: Requests per minute per token, 0 for no limit
+        :param latency: Seconds added to every response
+        :param jitter: Up to this many more seconds, at random
+        :param error_rate: Share of requests answered with a 5xx
+        :param clock: Virtual time, overrides `speed`
+        """
+        self.clock = clock or VirtualClock(speed)
+        anchor = self.clock() - timedelta(minutes=30)
+        self.seasons = {
+            code: SyntheticSeason(code, teams, seed, anchor, current_matchday)
+            for code in (leagues or list(SUPPORTED_LEAGUES))
+        }
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+
+    @staticmethod
+    def _error(status: int, message: str) -> Response:
+        return status, {}, {"message": message, "errorCode": status}
+
+    def handle(self, path: str, query: Dict[str, str], token: str = "") -> Response:
+        """
+        :return: Status code, extra headers and JSON body
+        """
+        headers = {"X-API-Version": "v4"}
+        if self.limiter is not None:
+            allowed, remaining, reset = self.limiter.take(token)
+            headers["X-Requests-Available-Minute"] = str(remaining)
+            headers["X-RequestCounter-Reset"] = str(reset)
+            if not allowed:
+                return (
+                    429,
+                    headers,
+                    {
+                        "message": f"You reached your request limit. "
+                        f"Wait {reset} seconds.",
+                        "errorCode": 429,
+                    },
+                )
+
+        with self._rng_lock:
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+            fault = self._rng.random() < self.error_rate
+            fault_status = self._rng.choice([500, 502, 503])
+        if delay:
+            time.sleep(delay)
+        if fault:
+            status, _, body = self._error(fault_status, "Injected fault.")
+            return status, headers, body
+
+        try:
+            status, body = self._route(re.sub("/+", "/", path), query)
+        except ValueError as e:
+            status, _, body = self._error(400, str(e))
+        return status, headers, body
+
+    def _route(self, path: str, query: Dict[str, str]) -> Tuple[int, Dict]:
+        now = self.clock()
+        date_from = (
+            date.fromisoformat(query["dateFrom"]) if "dateFrom" in query else None
+        )
+        date_to = date.fromisoformat(query["dateTo"]) if "dateTo" in query else None
+        if bool(date_from) != bool(date_to):
+            raise ValueError("dateFrom and dateTo must be given together.")
+        statuses = query["status"].split(",") if "status" in query else None
+
+        if path.rstrip("/") == "/v4/matches":
+            codes = query.get("competitions")
+            codes = codes.split(",") if codes else list(self.seasons)
+            date_from = date_from or now.date()
+            date_to = date_to or now.date()
+            matches = [
+                match
+                for code in codes
+                if code in self.seasons
+                for match in self.seasons[code].matches(
+                    now, date_from, date_to, statuses=statuses
+                )
+            ]
+            matches.sort(key=lambda m: (m["utcDate"], m["id"]))
+            filters = {"dateFrom": date_from.isoformat(), "dateTo": date_to.isoformat()}
+            return 200, {
+                "filters": filters,
+                "resultSet": self._result_set(matches),
+                "matches": matches,
+            }
+
+        if path.rstrip("/") == "/v4/competitions":
+            competitions = [
+                dict(season.competition, area={"name": "Nowhere"})
+                for season in self.seasons.values()
+            ]
+            return 200, {
+                "count": len(competitions),
+                "filters": {},
+                "competitions": competitions,
+            }
+
+        found = re.fullmatch(r"/v4/teams/(\d+)/matches/?", path)
+        if found:
+            team_id = int(found.group(1))
+            codes = query.get("competitions")
+            codes = codes.split(",") if codes else list(self.seasons)
+            sides = {"HOME": ["homeTeam"], "AWAY": ["awayTeam"]}.get(
+                query.get("venue"), ["homeTeam", "awayTeam"]
+            )
+            matches = [
+                match
+                for code in codes
+                if code in self.seasons
+                for match in self.seasons[code].matches(
+                    now, date_from, date_to, statuses=statuses
+                )
+                if any(match[side]["id"] == team_id for side in sides)
+            ]
+            matches.sort(key=lambda m: (m["utcDate"], m["id"]))
+            return 200, {
+                "filters": dict(query),
+                "resultSet": self._result_set(matches),
+                "matches": matches,
+            }
+
+        found = re.fullmatch(r"/v4/competitions/(\w+)/(\w+)/?", path)
+        if not found or found.group(1) not in self.seasons:
+            return 404, {
+                "message": "The resource you are looking for does not exist.",
+                "errorCode": 404,
+            }
+        season, resource = self.seasons[found.group(1)], found.group(2)
+        filters = {"season": season.start_date.strftime("%Y")}
+
+        if resource == "matches":
+            matchday = int(query["matchday"]) if "matchday" in query else None
+            matches = season.matches(now, date_from, date_to, matchday, statuses)
+            filters.update({k: query[k] for k in query})
+            return 200, {
+                "filters": filters,
+                "resultSet": self._result_set(matches),
+                "competition": season.competition,
+                "matches": matches,
+            }
+        if resource == "standings":
+            return 200, {
+                "filters": filters,
+                "area": {"id": 2000, "name": "Nowhere", "code": "NWH"},
+                "competition": season.competition,
+                "season": season.season,
+                "standings": [
+                    {
+                        "stage": season.stage,
+                        "type": "TOTAL",
+                        "group": None,
+                        "table": season.table(now),
+                    }
+                ],
+            }
+        if resource == "teams":
+            teams = [dict(team, area={"name": "Nowhere"}) for team in season.teams]
+            return 200, {
+                "count": len(teams),
+                "filters": filters,
+                "competition": season.competition,
+                "season": season.season,
+                "teams": teams,
+            }
+        return 404, {
+            "message": "The resource you are looking for does not exist.",
+            "errorCode": 404,
+        }
+
+    @staticmethod
+    def _result_set(matches: List[Dict]) -> Dict:
+        days = [m["utcDate"][:10] for m in matches]
+        return {
+            "count": len(matches),
+            "first": min(days) if days else None,
+            "last": max(days) if days else None,
+            "played": sum(m["status"] == "FINISHED" for m in matches),
+        }
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "FakeServer"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        token = self.headers.get("X-Auth-Token") or self.client_address[0]
+        status, headers, body = self.server.api.handle(url.path, query, token)
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakeServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, api: FakeFootballData, host: str = "127.0.0.1", port: int = 0):
+        """
+        :param port: 0 picks a free port
+        """
+        super().__init__((host, port), _Handler)
+        self.api = api
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeServer":
+        """
+        Serve from a background thread, e.g. inside a test.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+@click.command()
+@click.option("--host", default="127.0.0.1", help="Interface to bind")
+@click.option("--port", type=int, default=8080, help="Port to listen on")
+@click.option(
+    "--league", "-l", "leagues", multiple=True, help="League code, can be repeated"
+)
+@click.option("--teams", type=int, default=20, help="Teams per league")
+@click.option("--seed", type=int, default=0, help="Seed for seasons and faults")
+@click.option("--speed", type=float, default=1.0, help="Virtual time speed-up")
+@click.option("--matchday", type=int, help="Matchday under way at startup")
+@click.option(
+    "--rate-limit", type=int, default=10, help="Requests per minute, 0 for none"
+)
+@click.option("--latency", type=float, default=0.0, help="Seconds per response")
+@click.option("--jitter", type=float, default=0.0, help="Extra random seconds")
+@click.option(
+    "--error-rate", type=float, default=0.0, help="Share of 5xx responses, 0 to 1"
+)
+def main(
+    host,
+    port,
+    leagues,
+    teams,
+    seed,
+    speed,
+    matchday,
+    rate_limit,
+    latency,
+    jitter,
+    error_rate,
+):
+    """
+    Serve synthetic football-data.org responses.
+    """
+    unsupported = [code for code in leagues if code not in SUPPORTED_LEAGUES]
+    if unsupported:
+        raise click.BadParameter(f"League code {unsupported[0]} is not supported.")
+    api = FakeFootballData(
+        leagues=list(leagues) or None,
+        teams=teams,
+        seed=seed,
+        speed=speed,
+        current_matchday=matchday,
+        rate_limit=rate_limit,
+        latency=latency,
+        jitter=jitter,
+        error_rate=error_rate,
+    )
+    server = FakeServer(api, host, port)
+    click.echo(f"Serving fake football-data.org API on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
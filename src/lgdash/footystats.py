@@ -0,0 +1,268 @@
+import requests
+import logging
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+
+from .cache import FileCache
+from .client import build_scorers_df, build_standings_df
+from .config import FOOTYSTATS_SEASONS_TTL, FS_BASE_URL, REQUEST_TIMEOUT
+from .metrics import REGISTRY, MetricsRegistry
+from .providers import DataProvider, ProviderError
+
+logger = logging.getLogger(__name__)
+
+# league code -> (country, name) as listed by FootyStats
+FOOTYSTATS_LEAGUES: Dict[str, Tuple[str, str]] = {
+    "PL": ("England", "Premier League"),
+    "CL": ("Europe", "UEFA Champions League"),
+    "PD": ("Spain", "La Liga"),
+    "SA": ("Italy", "Serie A"),
+    "BL1": ("Germany", "Bundesliga"),
+    "FL1": ("France", "Ligue 1"),
+}
+
+
+class FootyStatsClientError(ProviderError):
+    """Custom exception for FootyStats API errors."""
+
+    pass
+
+
+@contextmanager
+def _schema_errors(what: str) -> Iterator[None]:
+    """
+    A response that doesn't match the expected schema, as a provider
+    error, so a router fails over instead of crashing.
+    """
+    try:
+        yield
+    except (KeyError, TypeError, AttributeError, IndexError) as e:
+        raise FootyStatsClientError(
+            f"Unexpected {what} response from FootyStats API: {e!r}"
+        ) from e
+
+
+def _season_dates(year: str) -> Dict:
+    # "20242025" for split seasons, "2024" otherwise
+    year = str(year)
+    start, end = (year[:4], year[4:]) if len(year) == 8 else (year, year)
+    return {"startDate": f"{start}-01-01", "endDate": f"{end}-12-31"}
+
+
+class FootyStatsClient(DataProvider):
+    """
+    FootyStats league tables and players, in the same frames as
+    `FootballDataClient`. Only leagues chosen in the FootyStats account
+    are available.
+    """
+
+    name = "footystats"
+    leagues = FOOTYSTATS_LEAGUES
+
+    def __init__(
+        self,
+        api_key: str,
+        cache: Optional[FileCache] = None,
+        metrics: Optional[MetricsRegistry] = None,
+    ):
+        """
+        Initialize the FootyStats API client.
+
+        :param api_key: Your API key for FootyStats
+        :param cache: Optional cache for responses requested with a ttl
+        :param metrics: Registry to record into, defaults to the global one
+        """
+        self.base_url = FS_BASE_URL
+        self.api_key = api_key
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else REGISTRY
+
+    def make_request(
+        self, endpoint: str, params: Optional[Dict] = None, ttl: Optional[int] = None
+    ) -> Dict:
+        """
+        Make a request to the FootyStats API.
+
+        :param endpoint: The API endpoint
+        :param params: Additional parameters for the request
+        :param ttl: Seconds a response may be served from the cache, if any
+        :return: Parsed JSON response as a dictionary
+        """
+        params = dict(params or {})
+        query = "&".join(f"{k}={params[k]}" for k in sorted(params))
+        cache_key = f"footystats/{endpoint}?{query}"
+        if self.cache is not None and ttl:
+            data = self.cache.get(cache_key)
+            self.metrics.inc(
+                "lgdash_cache_requests_total",
+                result="miss" if data is None else "hit",
+            )
+            if data is not None:
+                return data
+
+        params["key"] = self.api_key
+        url = f"{self.base_url}/{endpoint}"
+        metric_endpoint = f"footystats/{endpoint}"
+        try:
+            started = time.perf_counter()
+            response = requests.get(url, params=params, timeout=REQUEST_TIMEOUT)
+            self.metrics.observe(
+                "lgdash_request_seconds",
+                time.perf_counter() - started,
+                endpoint=metric_endpoint,
+            )
+            self.metrics.inc(
+                "lgdash_requests_total",
+                endpoint=metric_endpoint,
+                status=response.status_code,
+            )
+            response.raise_for_status()
+            data = response.json()
+            if "error" in data:
+                raise FootyStatsClientError(data["error"])
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Request failed: {e}")
+            raise FootyStatsClientError(
+                "Failed to communicate with FootyStats API."
+            ) from e
+        except ValueError as e:
+            raise FootyStatsClientError("Invalid response from FootyStats API.") from e
+
+        if self.cache is not None and ttl:
+            self.cache.set(cache_key, data, ttl)
+        return data
+
+    def _current_season(self, league: str) -> Dict:
+        """
+        :return: The latest FootyStats season for a league, with `id`
+            and `year`
+        """
+        if league not in FOOTYSTATS_LEAGUES:
+            raise ValueError(f"League {league} not supported")
+        country, name = FOOTYSTATS_LEAGUES[league]
+        data = self.make_request(
+            "league-list",
+            {"chosen_leagues_only": "true"},
+            ttl=FOOTYSTATS_SEASONS_TTL,
+        )
+        with _schema_errors("league list"):
+            for entry in data.get("data", []):
+                if entry.get("country") == country and entry.get("name") == name:
+                    seasons = entry.get("season") or []
+                    if seasons:
+                        return max(seasons, key=lambda season: str(season["year"]))
+        raise FootyStatsClientError(
+            f"No FootyStats season for {league}, is it a chosen league?"
+        )
+
+    def _metadata(self, league: str, season: Dict) -> Dict:
+        return {
+            "season": _season_dates(season["year"]),
+            "competition": {"code": league, "name": FOOTYSTATS_LEAGUES[league][1]},
+        }
+
+    def _table(self, season_id: int, ttl: Optional[int]) -> List[Dict]:
+        data = self.make_request("league-tables", {"season_id": season_id}, ttl=ttl)
+        with _schema_errors("league table"):
+            tables = data.get("data") or {}
+            # cups only have the all-matches table
+            return (
+                tables.get("league_table")
+                or tables.get("all_matches_table_overall")
+                or []
+            )
+
+    def get_standings(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Fetch and process the most current league standings.
+
+        :param ttl: Seconds the response may be served from the cache
+        :return: DataFrame containing standings
+        """
+        season = self._current_season(league)
+        table = self._table(season["id"], ttl)
+        logger.debug(f"Retrieved standings with {len(table)} teams")
+        with _schema_errors("league table"):
+            table = sorted(table, key=lambda t: t["position"])
+            df = build_standings_df(
+                {
+                    "position": team["position"],
+                    "team": team.get("cleanName") or team.get("name"),
+                    "tla": team.get("shortHand"),
+                    "crest": team.get("image"),
+                    "points": team["points"],
+                    "played": team["matchesPlayed"],
+                    "won": team["seasonWins_overall"],
+                    "draw": team["seasonDraws_overall"],
+                    "lost": team["seasonLosses_overall"],
+                    "goals_for": team["seasonGoals"],
+                    "goals_against": team["seasonConceded"],
+                    "goal_difference": team["seasonGoalDifference"],
+                }
+                for team in table
+            )
+        return df, self._metadata(league, season)
+
+    def get_scorers(
+        self, league: str = "PL", limit: int = 10, ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Fetch and process the most current top scorers. Players come in
+        pages with club ids only, team names come from the league table.
+
+        :param league: League code
+        :param limit: Number of players
+        :param ttl: Seconds the response may be served from the cache
+        :return: DataFrame containing top scorers
+        """
+        season = self._current_season(league)
+        table = self._table(season["id"], ttl)
+        with _schema_errors("league table"):
+            teams = {
+                team["id"]: (
+                    team.get("cleanName") or team.get("name"),
+                    team.get("shortHand"),
+                )
+                for team in table
+            }
+
+        players = []
+        page = 1
+        while True:
+            data = self.make_request(
+                "league-players", {"season_id": season["id"], "page": page}, ttl=ttl
+            )
+            with _schema_errors("players"):
+                players.extend(data.get("data") or [])
+                last_page = data.get("pager", {}).get("max_page", page)
+            if page >= last_page:
+                break
+            page += 1
+        logger.debug(f"Retrieved {len(players)} players")
+
+        with _schema_errors("players"):
+            players.sort(
+                key=lambda p: (
+                    p.get("goals_overall") or 0,
+                    p.get("assists_overall") or 0,
+                ),
+                reverse=True,
+            )
+            df = build_scorers_df(
+                {
+                    "name": player.get("known_as") or player.get("full_name"),
+                    "team": teams.get(player.get("club_team_id"), (None, None))[0],
+                    "tla": teams.get(player.get("club_team_id"), (None, None))[1],
+                    "played": player.get("appearances_overall"),
+                    "goals": player.get("goals_overall"),
+                    "assists": player.get("assists_overall"),
+                    "penalties": player.get("penalty_goals"),
+                }
+                for player in players[:limit]
+            )
+        return df, self._metadata(league, season)
@@ -1,3 +1,8 @@
+from collections.abc import Mapping
+from typing import Callable, Dict, List, Optional
+
+from .cache import default_cache
+
 SUPPORTED_LEAGUES = {
     "PL": {
         "icon": "🏴󠁧󠁢󠁥󠁮󠁧󠁿",
@@ -7,10 +12,6 @@ SUPPORTED_LEAGUES = {
         "icon": "🏆",
         "name": "Champions League",
     },
-    # "WC": {
-    #     "icon": "🌍",
-    #     "name": "World Cup",
-    # },
     "PD": {
         "icon": "🇪🇸 ",
         "name": "La Liga",
@@ -29,4 +30,110 @@ SUPPORTED_LEAGUES = {
     },
 }
 
+# icons and names for competitions outside the default leagues, shown
+# once the API's competition list includes them
+OTHER_COMPETITIONS = {
+    "WC": {
+        "icon": "🌍",
+        "name": "World Cup",
+    },
+    "EC": {
+        "icon": "🇪🇺",
+        "name": "European Championship",
+    },
+    "ELC": {
+        "icon": "🏴󠁧󠁢󠁥󠁮󠁧󠁿",
+        "name": "Championship",
+    },
+    "DED": {
+        "icon": "🇳🇱 ",
+        "name": "Eredivisie",
+    },
+    "PPL": {
+        "icon": "🇵🇹 ",
+        "name": "Primeira Liga",
+    },
+    "BSA": {
+        "icon": "🇧🇷 ",
+        "name": "Brasileirão",
+    },
+}
+DEFAULT_ICON = "⚽"
+
 DEFAULT_LEAGUE = "PL"
+
+# where the client keeps the API's competition list
+COMPETITIONS_CACHE_KEY = "competitions"
+
+
+def competition_entry(competition: Dict) -> Dict:
+    """
+    Display metadata for a competition from the API, the static tables'
+    icon and name taking precedence.
+    """
+    static = OTHER_COMPETITIONS.get(competition["code"], {})
+    return {
+        "icon": static.get("icon", DEFAULT_ICON),
+        "name": static.get("name", competition["name"]),
+        "area": (competition.get("area") or {}).get("name"),
+        "type": competition.get("type"),
+    }
+
+
+class CompetitionRegistry(Mapping):
+    """
+    Competition codes to display metadata: the default leagues, plus any
+    competition in the API's list.
+
+    The list is loaded on the first code that isn't a default league, or
+    when every code is asked for. Checking a default league is a dict
+    lookup and never touches the disk or the network.
+    """
+
+    def __init__(self, load: Callable[[], Optional[List[Dict]]]):
+        """
+        :param load: Returns the API's competitions, None if not known
+        """
+        self._load = load
+        self._catalog: Optional[Dict[str, Dict]] = None
+
+    @property
+    def catalog(self) -> Dict[str, Dict]:
+        if self._catalog is None:
+            catalog = dict(SUPPORTED_LEAGUES)
+            for competition in self._load() or []:
+                if competition["code"] not in catalog:
+                    catalog[competition["code"]] = competition_entry(competition)
+            self._catalog = catalog
+        return self._catalog
+
+    def reload(self) -> None:
+        """
+        Load the list again on next use.
+        """
+        self._catalog = None
+
+    def __contains__(self, code) -> bool:
+        return code in SUPPORTED_LEAGUES or code in self.catalog
+
+    def __getitem__(self, code: str) -> Dict:
+        if code in SUPPORTED_LEAGUES:
+            return SUPPORTED_LEAGUES[code]
+        return self.catalog[code]
+
+    def __iter__(self):
+        return iter(self.catalog)
+
+    def __len__(self) -> int:
+        return len(self.catalog)
+
+
+def cached_competitions() -> Optional[List[Dict]]:
+    """
+    The competition list the client last stored, however old. Never
+    fetches, so it is safe for display and shell completion.
+    """
+    return default_cache().get(COMPETITIONS_CACHE_KEY, allow_expired=True)
+
+
+COMPETITIONS = CompetitionRegistry(cached_competitions)
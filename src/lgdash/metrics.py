@@ -0,0 +1,366 @@
+"""
+In-process counters, gauges and histograms for the API client.
+
+Recording is a dict update under a lock, cheap enough for `watch` mode.
+Each CLI run appends its snapshot as one JSON line to a metrics log in
+the cache directory, and `lgdash stats` merges the lines. Appends of a
+single short line are atomic, so concurrent runs don't clobber each
+other. Once the log passes METRICS_MAX_BYTES it is folded into a single
+snapshot of running totals, under a lock that holds off appends.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows, compaction may drop a concurrent run's line
+    fcntl = None
+
+from .cache import default_cache_dir
+
+logger = logging.getLogger(__name__)
+
+METRICS_FILE = "metrics.jsonl"
+# fold the log into one line past this size, so it stays small on a
+# host that runs lgdash every few seconds
+METRICS_MAX_BYTES = 256 * 1024
+
+LATENCY_BUCKETS = [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0]
+PARSE_BUCKETS = [0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5]
+
+# name -> (type, help, buckets)
+METRICS: Dict[str, Tuple[str, str, Optional[List[float]]]] = {
+    "lgdash_requests_total": (
+        "counter",
+        "Upstream API requests by endpoint and HTTP status.",
+        None,
+    ),
+    "lgdash_response_bytes_total": (
+        "counter",
+        "Bytes received from the upstream API.",
+        None,
+    ),
+    "lgdash_cache_requests_total": (
+        "counter",
+        "Cacheable requests by result, hit or miss.",
+        None,
+    ),
+    "lgdash_provider_requests_total": (
+        "counter",
+        "Calls routed to each data provider by result, ok or error.",
+        None,
+    ),
+    "lgdash_request_seconds": (
+        "histogram",
+        "Upstream API request latency in seconds.",
+        LATENCY_BUCKETS,
+    ),
+    "lgdash_parse_seconds": (
+        "histogram",
+        "JSON decode time in seconds.",
+        PARSE_BUCKETS,
+    ),
+    "lgdash_quota_remaining": (
+        "gauge",
+        "Requests left in the current rate limit window, as last reported.",
+        None,
+    ),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, str]) -> Labels:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def default_metrics_path() -> str:
+    return os.path.join(default_cache_dir(), METRICS_FILE)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._gauges: Dict[Tuple[str, Labels], float] = {}
+        # [per-bucket counts..., +Inf count], sum
+        self._histograms: Dict[Tuple[str, Labels], list] = {}
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        with self._lock:
+            self._gauges[(name, _labels(labels))] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        buckets = METRICS[name][2]
+        key = (name, _labels(labels))
+        with self._lock:
+            entry = self._histograms.get(key)
+            if entry is None:
+                entry = self._histograms[key] = [[0] * (len(buckets) + 1), 0.0]
+            entry[0][bisect_left(buckets, value)] += 1
+            entry[1] += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+    @property
+    def empty(self) -> bool:
+        return not (self._counters or self._gauges or self._histograms)
+
+    def snapshot(self) -> Dict:
+        """
+        :return: JSON-serializable copy of every series
+        """
+        with self._lock:
+            return {
+                "counters": [
+                    {"name": n, "labels": dict(l), "value": v}
+                    for (n, l), v in self._counters.items()
+                ],
+                "gauges": [
+                    {"name": n, "labels": dict(l), "value": v}
+                    for (n, l), v in self._gauges.items()
+                ],
+                "histograms": [
+                    {"name": n, "labels": dict(l), "counts": list(c), "sum": s}
+                    for (n, l), (c, s) in self._histograms.items()
+                ],
+            }
+
+    def merge(self, snapshot: Dict) -> None:
+        """
+        Add a snapshot into this registry. Counters and histograms add up,
+        gauges take the newer value.
+        """
+        with self._lock:
+            for series in snapshot.get("counters", []):
+                key = (series["name"], _labels(series["labels"]))
+                self._counters[key] = self._counters.get(key, 0) + series["value"]
+            for series in snapshot.get("gauges", []):
+                self._gauges[(series["name"], _labels(series["labels"]))] = series[
+                    "value"
+                ]
+            for series in snapshot.get("histograms", []):
+                key = (series["name"], _labels(series["labels"]))
+                entry = self._histograms.get(key)
+                if entry is None:
+                    self._histograms[key] = [list(series["counts"]), series["sum"]]
+                else:
+                    entry[0] = [a + b for a, b in zip(entry[0], series["counts"])]
+                    entry[1] += series["sum"]
+
+    def to_prometheus(self) -> str:
+        """
+        Render every series in the Prometheus text exposition format.
+        """
+
+        def fmt(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+            pairs = list(labels) + ([extra] if extra else [])
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+        snapshot = {
+            "counter": self._counters,
+            "gauge": self._gauges,
+            "histogram": self._histograms,
+        }
+        lines = []
+        with self._lock:
+            for name, (kind, help_text, buckets) in METRICS.items():
+                series = [(l, v) for (n, l), v in snapshot[kind].items() if n == name]
+                if not series:
+                    continue
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(series):
+                    if kind != "histogram":
+                        lines.append(f"{name}{fmt(labels)} {value}")
+                        continue
+                    counts, total = value
+                    cumulative = 0
+                    for bound, count in zip(buckets + ["+Inf"], counts):
+                        cumulative += count
+                        lines.append(
+                            f"{name}_bucket{fmt(labels, ('le', str(bound)))} "
+                            f"{cumulative}"
+                        )
+                    lines.append(f"{name}_sum{fmt(labels)} {total}")
+                    lines.append(f"{name}_count{fmt(labels)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def summary(self) -> List[Dict]:
+        """
+        Per-endpoint request counts, error and 429 counts, average and
+        approximate 95th percentile latency, bytes and parse time.
+        """
+        endpoints: Dict[str, Dict] = {}
+
+        def row(endpoint: str) -> Dict:
+            return endpoints.setdefault(
+                endpoint,
+                {
+                    "endpoint": endpoint,
+                    "requests": 0,
+                    "errors": 0,
+                    "rate_limited": 0,
+                    "bytes": 0,
+                    "avg_seconds": None,
+                    "p95_seconds": None,
+                    "avg_parse_seconds": None,
+                },
+            )
+
+        with self._lock:
+            for (name, labels), value in self._counters.items():
+                labels = dict(labels)
+                if name == "lgdash_requests_total":
+                    r = row(labels["endpoint"])
+                    r["requests"] += value
+                    status = labels["status"]
+                    if status == "429":
+                        r["rate_limited"] += value
+                    elif not status.startswith("2"):
+                        r["errors"] += value
+                elif name == "lgdash_response_bytes_total":
+                    row(labels["endpoint"])["bytes"] += value
+            for (name, labels), (counts, total) in self._histograms.items():
+                n = sum(counts)
+                if not n:
+                    continue
+                r = row(dict(labels)["endpoint"])
+                if name == "lgdash_request_seconds":
+                    r["avg_seconds"] = total / n
+                    r["p95_seconds"] = _quantile(LATENCY_BUCKETS, counts, 0.95)
+                elif name == "lgdash_parse_seconds":
+                    r["avg_parse_seconds"] = total / n
+        return sorted(endpoints.values(), key=lambda r: -r["requests"])
+
+    def cache_hit_rate(self) -> Optional[float]:
+        with self._lock:
+            hits = self._counters.get(
+                ("lgdash_cache_requests_total", (("result", "hit"),)), 0
+            )
+            misses = self._counters.get(
+                ("lgdash_cache_requests_total", (("result", "miss"),)), 0
+            )
+        return hits / (hits + misses) if hits + misses else None
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """
+        Append this process's snapshot to the metrics log and reset.
+        """
+        if self.empty:
+            return
+        path = path or default_metrics_path()
+        line = json.dumps(self.snapshot(), separators=(",", ":")) + "\n"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with _log_lock(path, exclusive=False):
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write(line)
+                    size = f.tell()
+            if size > METRICS_MAX_BYTES:
+                compact(path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {path}: {e}")
+            return
+        self.reset()
+
+
+def _quantile(buckets: List[float], counts: List[int], q: float) -> float:
+    """
+    Upper bound of the bucket holding the q-th quantile.
+    """
+    target = q * sum(counts)
+    running = 0
+    for bound, count in zip(buckets + [float("inf")], counts):
+        running += count
+        if running >= target:
+            return bound
+    return float("inf")
+
+
+def load(path: Optional[str] = None) -> MetricsRegistry:
+    """
+    Merge every snapshot in the metrics log into a new registry.
+    """
+    registry = MetricsRegistry()
+    path = path or default_metrics_path()
+    if not os.path.exists(path):
+        return registry
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                registry.merge(json.loads(line))
+            except ValueError:
+                # a run killed mid-write leaves a partial last line
+                continue
+    return registry
+
+
+@contextmanager
+def _log_lock(path: str, exclusive: bool) -> Iterator[None]:
+    """
+    Shared for appending to the log, exclusive for replacing it.
+    """
+    if fcntl is None:
+        yield
+        return
+    try:
+        fd = os.open(path + ".lock", os.O_RDONLY | os.O_CREAT, 0o644)
+    except OSError:
+        yield
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+    finally:
+        # closing releases the lock
+        os.close(fd)
+
+
+def compact(path: Optional[str] = None) -> None:
+    """
+    Replace the metrics log with one snapshot of its totals.
+    """
+    path = path or default_metrics_path()
+    with _log_lock(path, exclusive=True):
+        registry = load(path)
+        if registry.empty:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(json.dumps(registry.snapshot(), separators=(",", ":")) + "\n")
+        os.replace(tmp_path, path)
+    logger.debug(f"Compacted {path}")
+
+
+def write_textfile(registry: MetricsRegistry, path: str) -> None:
+    """
+    Write a Prometheus textfile atomically, for node_exporter's
+    textfile collector.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(registry.to_prometheus())
+    os.replace(tmp_path, path)
+
+
+REGISTRY = MetricsRegistry()
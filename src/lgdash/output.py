@@ -0,0 +1,129 @@
+"""
+Machine-readable output written row by row, straight from the client's
+flat records, without pandas frames or rich renderables.
+"""
+
+import csv
+import json
+import sys
+from typing import Dict, Iterable, List, Optional, TextIO
+
+FORMATS = ["json", "ndjson", "csv", "tsv"]
+
+MATCH_COLUMNS = [
+    "id",
+    "matchday",
+    "stage",
+    "status",
+    "clean_status",
+    "home_team",
+    "home_team_code",
+    "home_score",
+    "away_score",
+    "away_team",
+    "away_team_code",
+    "minute",
+    "injury_time",
+    "display_minutes",
+    "utc_datetime",
+    "local_datetime",
+    "local_date",
+    "local_time",
+    "local_tz",
+    "home_team_id",
+    "away_team_id",
+]
+STANDINGS_COLUMNS = [
+    "position",
+    "team",
+    "tla",
+    "points",
+    "played",
+    "won",
+    "draw",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "crest",
+]
+TEAMS_COLUMNS = ["id", "team", "team_long", "tla", "area"]
+TIMELINE_COLUMNS = ["matchday", "team", "tla", "position", "points"]
+PROJECTIONS_COLUMNS = [
+    "league",
+    "team",
+    "tla",
+    "points",
+    "projected_points",
+    "title",
+    "top",
+    "relegated",
+]
+
+
+def _json_default(value):
+    # NumPy scalars and pandas' NA, without importing either
+    if type(value).__name__ == "NAType":
+        return None
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def write_rows(
+    rows: Iterable[Dict],
+    fmt: str,
+    columns: Optional[List[str]] = None,
+    stream: Optional[TextIO] = None,
+) -> int:
+    """
+    Write rows as they arrive, flushing after each one so a consumer on
+    the other end of a pipe sees them immediately.
+
+    :param rows: Flat dicts, e.g. from `FootballDataClient.iter_matches`
+    :param fmt: One of FORMATS
+    :param columns: Field order, defaults to the keys of the first row
+    :param stream: Defaults to stdout
+    :return: Number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format {fmt}")
+    stream = stream or sys.stdout
+    count = 0
+
+    if fmt in ("csv", "tsv"):
+        writer = None
+        for row in rows:
+            if writer is None:
+                writer = csv.DictWriter(
+                    stream,
+                    fieldnames=columns or list(row),
+                    delimiter="\t" if fmt == "tsv" else ",",
+                    extrasaction="ignore",
+                    lineterminator="\n",
+                )
+                writer.writeheader()
+            writer.writerow(row)
+            stream.flush()
+            count += 1
+        if writer is None and columns:
+            # header only, so empty results still parse
+            stream.write(("\t" if fmt == "tsv" else ",").join(columns) + "\n")
+        return count
+
+    if fmt == "json":
+        stream.write("[")
+    for row in rows:
+        if columns:
+            row = {key: row.get(key) for key in columns}
+        if fmt == "json":
+            stream.write(",\n" if count else "\n")
+            stream.write(json.dumps(row, default=_json_default))
+        else:
+            stream.write(json.dumps(row, default=_json_default) + "\n")
+        stream.flush()
+        count += 1
+    if fmt == "json":
+        stream.write("\n]\n" if count else "]\n")
+    stream.flush()
+    return count
@@ -0,0 +1,166 @@
+"""
+Lightweight stage timers and whole-run profilers.
+
+Stages are named wall-clock timers that add up across calls, e.g.
+"http", "json" or "render". They are always on and cost two
+`perf_counter` calls each, so the library can be timed without setup:
+
+    from lgdash import profiling
+
+    with profiling.stage("my_step"):
+        ...
+    profiling.timings()  # {"my_step": (seconds, calls), ...}
+"""
+
+import cProfile
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+
+_totals: "OrderedDict[str, float]" = OrderedDict()
+_counts: Counter = Counter()
+_lock = threading.Lock()
+_active = threading.local()
+
+
+def record(name: str, seconds: float) -> None:
+    """
+    Add time to a stage measured some other way.
+    """
+    with _lock:
+        _totals[name] = _totals.get(name, 0.0) + seconds
+        _counts[name] += 1
+
+
+def _active_stages() -> Set[str]:
+    if not hasattr(_active, "stages"):
+        _active.stages = set()
+    return _active.stages
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time the enclosed block under `name`. A stage nested inside itself,
+    e.g. one render method calling another, is only counted once.
+    """
+    active = _active_stages()
+    if name in active:
+        yield
+        return
+    active.add(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start)
+        active.discard(name)
+
+
+def timed(name: str) -> Callable:
+    """
+    Decorator form of `stage`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timings() -> Dict[str, Tuple[float, int]]:
+    """
+    :return: Total seconds and number of calls per stage, in first-seen order
+    """
+    with _lock:
+        return {name: (_totals[name], _counts[name]) for name in _totals}
+
+
+def reset() -> None:
+    with _lock:
+        _totals.clear()
+        _counts.clear()
+
+
+class StackSampler:
+    """
+    Samples the main thread's stack on an interval and writes the counts
+    in folded format, one `frame;frame;frame count` line per stack, which
+    flamegraph tools read directly.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        """
+        :param interval: Seconds between samples
+        """
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._target = threading.main_thread().ident
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def dump(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+class RunProfiler:
+    """
+    Profiles everything between `start` and `stop` with either cProfile
+    (`.prof` output for pstats/snakeviz) or the stack sampler.
+    """
+
+    def __init__(self, path: str, mode: str = "cprofile"):
+        """
+        :param path: Output file
+        :param mode: "cprofile" or "sample"
+        """
+        if mode not in ("cprofile", "sample"):
+            raise ValueError(f"Unknown profile mode {mode}")
+        self.path = path
+        self.mode = mode
+        self._profiler = cProfile.Profile() if mode == "cprofile" else StackSampler()
+
+    def start(self):
+        if self.mode == "cprofile":
+            self._profiler.enable()
+        else:
+            self._profiler.start()
+
+    def stop(self):
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            self._profiler.dump_stats(self.path)
+        else:
+            self._profiler.stop()
+            self._profiler.dump(self.path)
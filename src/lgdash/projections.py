@@ -0,0 +1,337 @@
+"""
+End-of-season odds by Monte Carlo simulation.
+
+Each team gets attack and defence ratings from its goals for and against
+so far, shrunk towards the league average while few matches are played.
+Every remaining fixture's goals are drawn from Poisson distributions
+with those rates, many seasons at a time as one NumPy array, and each
+simulated season is added to the current table and ranked. Batches of
+simulations run in a process pool, each with its own child of one seed,
+so a run gives the same odds whatever the number of workers. Results are
+cached under a fingerprint of the inputs, so they are only simulated
+again once a result comes in.
+"""
+
+import hashlib
+import logging
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import FileCache
+from .config import (
+    PROJECTION_BATCH_SIZE,
+    PROJECTION_SIMULATIONS,
+    PROJECTIONS_TTL,
+)
+from .standings import FINISHED_STATUSES, TABLE_STAGES
+
+logger = logging.getLogger(__name__)
+
+# places that count as the top, e.g. Champions League spots, and places
+# relegated, per league
+ZONES: Dict[str, Tuple[int, int]] = {
+    "BL1": (4, 2),
+    "FL1": (4, 2),
+    "CL": (8, 0),
+}
+DEFAULT_ZONES = (4, 3)
+# matches of league-average scoring each team starts with, so early
+# season ratings aren't decided by a couple of results
+PRIOR_MATCHES = 5
+# rates when nothing has been played yet
+DEFAULT_HOME_GOALS = 1.5
+DEFAULT_AWAY_GOALS = 1.2
+# goals in a simulated match top out here, more is too rare to matter
+MAX_GOALS = 10
+_FACTORIALS = np.cumprod(np.concatenate([[1.0], np.arange(1.0, MAX_GOALS)]))
+
+PROJECTION_COLUMNS = [
+    "team",
+    "tla",
+    "points",
+    "projected_points",
+    "title",
+    "top",
+    "relegated",
+]
+
+
+class SeasonInputs(NamedTuple):
+    league: str
+    teams: List[str]
+    tla: List[str]
+    # points, goal difference and goals for so far, one row per team
+    base: np.ndarray
+    # remaining fixtures
+    home_idx: np.ndarray
+    away_idx: np.ndarray
+    home_rate: np.ndarray
+    away_rate: np.ndarray
+
+    def fingerprint(self, simulations: int, seed: int) -> str:
+        """
+        Changes whenever a result, a fixture or a setting does.
+        """
+        digest = hashlib.sha1(f"{self.league}:{simulations}:{seed}".encode())
+        digest.update("\n".join(self.teams).encode("utf-8"))
+        for array in (self.base, self.home_idx, self.away_idx):
+            digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+        return digest.hexdigest()
+
+
+def season_inputs(matches: pd.DataFrame, league: str) -> SeasonInputs:
+    """
+    Current table, team ratings and remaining fixtures of a season.
+
+    :param matches: Season matches from `get_matches`
+    """
+    if "stage" in matches and matches["stage"].isin(TABLE_STAGES).any():
+        matches = matches[matches["stage"].isin(TABLE_STAGES)]
+
+    home = matches[["home_team_id", "home_team", "home_team_code"]]
+    away = matches[["away_team_id", "away_team", "away_team_code"]]
+    teams = (
+        pd.concat(
+            [
+                home.set_axis(["id", "team", "tla"], axis=1),
+                away.set_axis(["id", "team", "tla"], axis=1),
+            ]
+        )
+        .drop_duplicates("id")
+        .reset_index(drop=True)
+    )
+    team_index = {team_id: i for i, team_id in enumerate(teams["id"])}
+    home_idx = matches["home_team_id"].map(team_index).to_numpy(dtype=np.int64)
+    away_idx = matches["away_team_id"].map(team_index).to_numpy(dtype=np.int64)
+    n = len(teams)
+
+    played = matches["status"].isin(FINISHED_STATUSES).to_numpy()
+    home_goals = matches["home_score"].to_numpy(dtype=float, na_value=0)[played]
+    away_goals = matches["away_score"].to_numpy(dtype=float, na_value=0)[played]
+    home_goals, away_goals = home_goals.astype(np.int64), away_goals.astype(np.int64)
+    h, a = home_idx[played], away_idx[played]
+
+    home_points = np.select([home_goals > away_goals, home_goals == away_goals], [3, 1])
+    away_points = np.select([away_goals > home_goals, home_goals == away_goals], [3, 1])
+    base = np.zeros((n, 3), dtype=np.int64)
+    np.add.at(base[:, 0], h, home_points)
+    np.add.at(base[:, 0], a, away_points)
+    np.add.at(base[:, 1], h, home_goals - away_goals)
+    np.add.at(base[:, 1], a, away_goals - home_goals)
+    np.add.at(base[:, 2], h, home_goals)
+    np.add.at(base[:, 2], a, away_goals)
+
+    # average goals per team per match, home and away
+    home_avg = home_goals.mean() if played.any() else DEFAULT_HOME_GOALS
+    away_avg = away_goals.mean() if played.any() else DEFAULT_AWAY_GOALS
+    average = (home_avg + away_avg) / 2
+    games = np.bincount(h, minlength=n) + np.bincount(a, minlength=n)
+    goals_for = base[:, 2]
+    goals_against = base[:, 2] - base[:, 1]
+    prior = PRIOR_MATCHES * average
+    attack = (goals_for + prior) / ((games + PRIOR_MATCHES) * average)
+    defence = (goals_against + prior) / ((games + PRIOR_MATCHES) * average)
+
+    remaining = ~played
+    rh, ra = home_idx[remaining], away_idx[remaining]
+    return SeasonInputs(
+        league=league,
+        teams=teams["team"].tolist(),
+        tla=teams["tla"].tolist(),
+        base=base,
+        home_idx=rh,
+        away_idx=ra,
+        home_rate=home_avg * attack[rh] * defence[ra],
+        away_rate=away_avg * attack[ra] * defence[rh],
+    )
+
+
+def _goal_cdf(rates: np.ndarray) -> np.ndarray:
+    """
+    Poisson CDF of each rate at 0 to MAX_GOALS - 1 goals.
+
+    :return: Shape (len(rates), MAX_GOALS)
+    """
+    k = np.arange(MAX_GOALS)
+    pmf = np.exp(-rates)[:, None] * rates[:, None] ** k / _FACTORIALS
+    return np.cumsum(pmf, axis=1).astype(np.float32)
+
+
+def simulate(
+    inputs: SeasonInputs, simulations: int, seed: np.random.SeedSequence
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One batch of simulated seasons, all at once.
+
+    :return: How often each team finished in each place, shape (teams,
+        places), and the sum of each team's final points
+    """
+    rng = np.random.default_rng(seed)
+    n = len(inputs.teams)
+    matches = len(inputs.home_idx)
+
+    # home sides' goals in the first half of the columns, away sides' in
+    # the second, drawn by inverse transform: a uniform draw scores one
+    # goal for every CDF step it is above. A few times faster than
+    # rng.poisson for rates this small.
+    cdf = _goal_cdf(np.concatenate([inputs.home_rate, inputs.away_rate]))
+    draws = rng.random((simulations, 2 * matches), dtype=np.float32)
+    goals = np.zeros_like(draws)
+    for step in cdf.T:
+        goals += draws > step
+    conceded = np.roll(goals, matches, axis=1)
+    points = 3 * (goals > conceded) + (goals == conceded).astype(np.float32)
+
+    # columns to teams, so a matrix product sums each team's matches
+    sides = np.zeros((2 * matches, n), dtype=np.float32)
+    sides[np.arange(matches), inputs.home_idx] = 1
+    sides[matches + np.arange(matches), inputs.away_idx] = 1
+    points = inputs.base[:, 0] + (points @ sides).astype(np.int64)
+    scored = (goals @ sides).astype(np.int64)
+    difference = inputs.base[:, 1] + scored - (conceded @ sides).astype(np.int64)
+    scored += inputs.base[:, 2]
+
+    # points, then goal difference, then goals, then a coin toss
+    score = (
+        points * 1e6
+        + (difference + 1000) * 1e2
+        + scored * 1e-1
+        + rng.random((simulations, n)) * 1e-2
+    )
+    order = np.argsort(-score, axis=1)
+    places = np.bincount((order * n + np.arange(n)).ravel(), minlength=n * n)
+    return places.reshape(n, n), points.sum(axis=0)
+
+
+def _batches(
+    league: str, simulations: int, seed: int
+) -> List[Tuple[int, np.random.SeedSequence]]:
+    """
+    Fixed batch sizes and seeds, so results don't depend on the workers.
+    """
+    count = max(1, -(-simulations // PROJECTION_BATCH_SIZE))
+    seeds = np.random.SeedSequence([seed, zlib.crc32(league.encode())]).spawn(count)
+    sizes = [PROJECTION_BATCH_SIZE] * (count - 1)
+    sizes.append(simulations - sum(sizes))
+    return list(zip(sizes, seeds))
+
+
+def odds_table(
+    inputs: SeasonInputs, places: np.ndarray, points: np.ndarray, simulations: int
+) -> pd.DataFrame:
+    """
+    :return: One row per team, by projected points, with the share of
+        simulations in which it won the title, finished in the top
+        places or was relegated
+    """
+    top, relegated = ZONES.get(inputs.league, DEFAULT_ZONES)
+    share = places / simulations
+    df = pd.DataFrame(
+        {
+            "team": inputs.teams,
+            "tla": inputs.tla,
+            "points": inputs.base[:, 0],
+            "projected_points": points / simulations,
+            "title": share[:, 0],
+            "top": share[:, :top].sum(axis=1),
+            "relegated": share[:, len(inputs.teams) - relegated :].sum(axis=1),
+        }
+    )
+    return df.sort_values(
+        ["projected_points", "title"], ascending=False, ignore_index=True
+    )
+
+
+class Projector:
+    """
+    Simulates the rest of several seasons at once, reusing cached odds
+    for seasons whose results haven't changed.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[FileCache] = None,
+        simulations: int = PROJECTION_SIMULATIONS,
+        seed: int = 0,
+        workers: Optional[int] = None,
+    ):
+        """
+        :param cache: Where odds are kept between runs
+        :param simulations: Seasons simulated per league
+        :param seed: Same seed and inputs, same odds
+        :param workers: Processes simulating, defaults to one per CPU
+        """
+        if simulations < 1:
+            raise ValueError("At least one simulation is needed")
+        if seed < 0:
+            raise ValueError("The seed can't be negative")
+        self.cache = cache
+        self.simulations = simulations
+        self.seed = seed
+        self.workers = workers or os.cpu_count() or 1
+
+    def _cache_key(self, inputs: SeasonInputs) -> str:
+        return f"projections/{inputs.fingerprint(self.simulations, self.seed)}"
+
+    def run(self, seasons: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """
+        :param seasons: Season matches from `get_matches`, by league
+        :return: Odds from `odds_table`, by league
+        """
+        results: Dict[str, pd.DataFrame] = {}
+        todo: Dict[str, SeasonInputs] = {}
+        for league, matches in seasons.items():
+            if matches.empty:
+                results[league] = pd.DataFrame(columns=PROJECTION_COLUMNS)
+                continue
+            inputs = season_inputs(matches, league)
+            cached = self.cache.get(self._cache_key(inputs)) if self.cache else None
+            if cached is not None:
+                logger.debug(f"Projections for {league} from the cache")
+                results[league] = pd.DataFrame(cached, columns=PROJECTION_COLUMNS)
+            else:
+                todo[league] = inputs
+
+        for league, (places, points) in self._simulate(todo).items():
+            inputs = todo[league]
+            df = odds_table(inputs, places, points, self.simulations)
+            results[league] = df
+            if self.cache is not None:
+                # a new result changes the key, so the entry can live long
+                self.cache.set(
+                    self._cache_key(inputs), df.to_dict("records"), PROJECTIONS_TTL
+                )
+        return {league: results[league] for league in seasons}
+
+    def _simulate(
+        self, todo: Dict[str, SeasonInputs]
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        jobs = [
+            (league, size, seed)
+            for league in todo
+            for size, seed in _batches(league, self.simulations, self.seed)
+        ]
+        if self.workers == 1 or len(jobs) < 2:
+            outcomes = [
+                simulate(todo[league], size, seed) for league, size, seed in jobs
+            ]
+        else:
+            # seasons are fetched by now, no threads are left to fork
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+                futures = [
+                    pool.submit(simulate, todo[league], size, seed)
+                    for league, size, seed in jobs
+                ]
+                outcomes = [future.result() for future in futures]
+
+        totals: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        for (league, _, _), (places, points) in zip(jobs, outcomes):
+            if league in totals:
+                places, points = places + totals[league][0], points + totals[league][1]
+            totals[league] = (places, points)
+        return totals
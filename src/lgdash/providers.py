@@ -0,0 +1,319 @@
+"""
+Data providers and health-aware routing between them.
+
+A provider returns frames in the normalized schema, the columns that
+`FootballDataClient` builds, plus a metadata dict. `ProviderRouter`
+is itself a provider: it sends each call to the first healthy provider
+that supports it, fails over to the next on an error, and can race all
+of them and take whichever answers first.
+"""
+
+import logging
+import queue
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .config import FAILOVER_COOLDOWN, FAILOVER_THRESHOLD, MAX_CONCURRENT_REQUESTS
+from .metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CACHE_KEY = "providers/health"
+# weight of the newest latency sample in the moving average
+LATENCY_SMOOTHING = 0.3
+
+
+class ProviderError(Exception):
+    """A provider could not answer, e.g. a network error or bad status."""
+
+    pass
+
+
+class DataProvider(ABC):
+    """
+    Interface shared by the API clients. Operations beyond standings
+    and scorers are optional: `get_matches`, `get_local_matches` and
+    `get_teams` take the arguments of `ProviderRouter`'s methods of the
+    same name, and `supports` says which ones a provider has.
+    """
+
+    name: str = ""
+    # league codes the provider can serve
+    leagues: Dict[str, Any] = {}
+
+    def supports(self, operation: str, league: Optional[str] = None) -> bool:
+        if not callable(getattr(type(self), operation, None)):
+            return False
+        return league is None or league in self.leagues
+
+    @abstractmethod
+    def get_standings(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        pass
+
+    @abstractmethod
+    def get_scorers(
+        self, league: str = "PL", limit: int = 10, ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        pass
+
+    def get_scorers_for_leagues(
+        self, leagues: List[str], limit: int = 10, ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        """
+        Fetch top scorers for several leagues concurrently and merge them
+        into one board.
+
+        :param leagues: League codes
+        :param limit: Number of players on the combined board
+        :param ttl: Seconds each response may be served from the cache
+        :return: DataFrame with a `league` column, and metadata per league
+        """
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENT_REQUESTS) as pool:
+            results = list(
+                pool.map(lambda code: self.get_scorers(code, limit, ttl), leagues)
+            )
+
+        frames = [df.assign(league=code) for code, (df, _) in zip(leagues, results)]
+        metadata = {code: meta for code, (_, meta) in zip(leagues, results)}
+        df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if not df.empty:
+            df = df.sort_values(
+                by=["goals", "assists"], ascending=False, kind="stable"
+            ).head(limit)
+        return df.reset_index(drop=True), metadata
+
+
+class ProviderHealth:
+    """
+    Consecutive failures and smoothed latency for one provider. After
+    `threshold` failures in a row the provider is skipped for `cooldown`
+    seconds, then gets one trial call.
+    """
+
+    def __init__(
+        self, threshold: int = FAILOVER_THRESHOLD, cooldown: float = FAILOVER_COOLDOWN
+    ):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.degraded_at: Optional[float] = None
+        self.latency: Optional[float] = None
+
+    @property
+    def degraded(self) -> bool:
+        if self.degraded_at is None:
+            return False
+        return time.time() - self.degraded_at < self.cooldown
+
+    def success(self, seconds: float) -> None:
+        self.failures = 0
+        self.degraded_at = None
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += LATENCY_SMOOTHING * (seconds - self.latency)
+
+    def failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.degraded_at = time.time()
+
+    def to_dict(self) -> Dict:
+        return {
+            "failures": self.failures,
+            "degraded_at": self.degraded_at,
+            "latency": self.latency,
+        }
+
+    def update(self, state: Dict) -> None:
+        self.failures = state["failures"]
+        self.degraded_at = state["degraded_at"]
+        self.latency = state["latency"]
+
+
+class ProviderRouter(DataProvider):
+    """
+    Routes each call to the providers that support it, in order of
+    preference, skipping degraded ones while others are available.
+
+    With a cache the health of each provider is shared across runs, so a
+    short-lived command doesn't spend its first request finding out the
+    primary is down.
+    """
+
+    name = "router"
+
+    def __init__(
+        self,
+        providers: List[DataProvider],
+        race: bool = False,
+        cache=None,
+        metrics=None,
+        threshold: int = FAILOVER_THRESHOLD,
+        cooldown: float = FAILOVER_COOLDOWN,
+    ):
+        """
+        :param providers: In order of preference
+        :param race: Call every candidate at once and use the first answer
+        :param cache: Optional `FileCache` to share provider health through
+        :param metrics: Registry to record into, defaults to the global one
+        :param threshold: Consecutive failures before a provider is skipped
+        :param cooldown: Seconds a degraded provider is skipped for
+        """
+        if not providers:
+            raise ValueError("At least one provider is required")
+        self.providers = providers
+        self.race = race
+        self.cache = cache
+        self.metrics = metrics if metrics is not None else REGISTRY
+        self.health = {p.name: ProviderHealth(threshold, cooldown) for p in providers}
+        # raced calls report back from several threads
+        self._lock = threading.Lock()
+        self._load_health()
+
+    def _load_health(self) -> None:
+        if self.cache is None:
+            return
+        for name, state in (self.cache.get(HEALTH_CACHE_KEY) or {}).items():
+            if name in self.health:
+                self.health[name].update(state)
+
+    def _save_health(self) -> None:
+        if self.cache is None:
+            return
+        cooldown = max(h.cooldown for h in self.health.values())
+        state = {name: h.to_dict() for name, h in self.health.items()}
+        self.cache.set(HEALTH_CACHE_KEY, state, cooldown)
+
+    @property
+    def leagues(self) -> Dict[str, Any]:
+        return {code: None for p in self.providers for code in p.leagues}
+
+    def supports(self, operation: str, league: Optional[str] = None) -> bool:
+        return any(p.supports(operation, league) for p in self.providers)
+
+    def candidates(self, operation: str, league: str) -> List[DataProvider]:
+        """
+        Providers able to serve the call, healthy ones first.
+        """
+        able = [p for p in self.providers if p.supports(operation, league)]
+        healthy = [p for p in able if not self.health[p.name].degraded]
+        return healthy + [p for p in able if p not in healthy]
+
+    def _call(self, provider: DataProvider, operation: str, args, kwargs):
+        health = self.health[provider.name]
+        started = time.perf_counter()
+        try:
+            result = getattr(provider, operation)(*args, **kwargs)
+        except ProviderError:
+            self.metrics.inc(
+                "lgdash_provider_requests_total",
+                provider=provider.name,
+                result="error",
+            )
+            with self._lock:
+                health.failure()
+                if health.degraded:
+                    logger.warning(f"Provider {provider.name} is degraded")
+                self._save_health()
+            raise
+        self.metrics.inc(
+            "lgdash_provider_requests_total", provider=provider.name, result="ok"
+        )
+        with self._lock:
+            was_failing = health.failures > 0
+            health.success(time.perf_counter() - started)
+            if was_failing:
+                logger.info(f"Provider {provider.name} recovered")
+                self._save_health()
+        return result
+
+    def _route(self, operation: str, league: str, *args, **kwargs):
+        candidates = self.candidates(operation, league)
+        if not candidates:
+            raise ValueError(f"No provider supports {operation} for {league}")
+        args = (league,) + args
+
+        if self.race and len(candidates) > 1:
+            answers: queue.Queue = queue.Queue()
+
+            def attempt(provider: DataProvider) -> None:
+                try:
+                    answers.put((True, self._call(provider, operation, args, kwargs)))
+                except Exception as e:
+                    answers.put((False, e))
+
+            # daemon threads, unlike an executor's, aren't joined at exit,
+            # so a one-shot command doesn't wait for the slower providers.
+            # In a long-lived view they finish and update health.
+            for provider in candidates:
+                threading.Thread(
+                    target=attempt,
+                    args=(provider,),
+                    name=f"race-{provider.name}",
+                    daemon=True,
+                ).start()
+            errors = []
+            for _ in candidates:
+                ok, value = answers.get()
+                if ok:
+                    return value
+                if not isinstance(value, ProviderError):
+                    raise value
+                errors.append(value)
+            raise ProviderError(f"All providers failed for {operation}") from errors[-1]
+
+        error: Optional[ProviderError] = None
+        for provider in candidates:
+            try:
+                return self._call(provider, operation, args, kwargs)
+            except ProviderError as e:
+                logger.warning(f"{provider.name} failed {operation}, failing over: {e}")
+                error = e
+        raise ProviderError(f"All providers failed for {operation}") from error
+
+    def get_standings(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        return self._route("get_standings", league, ttl=ttl)
+
+    def get_scorers(
+        self, league: str = "PL", limit: int = 10, ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        return self._route("get_scorers", league, limit=limit, ttl=ttl)
+
+    def get_matches(
+        self,
+        league: str = "PL",
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        matchday: Optional[int] = None,
+        ttl: Optional[int] = None,
+    ) -> Tuple[pd.DataFrame, Dict]:
+        return self._route(
+            "get_matches",
+            league,
+            start_date=start_date,
+            end_date=end_date,
+            matchday=matchday,
+            ttl=ttl,
+        )
+
+    def get_local_matches(
+        self, league: str = "PL", start_date: str = "", end_date: str = ""
+    ) -> Tuple[pd.DataFrame, Dict]:
+        return self._route(
+            "get_local_matches", league, start_date=start_date, end_date=end_date
+        )
+
+    def get_teams(
+        self, league: str = "PL", ttl: Optional[int] = None
+    ) -> Tuple[pd.DataFrame, Dict]:
+        return self._route("get_teams", league, ttl=ttl)
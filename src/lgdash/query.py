@@ -0,0 +1,151 @@
+"""
+Match filters, and where each one is evaluated.
+
+A `MatchQuery` is planned into a single API request plus whatever that
+request can't express. Status, matchday and the date range go into the
+query string. A team switches to the team's own matches endpoint, which
+also takes home or away. The filters left over run on the raw matches
+before a frame is built, so only matching rows are ever flattened.
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# --status values and the API statuses each one stands for
+STATUS_GROUPS = {
+    "live": ["IN_PLAY", "PAUSED"],
+    "upcoming": ["SCHEDULED", "TIMED"],
+    "finished": ["FINISHED", "AWARDED"],
+    "postponed": ["POSTPONED", "SUSPENDED", "CANCELLED"],
+}
+VENUES = ["home", "away"]
+
+Predicate = Callable[[Dict], bool]
+
+
+@dataclass
+class MatchQuery:
+    """
+    Matches in one league, narrowed by any of the filters.
+    """
+
+    league: str
+    # keys of STATUS_GROUPS
+    status: Optional[List[str]] = None
+    # name or three letter code, ignoring case
+    team: Optional[str] = None
+    matchday: Optional[int] = None
+    # local calendar days, YYYY-MM-DD, either one defaults to the other
+    date_from: Optional[str] = None
+    date_to: Optional[str] = None
+    # where `team` plays, "home" or "away"
+    venue: Optional[str] = None
+
+    def __post_init__(self):
+        unknown = [s for s in self.status or [] if s not in STATUS_GROUPS]
+        if unknown:
+            raise ValueError(f"Unknown status {unknown[0]}")
+        if self.venue is not None:
+            if self.venue not in VENUES:
+                raise ValueError(f"Unknown venue {self.venue}")
+            if not self.team:
+                raise ValueError("Home or away needs a team")
+        self.date_from = self.date_from or self.date_to
+        self.date_to = self.date_to or self.date_from
+        if self.date_from and self.date_from > self.date_to:
+            raise ValueError("The start date is after the end date")
+
+    @property
+    def api_statuses(self) -> Optional[List[str]]:
+        if not self.status:
+            return None
+        return [api for group in self.status for api in STATUS_GROUPS[group]]
+
+
+def _team_side(match: Dict, side: str, needle: str) -> bool:
+    team = match[side]
+    names = (team.get("shortName"), team.get("name"), team.get("tla"))
+    return needle in {name.lower() for name in names if name}
+
+
+def predicates(query: MatchQuery, timezone: tzinfo) -> Dict[str, Predicate]:
+    """
+    Every filter in the query as a test on one raw match, by name.
+    """
+    tests: Dict[str, Predicate] = {}
+    statuses = query.api_statuses
+    if statuses:
+        tests["status"] = lambda m: m["status"] in statuses
+    if query.matchday:
+        tests["matchday"] = lambda m: m["matchday"] == query.matchday
+    if query.team:
+        needle = query.team.lower()
+        sides = [f"{query.venue}Team"] if query.venue else ["homeTeam", "awayTeam"]
+        tests["team"] = lambda m: any(_team_side(m, side, needle) for side in sides)
+    if query.date_from:
+
+        def local_dates(match: Dict) -> bool:
+            kickoff = datetime.fromisoformat(match["utcDate"]).astimezone(timezone)
+            return query.date_from <= kickoff.date().isoformat() <= query.date_to
+
+        tests["dates"] = local_dates
+    return tests
+
+
+class QueryPlan(NamedTuple):
+    endpoint: str
+    params: Dict
+    # filters the request couldn't take, by name
+    residual: Dict[str, Predicate]
+
+    def accepts(self, match: Dict) -> bool:
+        return all(test(match) for test in self.residual.values())
+
+    def __str__(self) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted(self.params.items()))
+        local = ", ".join(self.residual) or "nothing"
+        return f"{self.endpoint}?{query}, locally {local}"
+
+
+def plan_query(
+    query: MatchQuery,
+    timezone: tzinfo,
+    utc_range: Optional[Tuple[date, date]] = None,
+    team_id: Optional[int] = None,
+) -> QueryPlan:
+    """
+    Push as many filters as the API takes into one request.
+
+    :param utc_range: UTC dates covering the query's local dates, which
+        are fetched and then trimmed to the local days
+    :param team_id: The team's id, if it was found, for its endpoint
+    """
+    residual = predicates(query, timezone)
+    params: Dict = {}
+    if team_id is not None:
+        endpoint = f"/v4/teams/{team_id}/matches"
+        params["competitions"] = query.league
+        residual.pop("team")
+        if query.venue:
+            params["venue"] = query.venue.upper()
+    else:
+        endpoint = f"/v4/competitions/{query.league}/matches"
+        if query.matchday:
+            params["matchday"] = query.matchday
+            residual.pop("matchday")
+
+    if query.api_statuses:
+        params["status"] = ",".join(query.api_statuses)
+        residual.pop("status")
+    # the competition endpoint takes a matchday or dates, not both
+    if utc_range and "matchday" not in params:
+        params["dateFrom"] = utc_range[0].isoformat()
+        params["dateTo"] = utc_range[1].isoformat()
+
+    plan = QueryPlan(endpoint, params, residual)
+    logger.debug(f"Query plan: {plan}")
+    return plan
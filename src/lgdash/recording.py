@@ -0,0 +1,258 @@
+"""
+Record polling sessions as one base snapshot plus per-poll deltas, and
+replay them back through the client without touching the network.
+
+A recording is a gzip-compressed stream of JSON lines. The first frame
+seen for an endpoint stores the full response under `base`, every later
+frame for that endpoint stores a `delta` against the previous response
+(or null when nothing changed). `t` is seconds since the session began.
+"""
+
+import gzip
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .client import FootballDataClient, FootballDataClientError
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# patch tags
+_REPLACE = "="
+_DICT = "{"
+_REMOVE = "-"
+_LIST = "["
+
+
+def _is_id_list(value: Any) -> bool:
+    return (
+        isinstance(value, list)
+        and len(value) > 0
+        and all(isinstance(item, dict) and "id" in item for item in value)
+    )
+
+
+def diff(old: Any, new: Any) -> Optional[Dict]:
+    """
+    Compute a patch that turns `old` into `new`.
+
+    Dicts are diffed key by key and lists of objects carrying an `id`
+    (matches, teams, ...) are diffed item by item, so a poll where one
+    score moved only stores that score. Anything else is replaced whole.
+
+    :return: The patch, or None if the values are equal
+    """
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changed = {}
+        for key, value in new.items():
+            if key not in old:
+                changed[key] = {_REPLACE: value}
+            else:
+                patch = diff(old[key], value)
+                if patch is not None:
+                    changed[key] = patch
+        removed = [key for key in old if key not in new]
+        patch = {_DICT: changed}
+        if removed:
+            patch[_REMOVE] = removed
+        return patch
+    if _is_id_list(old) and _is_id_list(new):
+        old_by_id = {item["id"]: item for item in old}
+        changed = {}
+        for item in new:
+            if item["id"] in old_by_id:
+                patch = diff(old_by_id[item["id"]], item)
+            else:
+                patch = {_REPLACE: item}
+            if patch is not None:
+                # JSON object keys are strings
+                changed[str(item["id"])] = patch
+        return {_LIST: {"ids": [item["id"] for item in new], "items": changed}}
+    return {_REPLACE: new}
+
+
+def apply(old: Any, patch: Optional[Dict]) -> Any:
+    """
+    Apply a patch produced by `diff`. The input is not modified.
+    """
+    if patch is None:
+        return old
+    if _REPLACE in patch:
+        return patch[_REPLACE]
+    if _DICT in patch:
+        removed = set(patch.get(_REMOVE, ()))
+        new = {key: value for key, value in old.items() if key not in removed}
+        for key, child in patch[_DICT].items():
+            new[key] = apply(old.get(key), child)
+        return new
+    if _LIST in patch:
+        old_by_id = {str(item["id"]): item for item in old}
+        items = patch[_LIST]["items"]
+        new = []
+        for item_id in patch[_LIST]["ids"]:
+            key = str(item_id)
+            new.append(apply(old_by_id.get(key), items.get(key)))
+        return new
+    raise ValueError(f"Unrecognized patch: {patch!r}")
+
+
+class SessionRecorder:
+    """
+    Writes responses seen by a client to a compressed delta recording.
+
+    Use `attach` to record everything a `FootballDataClient` fetches, or
+    call `record` directly.
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: Output file, conventionally ending in `.jsonl.gz`
+        """
+        self.path = path
+        self._file = gzip.open(path, "wt", encoding="utf-8")
+        self._started = time.monotonic()
+        self._last: Dict[str, Any] = {}
+        self._write({"version": FORMAT_VERSION, "recorded_at": time.time()})
+
+    def _write(self, frame: Dict):
+        self._file.write(json.dumps(frame, separators=(",", ":")) + "\n")
+        # sync flush keeps the file readable if the session is killed
+        self._file.flush()
+
+    def record(
+        self,
+        endpoint: str,
+        params: Optional[Dict],
+        data: Dict,
+        at: Optional[float] = None,
+    ):
+        """
+        Append one poll.
+
+        :param endpoint: API endpoint the data came from
+        :param params: Request parameters
+        :param data: Parsed JSON response
+        :param at: Seconds since session start, defaults to elapsed time
+        """
+        t = time.monotonic() - self._started if at is None else at
+        frame = {"t": round(t, 3), "endpoint": endpoint, "params": params or {}}
+        if endpoint in self._last:
+            frame["delta"] = diff(self._last[endpoint], data)
+        else:
+            frame["base"] = data
+        self._last[endpoint] = data
+        self._write(frame)
+
+    def attach(self, client: FootballDataClient):
+        client.add_response_hook(self.record)
+
+    def detach(self, client: FootballDataClient):
+        client.remove_response_hook(self.record)
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_recording(path: str) -> Iterator[Dict]:
+    """
+    Yield the polls of a recording with full responses reconstructed.
+
+    Each item has `t`, `endpoint`, `params` and `data`. A recording cut
+    short by a killed session is read up to the last complete frame.
+    """
+    current: Dict[str, Any] = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            header = json.loads(next(f))
+            if header.get("version") != FORMAT_VERSION:
+                raise ValueError(
+                    f"Unsupported recording version {header.get('version')}"
+                )
+            for line in f:
+                if not line.endswith("\n"):
+                    break
+                frame = json.loads(line)
+                endpoint = frame["endpoint"]
+                if "base" in frame:
+                    current[endpoint] = frame["base"]
+                else:
+                    current[endpoint] = apply(current[endpoint], frame["delta"])
+                yield {
+                    "t": frame["t"],
+                    "endpoint": endpoint,
+                    "params": frame["params"],
+                    "data": current[endpoint],
+                }
+        except (EOFError, StopIteration):
+            logger.debug(f"Recording {path} ends early")
+            return
+
+
+class ReplayClient(FootballDataClient):
+    """
+    Client that serves responses from a recording instead of the API.
+
+    With a `speed` the recording is played against a virtual clock, e.g.
+    at 60x one second of wall time covers a minute of recording and each
+    request returns the latest frame recorded by then. With `speed=None`
+    every request for an endpoint steps to its next frame, which is handy
+    in tests. Request parameters are ignored, frames are matched on
+    endpoint only.
+    """
+
+    def __init__(self, path: str, speed: Optional[float] = 1.0):
+        """
+        :param path: Recording written by `SessionRecorder`
+        :param speed: Playback speed multiplier, or None to step per request
+        """
+        super().__init__(api_token="")
+        self.speed = speed
+        self._frames: Dict[str, List[Dict]] = {}
+        for frame in read_recording(path):
+            self._frames.setdefault(frame["endpoint"], []).append(frame)
+        self._positions = {endpoint: -1 for endpoint in self._frames}
+        self._clock_start: Optional[float] = None
+
+    def _virtual_time(self) -> float:
+        if self._clock_start is None:
+            self._clock_start = time.monotonic()
+        return (time.monotonic() - self._clock_start) * self.speed
+
+    @property
+    def finished(self) -> bool:
+        """True once every endpoint has served its last frame."""
+        return all(
+            self._positions[endpoint] >= len(frames) - 1
+            for endpoint, frames in self._frames.items()
+        )
+
+    def make_request(
+        self, endpoint: str, params: Optional[Dict] = None, ttl: Optional[int] = None
+    ) -> Dict:
+        frames = self._frames.get(endpoint)
+        if not frames:
+            raise FootballDataClientError(f"No recorded frames for {endpoint}")
+        position = self._positions[endpoint]
+        if self.speed is None:
+            position = min(position + 1, len(frames) - 1)
+        else:
+            now = self._virtual_time()
+            position = max(position, 0)
+            while position + 1 < len(frames) and frames[position + 1]["t"] <= now:
+                position += 1
+        self._positions[endpoint] = position
+        data = frames[position]["data"]
+        for hook in self._response_hooks:
+            hook(endpoint, params, data)
+        return data
@@ -0,0 +1,382 @@
+import logging
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FINISHED_STATUSES = ["FINISHED", "AWARDED"]
+LIVE_STATUSES = ["IN_PLAY", "PAUSED"]
+# stages that feed a single league table
+TABLE_STAGES = ["REGULAR_SEASON", "LEAGUE_STAGE"]
+
+# per-team counters, in array order
+_STATS = [
+    "played",
+    "won",
+    "draw",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "away_goals_for",
+    "away_won",
+]
+
+# ordering applied after points, highest first
+TIEBREAKERS: Dict[str, List[str]] = {
+    "PL": ["goal_difference", "goals_for"],
+    "BL1": ["goal_difference", "goals_for"],
+    "FL1": ["goal_difference", "goals_for"],
+    "PD": ["h2h_points", "h2h_goal_difference", "goal_difference", "goals_for"],
+    "SA": ["h2h_points", "h2h_goal_difference", "goal_difference", "goals_for"],
+    "CL": [
+        "goal_difference",
+        "goals_for",
+        "away_goals_for",
+        "won",
+        "away_won",
+    ],
+}
+DEFAULT_TIEBREAKERS = ["goal_difference", "goals_for"]
+
+STANDINGS_COLUMNS = [
+    "position",
+    "team",
+    "tla",
+    "crest",
+    "points",
+    "played",
+    "won",
+    "draw",
+    "lost",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+]
+
+
+def _contributions(
+    home_score: np.ndarray, away_score: np.ndarray, counted: np.ndarray
+) -> np.ndarray:
+    """
+    What each match adds to its two teams' counters.
+
+    :return: Array of shape (matches, 2, len(_STATS)), home side first
+    """
+    home = np.where(counted, home_score, 0)
+    away = np.where(counted, away_score, 0)
+    played = counted.astype(np.int64)
+    home_won = (home > away) & counted
+    away_won = (away > home) & counted
+    drawn = (home == away) & counted
+    zeros = np.zeros_like(played)
+    home_side = np.stack(
+        [played, home_won, drawn, away_won, home, away, zeros, zeros], axis=-1
+    )
+    away_side = np.stack(
+        [played, away_won, drawn, home_won, away, home, away, away_won], axis=-1
+    )
+    return np.stack([home_side, away_side], axis=1).astype(np.int64)
+
+
+def season_metadata(matches_metadata: Dict) -> Dict:
+    """
+    Shape `get_matches` metadata like `get_standings` metadata, enough
+    for the display to title the table with the season.
+    """
+    result_set = matches_metadata.get("resultSet", {})
+    return {
+        "season": {
+            "startDate": result_set.get("first", ""),
+            "endDate": result_set.get("last", ""),
+        },
+        "competition": matches_metadata.get("competition"),
+    }
+
+
+class LiveTable:
+    """
+    League table computed from a season of matches instead of the
+    standings endpoint.
+
+    Per-team counters live in a NumPy array, built in one vectorized
+    pass. `update` applies only the difference a changed match makes, so
+    refreshing with live scores touches two rows per changed match.
+    """
+
+    def __init__(self, matches: pd.DataFrame, league: str, live: bool = True):
+        """
+        :param matches: Season matches from `get_matches`
+        :param league: League code, selects the tiebreak rules
+        :param live: Count in-progress matches at their current score
+        """
+        self.league = league
+        self.live = live
+        self.tiebreakers = TIEBREAKERS.get(league, DEFAULT_TIEBREAKERS)
+
+        if "stage" in matches and matches["stage"].isin(TABLE_STAGES).any():
+            matches = matches[matches["stage"].isin(TABLE_STAGES)]
+
+        home = matches[["home_team_id", "home_team", "home_team_code"]]
+        away = matches[["away_team_id", "away_team", "away_team_code"]]
+        teams = pd.concat(
+            [
+                home.set_axis(["id", "team", "tla"], axis=1),
+                away.set_axis(["id", "team", "tla"], axis=1),
+            ]
+        ).drop_duplicates("id")
+        self.teams = teams.reset_index(drop=True)
+        self._team_index = {team_id: i for i, team_id in enumerate(self.teams["id"])}
+
+        self._match_index = {match_id: i for i, match_id in enumerate(matches["id"])}
+        self._home_idx = matches["home_team_id"].map(self._team_index).to_numpy()
+        self._away_idx = matches["away_team_id"].map(self._team_index).to_numpy()
+
+        self._contrib = self._match_contributions(matches)
+        self._totals = np.zeros((len(self.teams), len(_STATS)), dtype=np.int64)
+        np.add.at(self._totals, self._home_idx, self._contrib[:, 0])
+        np.add.at(self._totals, self._away_idx, self._contrib[:, 1])
+
+    def _match_contributions(self, matches: pd.DataFrame) -> np.ndarray:
+        statuses = FINISHED_STATUSES + (LIVE_STATUSES if self.live else [])
+        counted = matches["status"].isin(statuses).to_numpy()
+        home_score = matches["home_score"].to_numpy(dtype=float, na_value=0)
+        away_score = matches["away_score"].to_numpy(dtype=float, na_value=0)
+        return _contributions(home_score, away_score, counted)
+
+    def update(self, matches: pd.DataFrame) -> int:
+        """
+        Fold in newer data for some matches, e.g. today's live scores.
+        Matches not in the season frame are ignored.
+
+        :return: Number of matches whose contribution changed
+        """
+        if matches.empty:
+            return 0
+        known = matches[matches["id"].isin(self._match_index.keys())]
+        rows = known["id"].map(self._match_index).to_numpy()
+        new = self._match_contributions(known)
+        delta = new - self._contrib[rows]
+        changed = delta.any(axis=(1, 2))
+        if not changed.any():
+            return 0
+        rows, delta = rows[changed], delta[changed]
+        np.add.at(self._totals, self._home_idx[rows], delta[:, 0])
+        np.add.at(self._totals, self._away_idx[rows], delta[:, 1])
+        self._contrib[rows] = new[changed]
+        logger.debug(f"Live table updated from {len(rows)} matches")
+        return len(rows)
+
+    def _head_to_head(self, table: pd.DataFrame) -> pd.DataFrame:
+        """
+        Points and goal difference among teams level on points.
+        """
+        table["h2h_points"] = 0
+        table["h2h_goal_difference"] = 0
+        for _, group in table.groupby("points"):
+            if len(group) < 2:
+                continue
+            members = group.index.to_numpy()
+            among = np.isin(self._home_idx, members) & np.isin(self._away_idx, members)
+            totals = np.zeros((len(self.teams), len(_STATS)), dtype=np.int64)
+            np.add.at(totals, self._home_idx[among], self._contrib[among, 0])
+            np.add.at(totals, self._away_idx[among], self._contrib[among, 1])
+            won, draw = totals[members, 1], totals[members, 2]
+            goals_for, goals_against = totals[members, 4], totals[members, 5]
+            table.loc[members, "h2h_points"] = 3 * won + draw
+            table.loc[members, "h2h_goal_difference"] = goals_for - goals_against
+        return table
+
+    def table(self) -> pd.DataFrame:
+        """
+        :return: Ranked table with the same columns as `get_standings`
+        """
+        table = pd.DataFrame(self._totals, columns=_STATS)
+        table["team"] = self.teams["team"]
+        table["tla"] = self.teams["tla"]
+        table["crest"] = None
+        table["points"] = 3 * table["won"] + table["draw"]
+        table["goal_difference"] = table["goals_for"] - table["goals_against"]
+
+        if any(key.startswith("h2h_") for key in self.tiebreakers):
+            table = self._head_to_head(table)
+
+        keys = ["points"] + self.tiebreakers
+        table = table.sort_values(
+            by=keys + ["team"], ascending=[False] * len(keys) + [True]
+        ).reset_index(drop=True)
+        table["position"] = np.arange(1, len(table) + 1)
+
+        table = table[STANDINGS_COLUMNS]
+        for col in STANDINGS_COLUMNS[4:]:
+            table[col] = table[col].astype("Int64")
+        return table
+
+
+def compute_standings(
+    matches: pd.DataFrame, league: str, live: bool = False
+) -> pd.DataFrame:
+    """
+    One-off league table from a season of matches.
+
+    :param matches: Season matches from `get_matches`
+    :param league: League code, selects the tiebreak rules
+    :param live: Count in-progress matches at their current score
+    :return: DataFrame with the same columns as `get_standings`
+    """
+    if matches.empty:
+        return pd.DataFrame(columns=STANDINGS_COLUMNS)
+    return LiveTable(matches, league, live=live).table()
+
+
+class StandingsTimeline:
+    """
+    The table after every matchday of a season, from one pass over the
+    matches.
+
+    Each finished match's contribution is added to its matchday, a
+    cumulative sum over matchdays gives every team's totals after each
+    round, and one lexsort ranks all the rounds at once. A match counts
+    towards the matchday it was scheduled for, even if played later.
+    Head-to-head tiebreaks are left out, `LiveTable` applies them to the
+    current table.
+    """
+
+    def __init__(self, matches: pd.DataFrame, league: str):
+        """
+        :param matches: Season matches from `get_matches`
+        :param league: League code, selects the tiebreak rules
+        """
+        self.league = league
+        self.tiebreakers = [
+            key
+            for key in TIEBREAKERS.get(league, DEFAULT_TIEBREAKERS)
+            if not key.startswith("h2h_")
+        ]
+        if matches.empty:
+            self.teams = pd.DataFrame(columns=["id", "team", "tla"])
+            self.matchdays = self.played = 0
+            self._totals = np.zeros((0, 0, len(_STATS)), dtype=np.int64)
+            self._positions = np.zeros((0, 0), dtype=np.int64)
+            return
+        if "stage" in matches and matches["stage"].isin(TABLE_STAGES).any():
+            matches = matches[matches["stage"].isin(TABLE_STAGES)]
+        matches = matches[matches["matchday"].notna()]
+
+        home = matches[["home_team_id", "home_team", "home_team_code"]]
+        away = matches[["away_team_id", "away_team", "away_team_code"]]
+        teams = pd.concat(
+            [
+                home.set_axis(["id", "team", "tla"], axis=1),
+                away.set_axis(["id", "team", "tla"], axis=1),
+            ]
+        ).drop_duplicates("id")
+        self.teams = teams.reset_index(drop=True)
+        team_index = {team_id: i for i, team_id in enumerate(self.teams["id"])}
+        home_idx = matches["home_team_id"].map(team_index).to_numpy()
+        away_idx = matches["away_team_id"].map(team_index).to_numpy()
+
+        counted = matches["status"].isin(FINISHED_STATUSES).to_numpy()
+        contrib = _contributions(
+            matches["home_score"].to_numpy(dtype=float, na_value=0),
+            matches["away_score"].to_numpy(dtype=float, na_value=0),
+            counted,
+        )
+        rounds = matches["matchday"].to_numpy(dtype=np.int64) - 1
+        self.matchdays = int(rounds.max()) + 1 if len(rounds) else 0
+        self.played = int(rounds[counted].max()) + 1 if counted.any() else 0
+
+        per_round = np.zeros(
+            (self.matchdays, len(self.teams), len(_STATS)), dtype=np.int64
+        )
+        np.add.at(per_round, (rounds, home_idx), contrib[:, 0])
+        np.add.at(per_round, (rounds, away_idx), contrib[:, 1])
+        # shape (matchdays, teams, stats), totals after each matchday
+        self._totals = per_round.cumsum(axis=0)
+        self._positions = self._rank()
+
+    def _column(self, name: str) -> np.ndarray:
+        """
+        One counter, or a derived one, for every matchday and team.
+        """
+        if name == "points":
+            return 3 * self._column("won") + self._column("draw")
+        if name == "goal_difference":
+            return self._column("goals_for") - self._column("goals_against")
+        return self._totals[:, :, _STATS.index(name)]
+
+    def _rank(self) -> np.ndarray:
+        """
+        :return: Positions, shape (matchdays, teams), 1 for the leader
+        """
+        if not self.matchdays:
+            return np.zeros((0, len(self.teams)), dtype=np.int64)
+        # alphabetical order breaks any remaining tie, as in `LiveTable`
+        by_name = self.teams["team"].rank(method="first").to_numpy(dtype=np.int64)
+        by_name = np.broadcast_to(by_name, (self.matchdays, len(self.teams)))
+        # lexsort takes its primary key last
+        keys = [by_name] + [
+            -self._column(key) for key in reversed(["points"] + self.tiebreakers)
+        ]
+        order = np.lexsort(keys, axis=-1)
+        positions = np.empty_like(order)
+        ranks = np.broadcast_to(np.arange(1, len(self.teams) + 1), order.shape)
+        np.put_along_axis(positions, order, ranks, axis=-1)
+        return positions
+
+    def table(self, matchday: int) -> pd.DataFrame:
+        """
+        :param matchday: 1 for the table after the first round
+        :return: Ranked table with the same columns as `get_standings`
+        """
+        if not 1 <= matchday <= self.matchdays:
+            raise ValueError(f"Matchday must be between 1 and {self.matchdays}")
+        row = matchday - 1
+        table = pd.DataFrame(self._totals[row], columns=_STATS)
+        table["team"] = self.teams["team"]
+        table["tla"] = self.teams["tla"]
+        table["crest"] = None
+        table["points"] = self._column("points")[row]
+        table["goal_difference"] = self._column("goal_difference")[row]
+        table["position"] = self._positions[row]
+
+        table = table.sort_values("position").reset_index(drop=True)[STANDINGS_COLUMNS]
+        for col in STANDINGS_COLUMNS[4:]:
+            table[col] = table[col].astype("Int64")
+        return table
+
+    def positions(self, last: Optional[int] = None) -> pd.DataFrame:
+        """
+        Each team's position after every matchday played so far, teams
+        in the order of the latest table.
+
+        :param last: Only this many of the latest matchdays
+        :return: DataFrame indexed by team, one column per matchday
+        """
+        first = 0 if last is None else max(0, self.played - last)
+        df = pd.DataFrame(
+            self._positions[first : self.played].T,
+            index=self.teams["team"],
+            columns=range(first + 1, self.played + 1),
+        )
+        if self.played:
+            df = df.sort_values(self.played)
+        df.index.name = "team"
+        return df
+
+    def records(self) -> Iterator[Dict]:
+        """
+        One flat row per team and matchday played, for the output
+        formats.
+        """
+        points = self._column("points")
+        for row in range(self.played):
+            for i, team in enumerate(self.teams["team"]):
+                yield {
+                    "matchday": row + 1,
+                    "team": team,
+                    "tla": self.teams["tla"][i],
+                    "position": int(self._positions[row, i]),
+                    "points": int(points[row, i]),
+                }
@@ -0,0 +1,266 @@
+import logging
+from functools import cached_property
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .cache import FileCache
+from .config import DEFAULT_FORM_LENGTH, STATS_TTL
+from .standings import FINISHED_STATUSES
+
+logger = logging.getLogger(__name__)
+
+
+def dataset_version(matches: pd.DataFrame) -> str:
+    """
+    Fingerprint of the results in a matches frame. Changes whenever a
+    match is added, finishes or has its score corrected.
+    """
+    if matches.empty:
+        return "empty"
+    cols = matches[["id", "status", "home_score", "away_score"]]
+    return f"{len(cols)}:{pd.util.hash_pandas_object(cols, index=False).sum()}"
+
+
+def team_results(matches: pd.DataFrame) -> pd.DataFrame:
+    """
+    Finished matches in long form, one row per team per match.
+    """
+    finished = matches[matches["status"].isin(FINISHED_STATUSES)]
+    common = ["id", "utc_datetime", "matchday"]
+    home = finished[common].assign(
+        team=finished["home_team"],
+        tla=finished["home_team_code"],
+        opponent=finished["away_team"],
+        venue="HOME",
+        goals_for=finished["home_score"],
+        goals_against=finished["away_score"],
+    )
+    away = finished[common].assign(
+        team=finished["away_team"],
+        tla=finished["away_team_code"],
+        opponent=finished["home_team"],
+        venue="AWAY",
+        goals_for=finished["away_score"],
+        goals_against=finished["home_score"],
+    )
+    results = pd.concat([home, away], ignore_index=True)
+    results["goals_for"] = results["goals_for"].astype("int64")
+    results["goals_against"] = results["goals_against"].astype("int64")
+    results["result"] = np.select(
+        [
+            results["goals_for"] > results["goals_against"],
+            results["goals_for"] == results["goals_against"],
+        ],
+        ["W", "D"],
+        default="L",
+    )
+    results["points"] = np.select(
+        [results["result"] == "W", results["result"] == "D"], [3, 1], default=0
+    )
+    return results.sort_values(["utc_datetime", "id"]).reset_index(drop=True)
+
+
+def _record(results: pd.DataFrame, by) -> pd.DataFrame:
+    """
+    Played, W/D/L, goals and points summed per group.
+    """
+    grouped = results.assign(
+        won=results["result"] == "W",
+        draw=results["result"] == "D",
+        lost=results["result"] == "L",
+    ).groupby(by)
+    record = grouped.agg(
+        played=("id", "size"),
+        won=("won", "sum"),
+        draw=("draw", "sum"),
+        lost=("lost", "sum"),
+        goals_for=("goals_for", "sum"),
+        goals_against=("goals_against", "sum"),
+        points=("points", "sum"),
+    )
+    record["goal_difference"] = record["goals_for"] - record["goals_against"]
+    return record
+
+
+class SeasonStats:
+    """
+    Derived statistics for one season of matches, computed column-wise
+    for all teams at once and kept for reuse. With a cache the all-team
+    tables are also kept between runs, until a result changes.
+    """
+
+    def __init__(
+        self,
+        matches: pd.DataFrame,
+        cache: Optional[FileCache] = None,
+        key: Optional[str] = None,
+    ):
+        """
+        :param matches: Season matches from `get_matches`
+        :param cache: Where tables are kept between runs
+        :param key: Cache key prefix, see `season_stats`
+        """
+        self.matches = matches
+        self.cache = cache if key else None
+        self.key = key
+
+    def _cached(self, name: str, build: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        if self.cache is None:
+            return build()
+        key = f"{self.key}/{name}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.debug(f"Stats {key} from the cache")
+            return pd.DataFrame(cached["rows"], columns=cached["columns"])
+        df = build()
+        # a new result changes the key, so the entry can live long
+        self.cache.set(
+            key,
+            {"columns": list(df.columns), "rows": df.to_dict("records")},
+            STATS_TTL,
+        )
+        return df
+
+    @cached_property
+    def results(self) -> pd.DataFrame:
+        return team_results(self.matches)
+
+    @cached_property
+    def teams(self) -> Dict[str, str]:
+        """
+        Lowercased team names and TLAs mapped to the team name.
+        """
+        lookup = {}
+        for side in ["home", "away"]:
+            names = self.matches[f"{side}_team"]
+            codes = self.matches[f"{side}_team_code"]
+            lookup.update(zip(names.str.lower(), names))
+            lookup.update(zip(codes.str.lower(), names))
+        return lookup
+
+    def resolve_team(self, team: str) -> str:
+        """
+        Case-insensitive lookup by name or three letter code.
+        """
+        try:
+            return self.teams[team.strip().lower()]
+        except KeyError:
+            raise ValueError(f"Team {team} not found") from None
+
+    @cached_property
+    def _form_all(self) -> pd.DataFrame:
+        return self._cached(
+            "form",
+            lambda: self._summarize_form(
+                self.results.groupby("team").tail(DEFAULT_FORM_LENGTH)
+            ),
+        )
+
+    @staticmethod
+    def _summarize_form(recent: pd.DataFrame) -> pd.DataFrame:
+        form = recent.groupby("team").agg(
+            tla=("tla", "first"),
+            form=("result", "".join),
+            points=("points", "sum"),
+            goals_for=("goals_for", "sum"),
+            goals_against=("goals_against", "sum"),
+        )
+        return form.sort_values(
+            ["points", "goals_for"], ascending=[False, False]
+        ).reset_index()
+
+    def form(
+        self, team: Optional[str] = None, last: int = DEFAULT_FORM_LENGTH
+    ) -> pd.DataFrame:
+        """
+        Results of each team's most recent matches, oldest first.
+
+        :param team: Limit to one team
+        :param last: Number of matches to include
+        """
+        if last == DEFAULT_FORM_LENGTH:
+            form = self._form_all
+        else:
+            form = self._summarize_form(self.results.groupby("team").tail(last))
+        if team:
+            form = form[form["team"] == self.resolve_team(team)]
+        return form.reset_index(drop=True)
+
+    @cached_property
+    def _splits_all(self) -> pd.DataFrame:
+        return self._cached("splits", self._build_splits)
+
+    def _build_splits(self) -> pd.DataFrame:
+        record = _record(self.results, ["team", "venue"]).unstack("venue")
+        record.columns = [f"{venue.lower()}_{stat}" for stat, venue in record.columns]
+        record = record.fillna(0).astype("int64")
+        ordered = [
+            f"{venue}_{stat}"
+            for venue in ["home", "away"]
+            for stat in [
+                "played",
+                "won",
+                "draw",
+                "lost",
+                "goals_for",
+                "goals_against",
+                "goal_difference",
+                "points",
+            ]
+        ]
+        record = record.reindex(columns=ordered, fill_value=0)
+        total = record["home_points"] + record["away_points"]
+        return record.loc[total.sort_values(ascending=False).index].reset_index()
+
+    def splits(self, team: Optional[str] = None) -> pd.DataFrame:
+        """
+        Home and away records side by side.
+
+        :param team: Limit to one team
+        """
+        splits = self._splits_all
+        if team:
+            splits = splits[splits["team"] == self.resolve_team(team)]
+        return splits.reset_index(drop=True)
+
+    def head_to_head(self, team: str, opponent: str) -> Tuple[Dict, pd.DataFrame]:
+        """
+        Meetings between two teams this season.
+
+        :return: Summary record for `team` and the matches, oldest first
+        """
+        team, opponent = self.resolve_team(team), self.resolve_team(opponent)
+        results = self.results
+        meetings = results[
+            (results["team"] == team) & (results["opponent"] == opponent)
+        ]
+        record = _record(meetings, "team")
+        summary = (
+            record.iloc[0].to_dict()
+            if not record.empty
+            else dict.fromkeys(record.columns, 0)
+        )
+        summary.update(team=team, opponent=opponent)
+        return summary, meetings.reset_index(drop=True)
+
+
+def season_stats(
+    matches: pd.DataFrame,
+    league: str,
+    season: Optional[str] = None,
+    cache: Optional[FileCache] = None,
+) -> SeasonStats:
+    """
+    `SeasonStats` for a league season, with its tables cached under the
+    season and `dataset_version`, so they are only computed again once
+    the results in `matches` change.
+
+    :param matches: Season matches from `get_matches`
+    :param league: League code
+    :param season: Season label, e.g. from the response's `filters`
+    :param cache: Where tables are kept between runs, e.g. the client's
+    """
+    key = f"stats/{league}/{season}/{dataset_version(matches)}"
+    return SeasonStats(matches, cache=cache, key=key)
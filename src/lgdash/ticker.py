@@ -0,0 +1,169 @@
+"""
+One line of live scores for status bars and prompts, e.g. tmux or
+polybar:
+
+    ARS 2-1 CHE 67' | LIV 0-0 MCI HT
+
+Nothing is fetched. Matches come from the per-date schedules that other
+commands leave in the cache (`lgdash`, `watch`, `board` and `warm` all
+write them), or from a snapshot file, e.g. one written by
+`lgdash --format json`. Keeping those fresh is up to whatever runs
+alongside. Only the standard library is imported, not pandas, rich,
+requests or click, so a status bar can run this every few seconds.
+"""
+
+import argparse
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from .cache import FileCache, default_cache, utc_date_key
+from .leagues import COMPETITIONS, SUPPORTED_LEAGUES
+
+LIVE_STATUSES = {"IN_PLAY", "PAUSED"}
+# short labels for matches that aren't under way
+STATUS_LABELS = {
+    "PAUSED": "HT",
+    "FINISHED": "FT",
+    "AWARDED": "FT",
+    "POSTPONED": "PP",
+    "SUSPENDED": "SUS",
+    "CANCELLED": "CAN",
+}
+SEPARATOR = " | "
+
+
+def _ticker_row(match: Dict) -> Dict:
+    """
+    The fields the ticker needs from a raw API match.
+    """
+    return {
+        "home_team_code": match["homeTeam"]["tla"],
+        "away_team_code": match["awayTeam"]["tla"],
+        "home_score": match["score"]["fullTime"]["home"],
+        "away_score": match["score"]["fullTime"]["away"],
+        "status": match["status"],
+        "minute": match.get("minute"),
+        "injury_time": match.get("injuryTime"),
+        "utc_datetime": match["utcDate"],
+    }
+
+
+def cached_matches(
+    leagues: Iterable[str], today: datetime, cache: Optional[FileCache] = None
+) -> List[Dict]:
+    """
+    Today's matches from the cached schedules, expired entries included,
+    since an old score beats none in a status bar.
+
+    :param today: Local now, with a timezone
+    """
+    cache = cache or default_cache()
+    utc_today = today.astimezone(timezone.utc).date()
+    rows = []
+    for league in leagues:
+        # local today spans parts of up to three UTC dates
+        for offset in (-1, 0, 1):
+            day = utc_today + timedelta(days=offset)
+            entry = cache.get(utc_date_key(league, day), allow_expired=True)
+            if entry is not None:
+                rows.extend(_ticker_row(match) for match in entry["matches"])
+    return rows
+
+
+def snapshot_matches(path: str) -> List[Dict]:
+    """
+    Matches from a JSON array or NDJSON of rows, as `lgdash --format`
+    writes them, or from a raw API response with a `matches` list.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except ValueError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        return [_ticker_row(match) for match in data.get("matches", [])]
+    return data
+
+
+def format_match(row: Dict, tz=None) -> str:
+    """
+    `ARS 2-1 CHE 67'`, `ARS 1-1 CHE FT`, or `ARS v CHE 20:00` before
+    kickoff, in the timezone `tz`.
+    """
+    home, away, status = row["home_team_code"], row["away_team_code"], row["status"]
+    score = f"{home} {row['home_score'] or 0}-{row['away_score'] or 0} {away}"
+    if status == "IN_PLAY":
+        minute, injury = row.get("minute"), row.get("injury_time")
+        if minute is None:
+            return f"{score} LIVE"
+        return f"{score} {minute}+{injury}'" if injury else f"{score} {minute}'"
+    if status in ("PAUSED", "FINISHED", "AWARDED"):
+        return f"{score} {STATUS_LABELS[status]}"
+    if status in STATUS_LABELS:
+        return f"{home} v {away} {STATUS_LABELS[status]}"
+    kickoff = datetime.fromisoformat(row["utc_datetime"]).astimezone(tz)
+    return f"{home} v {away} {kickoff.strftime('%H:%M')}"
+
+
+def ticker_line(
+    rows: List[Dict],
+    today: datetime,
+    show_all: bool = False,
+    separator: str = SEPARATOR,
+) -> str:
+    """
+    :param rows: Matches, see `cached_matches`
+    :param today: Local now, only its date's matches are shown
+    :param show_all: Every match today, not only the ones under way
+    """
+    tz = today.tzinfo
+    shown = []
+    for row in rows:
+        kickoff = datetime.fromisoformat(row["utc_datetime"]).astimezone(tz)
+        if kickoff.date() != today.date():
+            continue
+        if show_all or row["status"] in LIVE_STATUSES:
+            shown.append((row["utc_datetime"], row["home_team_code"], row))
+    shown.sort(key=lambda item: item[:2])
+    return separator.join(format_match(row, tz) for _, _, row in shown)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="lgdash-ticker",
+        description="Live scores on one line, read from the lgdash cache.",
+    )
+    parser.add_argument(
+        "-l",
+        "--league",
+        action="append",
+        choices=COMPETITIONS,
+        help="League code, can be repeated, defaults to all",
+    )
+    parser.add_argument(
+        "--all", action="store_true", help="All of today's matches, not only live"
+    )
+    parser.add_argument("--snapshot", help="Read matches from this file instead")
+    parser.add_argument("--sep", default=SEPARATOR, help="Text between matches")
+    args = parser.parse_args(argv)
+
+    today = datetime.now().astimezone()
+    try:
+        if args.snapshot:
+            rows = snapshot_matches(args.snapshot)
+        else:
+            rows = cached_matches(args.league or list(SUPPORTED_LEAGUES), today)
+        line = ticker_line(rows, today, show_all=args.all, separator=args.sep)
+    except (OSError, ValueError, KeyError) as e:
+        # a status bar shows stdout, keep it clean
+        print(f"lgdash-ticker: {e}", file=sys.stderr)
+        return 1
+    print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+"""
+Off-peak cache warming.
+
+Kickoff times come from the per-date schedules already in the cache, so
+working out when the API will be busy costs no requests. Outside those
+windows, fixtures, standings, teams and the season's matches are
+fetched for each league, paced across the rate limit, and cached until
+the next window opens. The first command after that needs no requests.
+"""
+
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+from .client import (
+    FINAL_STATUSES,
+    FootballDataClient,
+    FootballDataClientError,
+    RequestPacer,
+)
+from .cache import FileCache, utc_date_key
+from .config import (
+    PEAK_AFTER_KICKOFF,
+    PEAK_BEFORE_KICKOFF,
+    SEASON_MATCHES_TTL,
+    STANDINGS_TTL,
+    TEAMS_TTL,
+    UPCOMING_MATCHES_TTL,
+    WARM_DAYS,
+    WARM_MAX_TTL,
+    WARM_REQUESTS_PER_MINUTE,
+)
+
+logger = logging.getLogger(__name__)
+
+# an entry lasting to within this long of the next window is left alone
+REFRESH_SLACK = 60
+
+Window = Tuple[datetime, datetime]
+
+
+class WarmResult(NamedTuple):
+    league: str
+    item: str
+    requests: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def cached_kickoffs(
+    cache: FileCache, leagues: List[str], start: date, days: int
+) -> List[datetime]:
+    """
+    Kickoff times of matches not yet over, read from cached schedules
+    without any requests. Expired entries still count, kickoff times
+    rarely move.
+
+    :param start: First UTC date, the day before today catches matches
+        running over midnight
+    :param days: Number of UTC dates to read
+    """
+    kickoffs = []
+    for league in leagues:
+        for i in range(days):
+            entry = cache.get(
+                utc_date_key(league, start + timedelta(days=i)), allow_expired=True
+            )
+            if entry is None:
+                continue
+            for match in entry["matches"]:
+                if match["status"] not in FINAL_STATUSES:
+                    kickoffs.append(datetime.fromisoformat(match["utcDate"]))
+    return sorted(kickoffs)
+
+
+def peak_windows(kickoffs: List[datetime]) -> List[Window]:
+    """
+    Merge the busy period around each kickoff into disjoint windows.
+
+    :param kickoffs: Sorted kickoff times
+    """
+    windows: List[Window] = []
+    before = timedelta(seconds=PEAK_BEFORE_KICKOFF)
+    after = timedelta(seconds=PEAK_AFTER_KICKOFF)
+    for kickoff in kickoffs:
+        start, end = kickoff - before, kickoff + after
+        if windows and start <= windows[-1][1]:
+            windows[-1] = (windows[-1][0], max(windows[-1][1], end))
+        else:
+            windows.append((start, end))
+    return windows
+
+
+def next_window(windows: List[Window], now: datetime) -> Optional[Window]:
+    """
+    :return: The window `now` is in, else the next one, if any
+    """
+    return next((window for window in windows if window[1] > now), None)
+
+
+class CacheWarmer:
+    """
+    Fills the cache for a set of leagues while no matches are on, so the
+    requests are spent when nobody else is spending them.
+    """
+
+    def __init__(
+        self,
+        client: FootballDataClient,
+        leagues: List[str],
+        days: int = WARM_DAYS,
+        per_minute: float = WARM_REQUESTS_PER_MINUTE,
+        clock: Optional[Callable[[], datetime]] = None,
+    ):
+        """
+        :param client: Client with a cache to fill
+        :param leagues: League codes
+        :param days: Days of fixtures to fetch, from today
+        :param per_minute: Requests to spend per minute
+        :param clock: Current UTC time, for tests
+        """
+        if client.cache is None:
+            raise ValueError("Cache warming needs a client with a cache")
+        self.client = client
+        self.leagues = leagues
+        self.days = days
+        self.pacer = RequestPacer(per_minute)
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+    def windows(self) -> List[Window]:
+        """
+        Peak windows from the schedules currently in the cache.
+        """
+        start = self.clock().date() - timedelta(days=1)
+        # the local horizon can reach one UTC date further
+        kickoffs = cached_kickoffs(
+            self.client.cache, self.leagues, start, self.days + 3
+        )
+        return peak_windows(kickoffs)
+
+    def current_peak(self) -> Optional[Window]:
+        """
+        :return: The window in progress, if any
+        """
+        now = self.clock()
+        window = next_window(self.windows(), now)
+        return window if window and window[0] <= now else None
+
+    def quiet_seconds(self, windows: Optional[List[Window]] = None) -> int:
+        """
+        Seconds until the next peak window, capped at WARM_MAX_TTL.
+
+        :param windows: Defaults to the windows in the cache now
+        """
+        now = self.clock()
+        window = next_window(self.windows() if windows is None else windows, now)
+        if window is None:
+            return WARM_MAX_TTL
+        return int(min(WARM_MAX_TTL, max(0, (window[0] - now).total_seconds())))
+
+    def _fetch(
+        self, league: str, item: str, quiet: int, start_date: str, end_date: str
+    ):
+        # entries written now stay good until the next peak, at least as
+        # long as a normal run would cache them
+        if item == "fixtures":
+            self.client.get_local_matches(
+                league,
+                start_date,
+                end_date,
+                upcoming_ttl=max(UPCOMING_MATCHES_TTL, quiet),
+            )
+        elif item == "standings":
+            self.client.get_standings(league, ttl=max(STANDINGS_TTL, quiet))
+        elif item == "teams":
+            self.client.get_teams(league, ttl=max(TEAMS_TTL, quiet))
+        elif item == "season":
+            self.client.get_matches(league, ttl=max(SEASON_MATCHES_TTL, quiet))
+        else:
+            raise ValueError(f"Unknown item {item}")
+
+    def run(self, force: bool = False) -> List[WarmResult]:
+        """
+        Warm every league, fixtures first so the schedule used to place
+        the next peak is current. Stops when a peak window is about to
+        open.
+
+        :param force: Keep going into a peak window
+        :return: One result per item warmed, in order
+        """
+        today = self.clock().astimezone(self.client.timezone).date()
+        start_date = today.isoformat()
+        end_date = (today + timedelta(days=self.days)).isoformat()
+        tasks = [(league, "fixtures") for league in self.leagues] + [
+            (league, item)
+            for league in self.leagues
+            for item in ["standings", "teams", "season"]
+        ]
+
+        previous_pacer, previous_fresh_for = self.client.pacer, self.client.fresh_for
+        self.client.pacer = self.pacer
+        results = []
+        windows = self.windows()
+        try:
+            for league, item in tasks:
+                quiet = self.quiet_seconds(windows)
+                if not force and quiet < self.pacer.interval:
+                    logger.info(f"Peak window reached, stopping before {league} {item}")
+                    break
+                # cached entries that would expire before the window are
+                # fetched again, so they last until it opens
+                self.client.fresh_for = max(0, quiet - REFRESH_SLACK)
+                requests_before = self.pacer.requests
+                started = time.perf_counter()
+                error = None
+                try:
+                    # builds the frame too, so a bad payload shows up now
+                    self._fetch(league, item, quiet, start_date, end_date)
+                except FootballDataClientError as e:
+                    logger.warning(f"Could not warm {item} for {league}: {e}")
+                    error = str(e)
+                if item == "fixtures":
+                    windows = self.windows()
+                results.append(
+                    WarmResult(
+                        league,
+                        item,
+                        self.pacer.requests - requests_before,
+                        time.perf_counter() - started,
+                        error,
+                    )
+                )
+        finally:
+            self.client.pacer = previous_pacer
+            self.client.fresh_for = previous_fresh_for
+        return results
@@ -0,0 +1,99 @@
+import gzip
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lgdash import backfill as backfill_module
+from lgdash.backfill import Backfill, Checkpoint, normalize_season, season_path
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fake_api():
+    clock = {"now": NOW}
+    api = FakeFootballData(
+        leagues=["PL", "SA"], teams=4, rate_limit=0, clock=lambda: clock["now"]
+    )
+    server = FakeServer(api).start()
+    yield api, server, clock
+    server.stop()
+
+
+def _read(path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_normalize_season_writes_whole_file(tmp_path):
+    match = {
+        "id": 1,
+        "homeTeam": {"id": 10, "shortName": "Arsenal", "tla": "ARS"},
+        "awayTeam": {"id": 11, "shortName": "Chelsea", "tla": "CHE"},
+        "score": {"fullTime": {"home": 2, "away": 1}},
+        "status": "FINISHED",
+        "minute": None,
+        "injuryTime": None,
+        "matchday": 1,
+        "stage": "REGULAR_SEASON",
+        "utcDate": "2023-08-12T14:00:00Z",
+    }
+    content = json.dumps({"matches": [match]}).encode()
+    path = season_path(str(tmp_path), "PL", 2023, "ndjson")
+    assert normalize_season(content, "PL", 2023, path, "ndjson") == (1, True)
+    (row,) = _read(path)
+    assert row["home_team"] == "Arsenal" and row["season"] == 2023
+    assert [p.name for p in (tmp_path / "PL").iterdir()] == ["2023.ndjson.gz"]
+
+
+def test_season_without_fixtures_is_not_complete(tmp_path):
+    content = json.dumps({"matches": []}).encode()
+    for fmt in ("ndjson", "parquet"):
+        path = season_path(str(tmp_path), "PL", 2025, fmt)
+        assert normalize_season(content, "PL", 2025, path, fmt) == (0, False)
+        assert not os.path.exists(path)
+
+
+def test_backfill_stores_seasons_and_resumes(fake_api, tmp_path, monkeypatch):
+    api, server, clock = fake_api
+    # every synthetic match played
+    clock["now"] = NOW + timedelta(days=365)
+    client = FootballDataClient("token", base_url=server.base_url)
+    job = Backfill(client, str(tmp_path), per_minute=6000, workers=2)
+    results = job.run(["PL", "SA"], [2022, 2023])
+
+    assert len(results) == 4 and not any(r.error for r in results)
+    assert all(r.complete and r.matches == 12 for r in results)
+    rows = _read(tmp_path / "SA" / "2023.ndjson.gz")
+    assert {row["league"] for row in rows} == {"SA"}
+    assert "PL/2022" in Checkpoint(str(tmp_path)).done
+
+    def fail(*args):
+        raise AssertionError("stored seasons are not fetched again")
+
+    monkeypatch.setattr(client, "get_season_matches_raw", fail)
+    resumed = Backfill(client, str(tmp_path), per_minute=6000).run(["PL"], [2022])
+    assert resumed[0].skipped and resumed[0].matches == 12
+
+
+def test_unfinished_seasons_and_errors_are_not_checkpointed(fake_api, tmp_path):
+    api, server, clock = fake_api
+    client = FootballDataClient("token", base_url=server.base_url)
+    job = Backfill(client, str(tmp_path), per_minute=6000, workers=1)
+    results = {r.league: r for r in job.run(["PL", "CL"], [2024])}
+
+    assert results["PL"].matches == 12 and not results["PL"].complete
+    assert (tmp_path / "PL" / "2024.ndjson.gz").exists()
+    # the fake only serves PL and SA
+    assert results["CL"].error
+    assert job.checkpoint.done == {}
+
+
+def test_parquet_needs_an_engine(monkeypatch):
+    monkeypatch.setattr(backfill_module, "parquet_available", lambda: False)
+    with pytest.raises(ValueError):
+        Backfill(FootballDataClient("token"), fmt="parquet")
@@ -0,0 +1,93 @@
+import io
+from datetime import datetime, timezone
+
+import pytest
+from rich.cells import cell_len
+from rich.console import Console
+
+from lgdash.board import LiveBoard, frame_key, MATCH_KEY_COLUMNS
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+from lgdash.leagues import SUPPORTED_LEAGUES
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+LEAGUES = list(SUPPORTED_LEAGUES)
+
+
+@pytest.fixture(scope="module")
+def live_frames():
+    """
+    Every league mid-matchday, from the fake API.
+    """
+    api = FakeFootballData(teams=8, rate_limit=0, clock=lambda: NOW)
+    server = FakeServer(api).start()
+    try:
+        client = FootballDataClient("token", base_url=server.base_url)
+        frames = {}
+        for code in LEAGUES:
+            matchday = api.seasons[code].current_matchday
+            frames[code], _ = client.get_matches(code, matchday=matchday)
+        standings = client.get_standings("PL")
+    finally:
+        server.stop()
+    return frames, standings
+
+
+def _board(live_frames, width=180):
+    frames, (standings_df, metadata) = live_frames
+    console = Console(file=io.StringIO(), width=width)
+    board = LiveBoard(LEAGUES, "PL", console=console)
+    for code, df in frames.items():
+        board.update_matches(code, df)
+    board.update_standings(standings_df, metadata)
+    return board
+
+
+def test_frame_key_ignores_hidden_columns(live_frames):
+    df = live_frames[0]["PL"]
+    assert frame_key(df, MATCH_KEY_COLUMNS) == frame_key(df.copy(), MATCH_KEY_COLUMNS)
+    changed = df.assign(id=df["id"] + 1)
+    assert frame_key(changed, MATCH_KEY_COLUMNS) == frame_key(df, MATCH_KEY_COLUMNS)
+    changed = df.assign(home_score=df["home_score"].fillna(0) + 1)
+    assert frame_key(changed, MATCH_KEY_COLUMNS) != frame_key(df, MATCH_KEY_COLUMNS)
+
+
+def test_only_changed_panes_are_drawn(live_frames):
+    frames, _ = live_frames
+    board = _board(live_frames)
+    assert board.frame(budget=10) == len(LEAGUES) + 1
+    assert board.frame(budget=10) == 0 and not board.dirty
+
+    for code, df in frames.items():
+        assert not board.update_matches(code, df.copy())
+    assert board.frame(budget=10) == 0
+    assert board.stats.unchanged == len(LEAGUES)
+
+    df = frames["SA"]
+    assert board.update_matches("SA", df.assign(away_score=df["away_score"] + 1))
+    assert board.frame(budget=10) == 1
+    assert board.stats.drawn == len(LEAGUES) + 2
+
+
+def test_frame_budget_defers_and_puts_live_panes_first(live_frames):
+    board = _board(live_frames)
+    assert all(board.panes[code].live for code in LEAGUES)
+    assert not board.panes["standings"].live
+
+    drawn = [board.frame(budget=0) for _ in range(len(LEAGUES) + 2)]
+    assert drawn == [1] * (len(LEAGUES) + 1) + [0]
+    # the standings pane waited for every live one
+    assert board.stats.deferred == len(LEAGUES)
+
+
+def test_board_tiles_panes_and_redraws_on_resize(live_frames):
+    board = _board(live_frames, width=120)
+    board.frame(budget=10)
+    board.console.print(board)
+    output = board.console.file.getvalue()
+    assert "Serie A" in output and "Standings" in output
+    assert max(cell_len(line) for line in output.splitlines()) <= 120
+
+    board.console.width = 100
+    assert board.dirty
+    assert board.frame(budget=10) == len(LEAGUES) + 1
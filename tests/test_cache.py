@@ -0,0 +1,185 @@
+import os
+import stat
+import threading
+import zlib
+from datetime import date, datetime, timezone
+
+import pytest
+
+from lgdash import cache as cache_module
+from lgdash.cache import FileCache, SharedCache, default_cache, utc_date_key
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def fake_api():
+    api = FakeFootballData(leagues=["PL"], teams=4, rate_limit=0, clock=lambda: NOW)
+    paths = []
+    handle = api.handle
+
+    def counting(path, query, token=""):
+        paths.append(path)
+        return handle(path, query, token)
+
+    api.handle = counting
+    server = FakeServer(api).start()
+    yield server, paths
+    server.stop()
+
+
+def test_shared_entries_are_compressed_and_group_writable(tmp_path):
+    cache = SharedCache(str(tmp_path / "shared"))
+    cache.set("teams", {"teams": ["Arsenal"] * 100}, 60)
+    assert cache.get("teams") == {"teams": ["Arsenal"] * 100}
+
+    (path,) = (tmp_path / "shared").iterdir()
+    assert path.name.endswith(".json.z")
+    assert b"Arsenal" in zlib.decompress(path.read_bytes())
+    assert stat.S_IMODE(path.stat().st_mode) == 0o664
+    # a plain cache in the same directory doesn't read compressed entries
+    assert FileCache(str(tmp_path / "shared")).get("teams") is None
+
+
+def test_default_cache_follows_environment(tmp_path, monkeypatch):
+    monkeypatch.delenv(cache_module.SHARED_CACHE_ENV_VAR, raising=False)
+    monkeypatch.delenv(cache_module.FBD_BASE_URL_ENV_VAR, raising=False)
+    assert type(default_cache()) is FileCache
+    monkeypatch.setenv(cache_module.SHARED_CACHE_ENV_VAR, str(tmp_path))
+    assert isinstance(default_cache(), SharedCache)
+
+
+def test_other_apis_get_their_own_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache_module.CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.setenv(cache_module.SHARED_CACHE_ENV_VAR, str(tmp_path / "shared"))
+    monkeypatch.setenv(cache_module.FBD_BASE_URL_ENV_VAR, cache_module.FBD_BASE_URL)
+    assert cache_module.default_cache_dir() == str(tmp_path)
+    assert default_cache().directory == str(tmp_path / "shared")
+
+    monkeypatch.setenv(cache_module.FBD_BASE_URL_ENV_VAR, "http://127.0.0.1:8080")
+    fake = cache_module.default_cache_dir()
+    assert os.path.dirname(fake) == str(tmp_path)
+    assert os.path.dirname(default_cache().directory) == str(tmp_path / "shared")
+
+
+def test_client_base_url_picks_the_namespace(tmp_path, monkeypatch):
+    monkeypatch.setenv(cache_module.CACHE_DIR_ENV_VAR, str(tmp_path))
+    monkeypatch.delenv(cache_module.SHARED_CACHE_ENV_VAR, raising=False)
+    monkeypatch.delenv(cache_module.FBD_BASE_URL_ENV_VAR, raising=False)
+    client = FootballDataClient("token", base_url="http://127.0.0.1:8080/")
+    fake = default_cache(client.base_url).directory
+    assert os.path.dirname(fake) == str(tmp_path)
+    assert default_cache(cache_module.FBD_BASE_URL).directory == str(tmp_path)
+
+    # same directory as when the URL comes from the environment
+    monkeypatch.setenv(cache_module.FBD_BASE_URL_ENV_VAR, "http://127.0.0.1:8080")
+    assert default_cache().directory == fake
+
+
+def test_one_fetch_per_entry_across_clients(fake_api, tmp_path):
+    server, paths = fake_api
+    clients = [
+        FootballDataClient(
+            "token", cache=SharedCache(str(tmp_path)), base_url=server.base_url
+        )
+        for _ in range(8)
+    ]
+    barrier = threading.Barrier(len(clients))
+
+    def run(client):
+        barrier.wait()
+        client.get_teams("PL", ttl=60)
+        client._fetch_utc_dates("PL", [date(2024, 12, 21), date(2024, 12, 22)])
+
+    threads = [threading.Thread(target=run, args=(c,)) for c in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(paths) == [
+        "/v4/competitions/PL/matches",
+        "/v4/competitions/PL/teams",
+    ]
+    entry = SharedCache(str(tmp_path)).get(utc_date_key("PL", date(2024, 12, 22)))
+    assert entry is not None
+
+
+def test_overlapping_runs_fetch_each_date_once(fake_api, tmp_path):
+    server, _ = fake_api
+    requested = []
+    runs = [
+        [date(2024, 12, 21), date(2024, 12, 22)],
+        [date(2024, 12, 22), date(2024, 12, 23)],
+    ] * 4
+    clients = []
+    for _ in runs:
+        client = FootballDataClient(
+            "token", cache=SharedCache(str(tmp_path)), base_url=server.base_url
+        )
+        client.add_response_hook(
+            lambda endpoint, params, data: requested.append(
+                (params["dateFrom"], params["dateTo"])
+            )
+        )
+        clients.append(client)
+    barrier = threading.Barrier(len(clients))
+
+    def run(client, days):
+        barrier.wait()
+        by_date, _ = client._fetch_utc_dates("PL", days)
+        assert set(by_date) == set(days)
+
+    threads = [threading.Thread(target=run, args=pair) for pair in zip(clients, runs)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    fetched = [
+        date.fromordinal(day)
+        for start, end in requested
+        for day in range(
+            date.fromisoformat(start).toordinal(),
+            date.fromisoformat(end).toordinal() + 1,
+        )
+    ]
+    assert sorted(fetched) == [date(2024, 12, d) for d in (21, 22, 23)]
+
+
+def test_lock_gives_up_after_timeout(tmp_path):
+    if cache_module.fcntl is None:
+        pytest.skip("no file locks on this platform")
+    holder = SharedCache(str(tmp_path))
+    waiter = SharedCache(str(tmp_path), lock_timeout=0.1)
+    with holder.lock("teams"):
+        with waiter.lock("teams"):
+            pass
+    assert os.path.exists(holder._path("teams") + ".lock")
+
+
+def test_lock_file_is_group_writable_despite_umask(tmp_path):
+    if cache_module.fcntl is None:
+        pytest.skip("no file locks on this platform")
+    cache = SharedCache(str(tmp_path))
+    umask = os.umask(0o022)
+    try:
+        with cache.lock("teams"):
+            pass
+    finally:
+        os.umask(umask)
+    mode = os.stat(cache._path("teams") + ".lock").st_mode
+    assert stat.S_IMODE(mode) == 0o664
+
+
+def test_unopenable_lock_file_means_no_lock(tmp_path, monkeypatch):
+    cache = SharedCache(str(tmp_path))
+
+    def refuse(*args, **kwargs):
+        raise PermissionError("not yours")
+
+    monkeypatch.setattr(cache_module.os, "open", refuse)
+    with cache.lock("teams"):
+        pass
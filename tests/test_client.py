@@ -0,0 +1,212 @@
+import pytest
+
+from lgdash import client as client_module
+from lgdash.cache import FileCache
+from lgdash.client import FootballDataClient
+from lgdash.metrics import MetricsRegistry
+
+
+def _scorer(name, team, goals, assists=None):
+    return {
+        "player": {"name": name},
+        "team": {"shortName": team, "tla": team[:3].upper()},
+        "playedMatches": 17,
+        "goals": goals,
+        "assists": assists,
+        "penalties": None,
+    }
+
+
+SCORERS = {
+    "PL": [_scorer("Salah", "Liverpool", 15, 11), _scorer("Haaland", "Man City", 13)],
+    "SA": [_scorer("Retegui", "Atalanta", 14, 3)],
+    "CL": [_scorer("Guirassy", "Dortmund", 10, 1)],
+}
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"{}"
+    headers = {"X-Requests-Available-Minute": "9"}
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def requests_log(monkeypatch):
+    log = []
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        log.append((url, dict(params or {})))
+        league = url.split("/competitions/")[1].split("/")[0]
+        scorers = SCORERS[league][: params["limit"]]
+        data = {"season": {"stages": ["LEAGUE_STAGE", "PLAYOFFS"]}, "scorers": scorers}
+        return FakeResponse(data)
+
+    monkeypatch.setattr(client_module.requests, "get", fake_get)
+    return log
+
+
+def test_get_scorers_builds_frame(requests_log):
+    df, metadata = FootballDataClient("").get_scorers("PL", limit=1)
+    assert df["name"].tolist() == ["Salah"]
+    assert df["goals"].dtype == "Int64"
+    assert "scorers" not in metadata
+    # limit is rounded up to a full page
+    assert requests_log[0][1] == {"limit": 20}
+
+
+def test_get_scorers_missing_counts_are_zero(requests_log):
+    df, _ = FootballDataClient("").get_scorers("PL", limit=5)
+    assert df["assists"].tolist() == [11, 0]
+    assert df["penalties"].tolist() == [0, 0]
+
+
+def test_get_scorers_multi_stage_season(requests_log):
+    df, metadata = FootballDataClient("").get_scorers("CL")
+    assert len(metadata["season"]["stages"]) == 2
+    assert df["name"].tolist() == ["Guirassy"]
+
+
+def test_get_scorers_unsupported_league():
+    with pytest.raises(ValueError):
+        FootballDataClient("").get_scorers("XX")
+
+
+def test_get_scorers_cached(requests_log, tmp_path):
+    client = FootballDataClient("", cache=FileCache(str(tmp_path)))
+    client.get_scorers("PL", limit=10, ttl=60)
+    df, _ = client.get_scorers("PL", limit=1, ttl=60)
+    assert df["name"].tolist() == ["Salah"]
+    assert len(requests_log) == 1
+
+
+def test_get_scorers_for_leagues(requests_log):
+    df, metadata = FootballDataClient("").get_scorers_for_leagues(
+        ["PL", "SA", "CL"], limit=3
+    )
+    assert df["name"].tolist() == ["Salah", "Retegui", "Haaland"]
+    assert df["league"].tolist() == ["PL", "SA", "PL"]
+    assert set(metadata) == {"PL", "SA", "CL"}
+    assert len(requests_log) == 3
+
+
+def test_requests_recorded_in_metrics(requests_log, tmp_path):
+    registry = MetricsRegistry()
+    client = FootballDataClient("", cache=FileCache(str(tmp_path)), metrics=registry)
+    client.get_scorers("PL", ttl=60)
+    client.get_scorers("PL", ttl=60)
+
+    summary = registry.summary()
+    assert summary[0]["endpoint"] == "/v4/competitions/PL/scorers"
+    assert summary[0]["requests"] == 1
+    assert summary[0]["bytes"] == 2
+    assert registry.cache_hit_rate() == 0.5
+    gauges = registry.snapshot()["gauges"]
+    assert gauges == [{"name": "lgdash_quota_remaining", "labels": {}, "value": 9.0}]
+
+
+def _utc_match(match_id, utc_date, status="FINISHED"):
+    return {"id": match_id, "utcDate": utc_date, "status": status}
+
+
+@pytest.fixture
+def chicago_client(tmp_path, monkeypatch):
+    from zoneinfo import ZoneInfo
+
+    client = FootballDataClient("", cache=FileCache(str(tmp_path)))
+    client._timezone = ZoneInfo("America/Chicago")
+    matches = [
+        _utc_match(1, "2024-12-20T23:30:00Z"),
+        # 19:00 on the 21st in Chicago, the 22nd in UTC
+        _utc_match(2, "2024-12-22T01:00:00Z"),
+        _utc_match(3, "2024-12-22T15:00:00Z"),
+        _utc_match(4, "2024-12-23T20:00:00Z"),
+    ]
+    calls = []
+
+    def fake_request(endpoint, params=None, ttl=None):
+        calls.append(params)
+        matching = [
+            m
+            for m in matches
+            if params["dateFrom"] <= m["utcDate"][:10] <= params["dateTo"]
+        ]
+        return {"filters": {"season": "2024"}, "matches": matching}
+
+    monkeypatch.setattr(client, "make_request", fake_request)
+    monkeypatch.setattr(client, "_build_matches_df", lambda matches: matches)
+    return client, calls
+
+
+def test_local_day_covers_utc_window(chicago_client):
+    client, calls = chicago_client
+    utc_dates = client._local_days_to_utc_dates("2024-12-21", "2024-12-21")
+    assert [d.isoformat() for d in utc_dates] == ["2024-12-21", "2024-12-22"]
+
+    matches, metadata = client.get_local_matches("PL", "2024-12-21", "2024-12-21")
+    # the late kickoff is in, the next UTC morning and the previous
+    # local evening are not
+    assert [m["id"] for m in matches] == [2]
+    assert calls == [{"dateFrom": "2024-12-21", "dateTo": "2024-12-22"}]
+    assert metadata["filters"]["season"] == "2024"
+
+
+def test_adjacent_days_reuse_cached_utc_dates(chicago_client):
+    client, calls = chicago_client
+    client.get_local_matches("PL", "2024-12-21", "2024-12-21")
+    matches, _ = client.get_local_matches("PL", "2024-12-21", "2024-12-23")
+    assert [m["id"] for m in matches] == [2, 3, 4]
+    # only the UTC dates not seen yet are requested
+    assert calls[1] == {"dateFrom": "2024-12-23", "dateTo": "2024-12-24"}
+
+    # yesterday's results come entirely from the cache
+    matches, _ = client.get_local_matches("PL", "2024-12-22", "2024-12-22")
+    assert [m["id"] for m in matches] == [3]
+    assert len(calls) == 2
+
+
+def test_utc_date_ttl():
+    from datetime import date, datetime, timezone
+
+    from lgdash import config
+    from lgdash.client import _utc_date_ttl
+
+    now = datetime(2024, 12, 21, 14, 0, tzinfo=timezone.utc)
+    today = date(2024, 12, 21)
+    finished = [_utc_match(1, "2024-12-20T15:00:00Z")]
+    assert _utc_date_ttl(date(2024, 12, 20), finished, now) == (
+        config.FINISHED_MATCHES_TTL
+    )
+    live = [_utc_match(1, "2024-12-21T13:30:00Z", "IN_PLAY")]
+    assert _utc_date_ttl(today, live, now) == config.LIVE_MATCHES_TTL
+    # expires at kickoff
+    soon = [_utc_match(1, "2024-12-21T14:05:00Z", "TIMED")]
+    assert _utc_date_ttl(today, soon, now) == 300
+    later = [_utc_match(1, "2024-12-22T15:00:00Z", "TIMED")]
+    assert _utc_date_ttl(date(2024, 12, 22), later, now) == (
+        config.UPCOMING_MATCHES_TTL
+    )
+
+
+def test_request_pacer_spaces_requests(monkeypatch):
+    from lgdash.client import RequestPacer
+
+    sleeps = []
+    monkeypatch.setattr(client_module.time, "sleep", sleeps.append)
+    pacer = RequestPacer(per_minute=60)
+    pacer.wait()
+    pacer.wait()
+    assert pacer.requests == 2
+    assert len(sleeps) == 1
+    assert 0.9 < sleeps[0] <= 1.0
+
+    with pytest.raises(ValueError):
+        RequestPacer(per_minute=0)
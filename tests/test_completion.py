@@ -0,0 +1,145 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from click.shell_completion import ShellComplete
+
+from lgdash import completion
+from lgdash.completion import load_index, match_teams, update_index
+
+TEAMS = [
+    {"team": "Arsenal", "tla": "ARS"},
+    {"team": "Man City", "tla": "MCI"},
+    {"team": "Man United", "tla": "MUN"},
+    {"team": "Nottingham", "tla": "NOT"},
+]
+
+
+@pytest.fixture
+def index_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("LGDASH_CACHE_DIR", str(tmp_path))
+    update_index("PL", TEAMS)
+    update_index("PD", [{"team": "Barça", "tla": "FCB"}])
+    return tmp_path
+
+
+def _complete(args, incomplete):
+    from lgdash.cli import cli
+
+    comp = ShellComplete(cli, {}, "lgdash", "_LGDASH_COMPLETE")
+    return [item.value for item in comp.get_completions(args, incomplete)]
+
+
+def test_update_index(index_dir):
+    index = load_index()
+    assert index["leagues"]["PL"][0] == ["Arsenal", "ARS"]
+    assert set(index["leagues"]) == {"PL", "PD"}
+    update_index("PL", TEAMS[:1])
+    assert load_index()["leagues"]["PL"] == [["Arsenal", "ARS"]]
+
+
+def test_match_teams():
+    teams = [[team["team"], team["tla"]] for team in TEAMS]
+    assert [t for t, _ in match_teams(teams, "man")] == ["Man City", "Man United"]
+    # a later word or the code match too
+    assert [t for t, _ in match_teams(teams, "uni")] == ["Man United"]
+    assert [t for t, _ in match_teams(teams, "mc")] == ["Man City"]
+
+
+def test_complete_team_uses_league(index_dir, monkeypatch):
+    monkeypatch.setattr(completion, "refresh_in_background", lambda **kw: False)
+    assert _complete(["schedule", "--team"], "ar") == ["Arsenal"]
+    assert _complete(["schedule", "-l", "PD", "-t"], "b") == ["Barça"]
+    assert _complete(["h2h", "Arsenal"], "no") == ["Nottingham"]
+
+
+def test_complete_team_refreshes_missing_league(index_dir, monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        completion, "refresh_in_background", lambda **kw: started.append(kw)
+    )
+    assert _complete(["form", "-l", "SA", "--team"], "") == []
+    assert started == [{"league": "SA"}]
+
+
+def test_complete_team_refreshes_stale_league(index_dir, monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        completion, "refresh_in_background", lambda **kw: started.append(kw)
+    )
+    index = load_index()
+    index["updated"]["PD"] -= completion.TEAMS_TTL + 1
+    (index_dir / completion.INDEX_FILE).write_text(json.dumps(index))
+    # a fresh PL doesn't hide that PD is stale
+    assert _complete(["schedule", "--team"], "ar") == ["Arsenal"]
+    assert _complete(["schedule", "-l", "PD", "-t"], "b") == ["Barça"]
+    assert started == [{"league": "PD"}]
+
+
+def test_old_index_with_one_update_time(index_dir):
+    index = load_index()
+    index["updated"] = 1000.0
+    (index_dir / completion.INDEX_FILE).write_text(json.dumps(index))
+    assert load_index()["updated"] == {"PL": 1000.0, "PD": 1000.0}
+
+
+def test_refresh_without_token_keeps_marker(index_dir, monkeypatch):
+    monkeypatch.delenv("FOOTBALLDATA_API_TOKEN", raising=False)
+    marker = index_dir / completion.REFRESH_MARKER
+    marker.touch()
+    subprocess.run(
+        [sys.executable, "-m", "lgdash.completion", str(index_dir)],
+        env=dict(os.environ),
+        check=True,
+    )
+    assert marker.exists()
+    assert not completion.refresh_in_background(str(index_dir))
+
+
+def test_refresh_indexes_requested_league(tmp_path, monkeypatch):
+    from lgdash.fake_api import FakeFootballData, FakeServer
+
+    server = FakeServer(FakeFootballData(teams=4, rate_limit=0)).start()
+    monkeypatch.setenv("LGDASH_API_URL", server.base_url)
+    monkeypatch.setenv("FOOTBALLDATA_API_TOKEN", "token")
+    try:
+        assert completion.refresh(str(tmp_path), ["XX"])
+    finally:
+        server.stop()
+    leagues = load_index(str(tmp_path))["leagues"]
+    assert len(leagues["PL"]) == 4
+    # unknown, so an empty entry rather than a refresh on every key press
+    assert leagues["XX"] == []
+
+
+def test_complete_league():
+    assert _complete(["standings", "--league"], "b") == ["BL1"]
+
+
+def test_completion_skips_heavy_imports(index_dir):
+    script = (
+        "import sys\n"
+        "from lgdash.cli import cli\n"
+        "try:\n"
+        "    cli(prog_name='lgdash')\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(sorted(m for m in ('pandas', 'rich', 'requests') if m in sys.modules))\n"
+    )
+    env = dict(
+        os.environ,
+        _LGDASH_COMPLETE="bash_complete",
+        COMP_WORDS="lgdash schedule --team ar",
+        COMP_CWORD="3",
+    )
+    env.pop("FOOTBALLDATA_API_TOKEN", None)
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.splitlines() == ["plain,Arsenal", "[]"]
@@ -0,0 +1,122 @@
+import copy
+import pickle
+from pathlib import Path
+
+from lgdash.events import (
+    MatchEventEngine,
+    GoalEvent,
+    ScoreCorrectionEvent,
+    StatusChangeEvent,
+    MinuteUpdateEvent,
+)
+from lgdash.recording import read_recording
+
+DATA_DIR = Path(__file__).parent / "data"
+
+# kickoff, in progress and full time polls of 2024-12-21
+TIME_ORDER, IN_PROGRESS, ARSENAL = (
+    frame["data"]["matches"]
+    for frame in read_recording(str(DATA_DIR / "matchday_20251221.jsonl.gz"))
+)
+
+
+def _load_matches(name: str):
+    with open(DATA_DIR / name, "rb") as f:
+        return pickle.load(f)["matches"]
+
+
+def test_first_snapshot_only_seeds_state():
+    engine = MatchEventEngine()
+    events = engine.update(TIME_ORDER)
+    assert events == []
+    assert len(engine.recent) == 0
+
+
+def test_kickoff_and_goals_between_snapshots():
+    engine = MatchEventEngine()
+    engine.update(TIME_ORDER)
+    events = engine.update(IN_PROGRESS)
+
+    kickoffs = [e for e in events if isinstance(e, StatusChangeEvent)]
+    assert {(e.home_team, e.away_team) for e in kickoffs} == {
+        ("BRE", "NOT"),
+        ("IPS", "NEW"),
+        ("WHU", "BHA"),
+    }
+    assert all(e.is_kickoff for e in kickoffs)
+
+    goals = [e for e in events if isinstance(e, GoalEvent)]
+    # 0-2, 0-4 and 0-1 from nil-nil
+    assert len(goals) == 7
+    assert {e.scoring_team for e in goals} == {"NOT", "NEW", "BHA"}
+
+    # unchanged finished match produces nothing
+    assert all(e.home_team != "AVL" for e in events)
+
+
+def test_full_time_events():
+    engine = MatchEventEngine()
+    engine.update(IN_PROGRESS)
+    events = engine.update(ARSENAL)
+
+    full_time = [
+        e for e in events if isinstance(e, StatusChangeEvent) and e.is_full_time
+    ]
+    assert len(full_time) == 3
+    goals = [e for e in events if isinstance(e, GoalEvent)]
+    # WHU equaliser plus CRY 1-5 ARS from kickoff
+    assert [e.scoreline for e in goals if e.home_team == "WHU"] == ["WHU 1-1 BHA"]
+    assert len([e for e in goals if e.home_team == "CRY"]) == 6
+
+
+def test_unchanged_last_updated_is_skipped():
+    engine = MatchEventEngine()
+    matches = _load_matches("live_matches_midway_20251215.pkl")
+    engine.update(matches)
+    stale = copy.deepcopy(matches)
+    # payload changed but the stamp did not, so the match is not diffed
+    stale[2]["score"]["fullTime"]["home"] = 9
+    assert engine.update(stale) == []
+
+
+def test_payload_without_stamp_is_diffed():
+    engine = MatchEventEngine()
+    matches = copy.deepcopy(_load_matches("live_matches_midway_20251215.pkl"))
+    for match in matches:
+        match.pop("lastUpdated", None)
+    engine.update(matches)
+    scored = copy.deepcopy(matches)
+    scored[2]["score"]["fullTime"]["home"] += 1
+    events = engine.update(scored)
+    assert [type(e) for e in events] == [GoalEvent]
+
+
+def test_score_correction_and_minute_update():
+    engine = MatchEventEngine()
+    matches = _load_matches("live_matches_midway_20251215.pkl")
+    engine.update(matches)
+    changed = copy.deepcopy(matches)
+    changed[3]["score"]["fullTime"]["away"] = 3
+    changed[3]["minute"] = 46
+    changed[3]["lastUpdated"] = "2024-12-15T20:49:00Z"
+    events = engine.update(changed)
+    assert [type(e) for e in events] == [ScoreCorrectionEvent, MinuteUpdateEvent]
+    assert events[0].previous_away_score == 4
+
+
+def test_subscribers_and_bounded_buffer():
+    engine = MatchEventEngine(buffer_size=3)
+    goals, everything = [], []
+    engine.subscribe(goals.append, GoalEvent)
+    engine.subscribe(everything.append)
+    engine.update(TIME_ORDER)
+    events = engine.update(IN_PROGRESS)
+
+    assert everything == events
+    assert goals == [e for e in events if isinstance(e, GoalEvent)]
+    assert len(engine.recent) == 3
+    assert list(engine.recent) == events[-3:]
+
+    engine.unsubscribe(everything.append)
+    assert len(engine._listeners) == 1
+    assert engine._listeners[0][0] is GoalEvent
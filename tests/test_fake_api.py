@@ -0,0 +1,127 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from lgdash.client import FootballDataClient, FootballDataClientError
+from lgdash.fake_api import (
+    FakeFootballData,
+    FakeServer,
+    RateLimiter,
+    SyntheticSeason,
+    round_robin,
+)
+from lgdash.metrics import MetricsRegistry
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+
+
+def test_round_robin_every_pair_home_and_away():
+    matchdays = round_robin(5)
+    assert len(matchdays) == 10
+    fixtures = [pair for pairs in matchdays for pair in pairs]
+    assert len(fixtures) == len(set(fixtures)) == 20
+    for pairs in matchdays:
+        teams = [team for pair in pairs for team in pair]
+        assert len(teams) == len(set(teams))
+
+
+def test_match_progresses_with_the_clock():
+    season = SyntheticSeason("PL", teams=6, seed=1, anchor=NOW, current_matchday=3)
+    fixture = season.fixtures[6]
+    assert fixture["matchday"] == 3 and fixture["kickoff"] == NOW
+
+    def at(minutes):
+        return season.match(fixture, NOW + timedelta(minutes=minutes))
+
+    assert at(-5)["status"] == "TIMED"
+    assert at(-5)["score"]["fullTime"] == {"home": None, "away": None}
+    assert (at(30)["status"], at(30)["minute"]) == ("IN_PLAY", 31)
+    assert (at(47)["minute"], at(47)["injuryTime"]) == (45, 3)
+    assert at(50)["status"] == "PAUSED"
+    assert (at(70)["status"], at(70)["minute"]) == ("IN_PLAY", 53)
+    finished = at(200)
+    assert finished["status"] == "FINISHED"
+    assert finished["score"]["fullTime"] == {
+        "home": len(fixture["home_goals"]),
+        "away": len(fixture["away_goals"]),
+    }
+    assert at(30)["lastUpdated"] != at(31)["lastUpdated"]
+
+
+def test_seasons_are_reproducible():
+    a = SyntheticSeason("SA", teams=8, seed=7, anchor=NOW)
+    b = SyntheticSeason("SA", teams=8, seed=7, anchor=NOW)
+    assert a.fixtures == b.fixtures
+    assert len({team["tla"] for team in a.teams}) == 8
+
+
+def test_rate_limiter_windows():
+    now = [0.0]
+    limiter = RateLimiter(2, clock=lambda: now[0])
+    assert limiter.take("a") == (True, 1, 60)
+    assert limiter.take("a")[0]
+    assert limiter.take("a") == (False, 0, 60)
+    assert limiter.take("b")[0]
+    now[0] = 61.0
+    assert limiter.take("a") == (True, 1, 60)
+
+
+def test_handle_routes_and_errors():
+    api = FakeFootballData(leagues=["PL"], teams=4, rate_limit=0, clock=lambda: NOW)
+    status, _, body = api.handle("//v4/competitions/PL/matches", {"matchday": "1"})
+    assert status == 200
+    assert body["resultSet"]["count"] == 2
+    assert body["filters"] == {"season": "2024", "matchday": "1"}
+    status, _, body = api.handle("/v4/matches", {})
+    assert status == 200 and body["filters"]["dateFrom"] == "2024-12-21"
+    assert api.handle("/v4/competitions/XX/teams", {})[0] == 404
+    assert (
+        api.handle("/v4/competitions/PL/matches", {"dateFrom": "2024-12-21"})[0] == 400
+    )
+
+
+@pytest.fixture
+def fake_server():
+    servers = []
+
+    def start(**options):
+        api = FakeFootballData(leagues=["PL"], teams=20, clock=lambda: NOW, **options)
+        server = FakeServer(api).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.stop()
+
+
+def test_client_against_fake_server(fake_server):
+    server = fake_server(rate_limit=0)
+    client = FootballDataClient("token", base_url=server.base_url + "/")
+    client._timezone = timezone.utc
+
+    season, metadata = client.get_matches("PL")
+    assert len(season) == 380
+    assert metadata["resultSet"]["played"] > 0
+    assert set(season["status"]) == {"FINISHED", "IN_PLAY", "TIMED"}
+
+    standings, _ = client.get_standings("PL")
+    assert standings["position"].tolist() == list(range(1, 21))
+    assert standings["played"].sum() == 2 * (season["status"] == "FINISHED").sum()
+
+    teams, _ = client.get_teams("PL")
+    assert len(teams) == 20
+
+
+def test_rate_limit_and_faults_reach_the_client(fake_server, monkeypatch):
+    monkeypatch.setenv("LGDASH_API_URL", fake_server(rate_limit=1).base_url)
+    registry = MetricsRegistry()
+    client = FootballDataClient("token", metrics=registry)
+    client.get_teams("PL")
+    with pytest.raises(FootballDataClientError):
+        client.get_teams("PL")
+    assert registry.summary()[0]["rate_limited"] == 1
+
+    client = FootballDataClient("token", base_url=fake_server(error_rate=1).base_url)
+    with pytest.raises(FootballDataClientError):
+        client.get_teams("PL")
@@ -0,0 +1,140 @@
+import pytest
+
+from lgdash import footystats
+from lgdash.client import SCORERS_COLUMNS, FootballDataClient
+from lgdash.footystats import FootyStatsClient, FootyStatsClientError
+
+LEAGUES = {
+    "data": [
+        {
+            "name": "Premier League",
+            "country": "England",
+            "season": [{"id": 9660, "year": 20232024}, {"id": 12325, "year": 20242025}],
+        }
+    ]
+}
+TABLE = {
+    "data": {
+        "league_table": [
+            {
+                "id": 59,
+                "cleanName": "Liverpool",
+                "position": 1,
+                "points": 39,
+                "matchesPlayed": 16,
+                "seasonWins_overall": 12,
+                "seasonDraws_overall": 3,
+                "seasonLosses_overall": 1,
+                "seasonGoals": 37,
+                "seasonConceded": 14,
+                "seasonGoalDifference": 23,
+            },
+            {
+                "id": 93,
+                "cleanName": "Manchester City",
+                "position": 2,
+                "points": 27,
+                "matchesPlayed": 16,
+                "seasonWins_overall": 8,
+                "seasonDraws_overall": 3,
+                "seasonLosses_overall": 5,
+                "seasonGoals": 29,
+                "seasonConceded": 23,
+                "seasonGoalDifference": 6,
+            },
+        ]
+    }
+}
+PLAYERS = {
+    1: {
+        "data": [
+            {"known_as": "Haaland", "club_team_id": 93, "goals_overall": 13},
+            {"known_as": "Alisson", "club_team_id": 59, "goals_overall": 0},
+        ],
+        "pager": {"current_page": 1, "max_page": 2},
+    },
+    2: {
+        "data": [
+            {
+                "known_as": "Salah",
+                "club_team_id": 59,
+                "goals_overall": 15,
+                "assists_overall": 11,
+            }
+        ],
+        "pager": {"current_page": 2, "max_page": 2},
+    },
+}
+
+
+class FakeResponse:
+    status_code = 200
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def requests_log(monkeypatch):
+    log = []
+
+    def fake_get(url, params=None, timeout=None):
+        endpoint = url.rsplit("/", 1)[1]
+        log.append((endpoint, dict(params)))
+        if endpoint == "league-list":
+            return FakeResponse(LEAGUES)
+        if endpoint == "league-tables":
+            return FakeResponse(TABLE)
+        return FakeResponse(PLAYERS[params["page"]])
+
+    monkeypatch.setattr(footystats.requests, "get", fake_get)
+    return log
+
+
+def test_standings_match_football_data_schema(requests_log):
+    df, metadata = FootyStatsClient("key").get_standings("PL")
+    reference = FootballDataClient("")._build_standings_df([])
+    assert list(df.columns) == list(reference.columns)
+    assert df["team"].tolist() == ["Liverpool", "Manchester City"]
+    assert df["points"].dtype == "Int64"
+    assert metadata["season"]["startDate"][:4] == "2024"
+    # the newest season is used
+    assert requests_log[1] == ("league-tables", {"season_id": 12325, "key": "key"})
+
+
+def test_scorers_across_pages(requests_log):
+    df, _ = FootyStatsClient("key").get_scorers("PL", limit=2)
+    assert list(df.columns) == SCORERS_COLUMNS
+    assert df["name"].tolist() == ["Salah", "Haaland"]
+    assert df["team"].tolist() == ["Liverpool", "Manchester City"]
+    assert df["penalties"].tolist() == [0, 0]
+
+
+def test_league_not_chosen(requests_log):
+    with pytest.raises(FootyStatsClientError):
+        FootyStatsClient("key").get_standings("SA")
+
+
+def _serving(table):
+    def fake_get(url, params=None, timeout=None):
+        if url.endswith("league-list"):
+            return FakeResponse(LEAGUES)
+        return FakeResponse(table)
+
+    return fake_get
+
+
+def test_unexpected_schema_is_a_provider_error(monkeypatch):
+    table = {"data": {"league_table": [{"id": 59, "cleanName": "Liverpool"}]}}
+    monkeypatch.setattr(footystats.requests, "get", _serving(table))
+    with pytest.raises(FootyStatsClientError):
+        FootyStatsClient("key").get_standings("PL")
+    monkeypatch.setattr(footystats.requests, "get", _serving(["not", "a", "dict"]))
+    with pytest.raises(FootyStatsClientError):
+        FootyStatsClient("key").get_scorers("PL")
@@ -1,4 +1,12 @@
-from lgdash.leagues import SUPPORTED_LEAGUES
+from lgdash.cache import FileCache
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+from lgdash.leagues import (
+    COMPETITIONS,
+    COMPETITIONS_CACHE_KEY,
+    SUPPORTED_LEAGUES,
+    CompetitionRegistry,
+)
 
 
 # tests consistency of dictionary keys, more like data validation
@@ -8,3 +16,57 @@ def test_supported_leagues():
         all(k in league for k in required_keys) for league in SUPPORTED_LEAGUES.values()
     )
     assert has_required_keys
+
+
+def test_registry_loads_lazily():
+    loads = []
+
+    def load():
+        loads.append(True)
+        return [
+            {"code": "PL", "name": "Premier League"},
+            {"code": "WC", "name": "FIFA World Cup", "area": {"name": "World"}},
+            {"code": "DFB", "name": "DFB-Pokal", "type": "CUP"},
+        ]
+
+    registry = CompetitionRegistry(load)
+    assert "PL" in registry and registry["SA"]["name"] == "Serie A"
+    assert not loads
+
+    assert "WC" in registry and "XX" not in registry
+    assert registry["WC"]["name"] == "World Cup"
+    assert registry["DFB"]["icon"] == "⚽" and registry["DFB"]["type"] == "CUP"
+    assert list(registry)[: len(SUPPORTED_LEAGUES)] == list(SUPPORTED_LEAGUES)
+    assert len(loads) == 1
+
+
+def test_client_caches_competition_list(tmp_path):
+    api = FakeFootballData(leagues=["PL", "SA"], teams=4, rate_limit=0)
+    server = FakeServer(api).start()
+    try:
+        cache = FileCache(str(tmp_path))
+        client = FootballDataClient("token", cache=cache, base_url=server.base_url)
+        assert "XX" not in client.competitions
+        assert [c["code"] for c in cache.get(COMPETITIONS_CACHE_KEY)] == ["PL", "SA"]
+    finally:
+        server.stop()
+
+    # a second process reads the list from disk, the server is gone
+    client = FootballDataClient("token", cache=cache, base_url=server.base_url)
+    assert "XX" not in client.competitions and "SA" in client.competitions
+
+
+def test_unknown_code_without_token(tmp_path, monkeypatch):
+    from click.testing import CliRunner
+
+    from lgdash.cli import cli
+
+    monkeypatch.setenv("LGDASH_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("FOOTBALLDATA_API_TOKEN", raising=False)
+    COMPETITIONS.reload()
+    try:
+        for args in (["-l", "XX"], ["standings", "-l", "XX"]):
+            result = CliRunner().invoke(cli, args)
+            assert result.output == "League code XX is not supported.\n"
+    finally:
+        COMPETITIONS.reload()
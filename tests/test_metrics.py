@@ -0,0 +1,81 @@
+import json
+
+from lgdash import metrics
+from lgdash.metrics import MetricsRegistry
+
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.inc("lgdash_requests_total", endpoint="/a", status=200)
+    registry.inc("lgdash_requests_total", endpoint="/a", status=429)
+    registry.inc("lgdash_requests_total", endpoint="/b", status=503)
+    registry.inc("lgdash_response_bytes_total", 2048, endpoint="/a")
+    registry.inc("lgdash_cache_requests_total", result="hit")
+    registry.inc("lgdash_cache_requests_total", result="miss")
+    registry.inc("lgdash_cache_requests_total", result="hit")
+    for seconds in [0.04, 0.2, 0.3, 3.0]:
+        registry.observe("lgdash_request_seconds", seconds, endpoint="/a")
+    registry.set("lgdash_quota_remaining", 7)
+    return registry
+
+
+def test_summary():
+    summary = {row["endpoint"]: row for row in _registry().summary()}
+    a, b = summary["/a"], summary["/b"]
+    assert (a["requests"], a["rate_limited"], a["errors"]) == (2, 1, 0)
+    assert (b["requests"], b["errors"]) == (1, 1)
+    assert a["bytes"] == 2048
+    assert abs(a["avg_seconds"] - 0.885) < 1e-9
+    assert a["p95_seconds"] == 5.0
+    assert _registry().cache_hit_rate() == 2 / 3
+
+
+def test_prometheus_text():
+    text = _registry().to_prometheus()
+    assert "# TYPE lgdash_requests_total counter" in text
+    assert 'lgdash_requests_total{endpoint="/a",status="429"} 1' in text
+    assert 'lgdash_request_seconds_bucket{endpoint="/a",le="0.05"} 1' in text
+    assert 'lgdash_request_seconds_bucket{endpoint="/a",le="+Inf"} 4' in text
+    assert 'lgdash_request_seconds_count{endpoint="/a"} 4' in text
+    assert "lgdash_quota_remaining 7" in text
+
+
+def test_snapshot_merge_roundtrip():
+    registry = _registry()
+    merged = MetricsRegistry()
+    merged.merge(json.loads(json.dumps(registry.snapshot())))
+    merged.merge(registry.snapshot())
+    summary = {row["endpoint"]: row for row in merged.summary()}
+    assert summary["/a"]["requests"] == 4
+    assert summary["/a"]["bytes"] == 4096
+
+
+def test_flush_and_load(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    for _ in range(2):
+        registry = _registry()
+        registry.flush(path)
+        assert registry.empty
+    # a partial line from a killed run is skipped
+    with open(path, "a") as f:
+        f.write('{"counters": [')
+    loaded = metrics.load(path)
+    assert {row["endpoint"]: row for row in loaded.summary()}["/b"]["errors"] == 2
+
+
+def test_log_is_folded_into_totals(tmp_path, monkeypatch):
+    monkeypatch.setattr(metrics, "METRICS_MAX_BYTES", 2048)
+    path = str(tmp_path / "metrics.jsonl")
+    for _ in range(20):
+        _registry().flush(path)
+    with open(path) as f:
+        assert len(f.readlines()) < 5
+    summary = {row["endpoint"]: row for row in metrics.load(path).summary()}
+    assert summary["/a"]["requests"] == 40
+    assert metrics.load(path).cache_hit_rate() == 2 / 3
+
+
+def test_write_textfile(tmp_path):
+    path = tmp_path / "lgdash.prom"
+    metrics.write_textfile(_registry(), str(path))
+    assert path.read_text().startswith("# HELP lgdash_requests_total")
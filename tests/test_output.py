@@ -0,0 +1,101 @@
+import csv
+import io
+import json
+import pickle
+from pathlib import Path
+
+import pytest
+from tzlocal import get_localzone
+
+from lgdash.client import FootballDataClient, match_row
+from lgdash.output import MATCH_COLUMNS, write_rows
+from lgdash.recording import read_recording
+
+DATA_DIR = Path(__file__).parent / "data"
+
+ROWS = [
+    {"team": "Arsenal", "points": 33, "form": None},
+    {"team": "Chelsea", "points": 31, "form": "WWD"},
+]
+
+
+def _load(name: str):
+    with open(DATA_DIR / name, "rb") as f:
+        return pickle.load(f)
+
+
+def test_json():
+    stream = io.StringIO()
+    assert write_rows(iter(ROWS), "json", stream=stream) == 2
+    assert json.loads(stream.getvalue()) == ROWS
+
+
+def test_json_empty():
+    stream = io.StringIO()
+    write_rows(iter([]), "json", stream=stream)
+    assert json.loads(stream.getvalue()) == []
+
+
+def test_ndjson_with_columns():
+    stream = io.StringIO()
+    write_rows(iter(ROWS), "ndjson", columns=["points", "team"], stream=stream)
+    lines = stream.getvalue().splitlines()
+    assert lines[0] == '{"points": 33, "team": "Arsenal"}'
+    assert len(lines) == 2
+
+
+@pytest.mark.parametrize("fmt,delimiter", [("csv", ","), ("tsv", "\t")])
+def test_delimited(fmt, delimiter):
+    stream = io.StringIO()
+    write_rows(iter(ROWS), fmt, columns=["team", "points"], stream=stream)
+    rows = list(csv.reader(io.StringIO(stream.getvalue()), delimiter=delimiter))
+    assert rows == [["team", "points"], ["Arsenal", "33"], ["Chelsea", "31"]]
+
+
+def test_delimited_empty_writes_header():
+    stream = io.StringIO()
+    write_rows(iter([]), "csv", columns=["team", "points"], stream=stream)
+    assert stream.getvalue() == "team,points\n"
+
+
+def test_rows_are_written_as_produced():
+    stream = io.StringIO()
+    seen = []
+
+    def rows():
+        for row in ROWS:
+            yield row
+            # the previous row is already out when the next is produced
+            seen.append(stream.getvalue().count("\n"))
+
+    write_rows(rows(), "ndjson", stream=stream)
+    assert seen == [1, 2]
+
+
+def test_unknown_format():
+    with pytest.raises(ValueError):
+        write_rows(iter(ROWS), "xml")
+
+
+def test_match_row_matches_frame():
+    *_, full_time = read_recording(str(DATA_DIR / "matchday_20251221.jsonl.gz"))
+    matches = full_time["data"]["matches"]
+    df = FootballDataClient("")._build_matches_df(matches)
+    timezone = get_localzone()
+    for match, (_, frame_row) in zip(matches, df.iterrows()):
+        row = match_row(match, timezone)
+        for col in ["clean_status", "display_minutes", "local_date", "local_time"]:
+            assert row[col] == frame_row[col]
+        assert row["home_score"] == frame_row["home_score"]
+    assert set(MATCH_COLUMNS) <= set(row)
+
+
+def test_iter_matches_streams_rows(monkeypatch):
+    client = FootballDataClient("")
+    data = _load("live_matches_half_20251214.pkl")
+    monkeypatch.setattr(client, "make_request", lambda *args, **kwargs: data)
+    rows = client.iter_matches(league="PL")
+    first = next(rows)
+    assert first["home_team_code"] == "ARS"
+    assert first["clean_status"] == "HT"
+    assert len(list(rows)) == 4
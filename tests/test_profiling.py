@@ -0,0 +1,75 @@
+import pstats
+import time
+
+import pytest
+
+from lgdash import profiling
+
+
+@pytest.fixture(autouse=True)
+def clean_timings():
+    profiling.reset()
+    yield
+    profiling.reset()
+
+
+def test_stage_accumulates():
+    for _ in range(3):
+        with profiling.stage("work"):
+            time.sleep(0.001)
+    seconds, calls = profiling.timings()["work"]
+    assert calls == 3
+    assert seconds >= 0.003
+
+
+def test_nested_stage_counted_once():
+    @profiling.timed("render")
+    def outer():
+        inner()
+
+    @profiling.timed("render")
+    def inner():
+        with profiling.stage("format"):
+            pass
+
+    outer()
+    timings = profiling.timings()
+    assert timings["render"][1] == 1
+    assert timings["format"][1] == 1
+
+
+def test_record_and_order():
+    profiling.record("import", 0.5)
+    with profiling.stage("http"):
+        pass
+    assert list(profiling.timings()) == ["import", "http"]
+    assert profiling.timings()["import"] == (0.5, 1)
+
+
+def test_run_profiler_cprofile(tmp_path):
+    path = str(tmp_path / "run.prof")
+    profiler = profiling.RunProfiler(path)
+    profiler.start()
+    sum(range(1000))
+    profiler.stop()
+    assert pstats.Stats(path).total_calls > 0
+
+
+def test_run_profiler_sampled(tmp_path):
+    path = tmp_path / "run.folded"
+    profiler = profiling.RunProfiler(str(path), mode="sample")
+    profiler._profiler.interval = 0.001
+    profiler.start()
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    profiler.stop()
+    lines = path.read_text().splitlines()
+    assert lines
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert any("test_run_profiler_sampled" in line for line in lines)
+
+
+def test_run_profiler_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        profiling.RunProfiler(str(tmp_path / "x"), mode="perf")
@@ -0,0 +1,104 @@
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+
+from lgdash.cache import FileCache
+from lgdash.cli import cli
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+from lgdash.projections import Projector, season_inputs
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture(scope="module")
+def seasons():
+    api = FakeFootballData(
+        leagues=["PL", "BL1"], teams=20, rate_limit=0, clock=lambda: NOW
+    )
+    server = FakeServer(api).start()
+    client = FootballDataClient("token", base_url=server.base_url)
+    seasons = {league: client.get_matches(league)[0] for league in ("PL", "BL1")}
+    server.stop()
+    return seasons
+
+
+def _finish(matches: pd.DataFrame) -> pd.DataFrame:
+    # every remaining match a 1-0 home win
+    matches = matches.copy()
+    remaining = matches["status"] != "FINISHED"
+    matches.loc[remaining, "home_score"] = 1
+    matches.loc[remaining, "away_score"] = 0
+    matches.loc[remaining, "status"] = "FINISHED"
+    return matches
+
+
+def test_odds_are_sensible(seasons):
+    (odds,) = Projector(simulations=4000, workers=1).run({"PL": seasons["PL"]}).values()
+    assert len(odds) == 20
+    assert odds["title"].sum() == pytest.approx(1)
+    assert odds["top"].sum() == pytest.approx(4)
+    assert odds["relegated"].sum() == pytest.approx(3)
+    assert (odds["projected_points"] >= odds["points"]).all()
+    assert odds["projected_points"].is_monotonic_decreasing
+
+
+def test_same_seed_same_odds_whatever_the_workers(seasons):
+    single = Projector(simulations=12000, seed=5, workers=1).run(seasons)
+    pooled = Projector(simulations=12000, seed=5, workers=2).run(seasons)
+    for league in seasons:
+        pd.testing.assert_frame_equal(single[league], pooled[league])
+
+    other = Projector(simulations=12000, seed=6, workers=1).run(seasons)
+    assert not np.allclose(other["PL"]["title"], single["PL"]["title"])
+
+
+def test_negative_seed_is_rejected():
+    with pytest.raises(ValueError):
+        Projector(seed=-1)
+    result = CliRunner().invoke(cli, ["projections", "--seed", "-1"])
+    assert result.exit_code == 2
+
+
+def test_finished_season_is_certain(seasons):
+    matches = _finish(seasons["BL1"])
+    (odds,) = Projector(simulations=100, workers=1).run({"BL1": matches}).values()
+    assert set(odds["title"]) == {0, 1}
+    assert odds["top"].sum() == 4 and odds["relegated"].sum() == 2
+    assert (odds["projected_points"] == odds["points"]).all()
+
+
+def test_cached_until_a_result_changes(seasons, tmp_path, monkeypatch):
+    cache = FileCache(str(tmp_path))
+    first = Projector(cache, simulations=2000, workers=1).run(seasons)
+
+    simulated = []
+    monkeypatch.setattr(
+        Projector, "_simulate", lambda self, todo: simulated.extend(todo) or {}
+    )
+    again = Projector(cache, simulations=2000, workers=1).run(seasons)
+    assert simulated == []
+    for league in seasons:
+        pd.testing.assert_frame_equal(first[league], again[league])
+
+    monkeypatch.undo()
+    matches = seasons["PL"].copy()
+    played = matches.index[matches["status"] == "FINISHED"][0]
+    matches.loc[played, "home_score"] += 1
+    assert season_inputs(matches, "PL").fingerprint(2000, 0) != season_inputs(
+        seasons["PL"], "PL"
+    ).fingerprint(2000, 0)
+
+
+@pytest.mark.benchmark
+def test_all_leagues_in_a_couple_of_seconds(seasons):
+    projector = Projector(simulations=20000, workers=1)
+    start = time.perf_counter()
+    projector.run(
+        {f"{league}{i}": df for league, df in seasons.items() for i in range(3)}
+    )
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,112 @@
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+from lgdash.cache import FileCache
+from lgdash.client import FootballDataClient
+from lgdash.footystats import FootyStatsClient
+from lgdash.metrics import MetricsRegistry
+from lgdash.providers import DataProvider, ProviderError, ProviderRouter
+
+
+class FakeProvider(DataProvider):
+    leagues = {"PL": None, "SA": None}
+
+    def __init__(self, name, fail=False, delay=0.0):
+        self.name = name
+        self.fail = fail
+        self.delay = delay
+        self.calls = 0
+
+    def get_standings(self, league="PL", ttl=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.fail:
+            raise ProviderError(f"{self.name} is down")
+        return pd.DataFrame({"team": [self.name]}), {"provider": self.name}
+
+    def get_scorers(self, league="PL", limit=10, ttl=None):
+        raise NotImplementedError
+
+
+def _router(*providers, **kwargs):
+    return ProviderRouter(list(providers), metrics=MetricsRegistry(), **kwargs)
+
+
+def test_supports():
+    assert FootballDataClient("").supports("get_matches", "PL")
+    assert not FootyStatsClient("").supports("get_matches")
+    assert FootyStatsClient("").supports("get_standings", "SA")
+    assert not FakeProvider("a").supports("get_standings", "CL")
+
+
+def test_fails_over_then_skips_degraded_primary():
+    primary, secondary = FakeProvider("primary", fail=True), FakeProvider("secondary")
+    router = _router(primary, secondary, threshold=2)
+
+    for _ in range(3):
+        _, metadata = router.get_standings("PL")
+        assert metadata["provider"] == "secondary"
+    # two failures degrade the primary, the third call goes straight past it
+    assert primary.calls == 2
+    assert router.health["primary"].degraded
+    assert router.health["secondary"].latency is not None
+
+
+def test_degraded_provider_is_still_a_last_resort():
+    router = _router(FakeProvider("a", fail=True), threshold=1)
+    with pytest.raises(ProviderError):
+        router.get_standings("PL")
+    with pytest.raises(ProviderError):
+        router.get_standings("PL")
+    assert router.providers[0].calls == 2
+
+
+def test_health_shared_through_cache(tmp_path):
+    cache = FileCache(str(tmp_path))
+    primary = FakeProvider("primary", fail=True)
+    _router(
+        primary, FakeProvider("secondary"), cache=cache, threshold=1
+    ).get_standings()
+
+    # a later run starts with the primary already marked down
+    primary.calls = 0
+    router = _router(primary, FakeProvider("secondary"), cache=cache, threshold=1)
+    assert router.candidates("get_standings", "PL")[0].name == "secondary"
+    router.get_standings()
+    assert primary.calls == 0
+
+
+def test_race_takes_the_first_answer():
+    router = _router(FakeProvider("slow", delay=0.5), FakeProvider("fast"), race=True)
+    started = time.perf_counter()
+    _, metadata = router.get_standings("PL")
+    assert metadata["provider"] == "fast"
+    assert time.perf_counter() - started < 0.4
+    # the loser runs on, but won't hold up interpreter exit
+    losers = [t for t in threading.enumerate() if t.name == "race-slow"]
+    assert losers and all(t.daemon for t in losers)
+
+
+def test_unsupported_league_or_operation():
+    router = _router(FakeProvider("a"))
+    with pytest.raises(ValueError):
+        router.get_standings("CL")
+    with pytest.raises(ValueError):
+        router.get_matches("PL")
+
+
+def test_standings_formats_go_through_the_router(monkeypatch):
+    from click.testing import CliRunner
+
+    from lgdash import cli as cli_module
+
+    router = _router(FakeProvider("primary", fail=True), FakeProvider("secondary"))
+    monkeypatch.setattr(cli_module, "get_provider", lambda: router)
+    result = CliRunner().invoke(
+        cli_module.cli, ["standings", "-l", "PL", "--format", "csv"]
+    )
+    assert result.exit_code == 0
+    assert "secondary" in result.output.splitlines()[1]
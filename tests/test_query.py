@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from lgdash.cache import FileCache
+from lgdash.cli import cli
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import FakeFootballData, FakeServer
+from lgdash.query import MatchQuery, plan_query
+
+NOW = datetime(2024, 12, 21, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def client():
+    api = FakeFootballData(leagues=["PL"], teams=6, rate_limit=0, clock=lambda: NOW)
+    server = FakeServer(api).start()
+    client = FootballDataClient("token", base_url=server.base_url)
+    client._timezone = timezone.utc
+    requests = []
+    client.add_response_hook(
+        lambda endpoint, params, data: requests.append((endpoint, params))
+    )
+    client.requests = requests
+    yield client
+    server.stop()
+
+
+def test_plan_pushes_what_the_api_takes():
+    query = MatchQuery("PL", status=["live"], team="ars", matchday=3, venue="home")
+    plan = plan_query(query, timezone.utc, team_id=57)
+    assert plan.endpoint == "/v4/teams/57/matches"
+    assert plan.params == {
+        "competitions": "PL",
+        "venue": "HOME",
+        "status": "IN_PLAY,PAUSED",
+    }
+    assert list(plan.residual) == ["matchday"]
+
+    plan = plan_query(query, timezone.utc)
+    assert plan.endpoint == "/v4/competitions/PL/matches"
+    assert plan.params == {"matchday": 3, "status": "IN_PLAY,PAUSED"}
+    assert list(plan.residual) == ["team"]
+
+
+def test_invalid_queries():
+    with pytest.raises(ValueError):
+        MatchQuery("PL", venue="home")
+    with pytest.raises(ValueError):
+        MatchQuery("PL", status=["half-time"])
+    assert MatchQuery("PL", date_to="2024-12-21").date_from == "2024-12-21"
+
+
+def test_team_query_uses_team_endpoint(client):
+    df, _ = client.query_matches(MatchQuery("PL", team="BRU", venue="away"))
+    endpoint, params = client.requests[-1]
+    assert endpoint.startswith("/v4/teams/")
+    assert params == {"competitions": "PL", "venue": "AWAY"}
+    assert len(df) == 5
+    assert set(df["away_team_code"]) == {"BRU"}
+
+    df, _ = client.query_matches(MatchQuery("PL", team="brampton united", matchday=2))
+    assert len(df) == 1
+
+
+def test_unknown_league(client):
+    with pytest.raises(ValueError):
+        client.query_matches(MatchQuery("XX"))
+
+
+def test_status_and_dates_are_pushed(client):
+    query = MatchQuery("PL", status=["finished"], date_from="2024-12-01")
+    query.date_to = "2024-12-21"
+    rows = list(client.iter_query_matches(query))
+    assert client.requests[-1][1] == {
+        "status": "FINISHED,AWARDED",
+        "dateFrom": "2024-12-01",
+        "dateTo": "2024-12-21",
+    }
+    assert rows and {row["status"] for row in rows} == {"FINISHED"}
+
+
+def test_cached_dates_are_filtered_locally(client, tmp_path):
+    client.cache = FileCache(str(tmp_path))
+    day = NOW.strftime("%Y-%m-%d")
+    client.get_local_matches("PL", start_date=day, end_date=day)
+    sent = len(client.requests)
+
+    live = list(client.iter_query_matches(MatchQuery("PL", ["live"], date_from=day)))
+    assert len(client.requests) == sent
+    assert live and {row["status"] for row in live} <= {"IN_PLAY", "PAUSED"}
+
+    tomorrow = (NOW + timedelta(days=1)).strftime("%Y-%m-%d")
+    client.query_matches(MatchQuery("PL", ["live"], date_from=tomorrow))
+    assert len(client.requests) == sent + 1
+
+
+def test_home_without_team_is_a_usage_error():
+    result = CliRunner().invoke(cli, ["matches", "--home"])
+    assert result.exit_code == 2
+    assert "needs a team" in result.output
@@ -0,0 +1,108 @@
+import copy
+import gzip
+import pickle
+from pathlib import Path
+
+from lgdash import recording
+from lgdash.events import MatchEventEngine, GoalEvent
+from lgdash.recording import (
+    ReplayClient,
+    SessionRecorder,
+    apply,
+    diff,
+    read_recording,
+)
+
+DATA_DIR = Path(__file__).parent / "data"
+MATCHDAY = str(DATA_DIR / "matchday_20251221.jsonl.gz")
+ENDPOINT = "/v4/competitions/PL/matches"
+
+
+def _load(name: str):
+    with open(DATA_DIR / name, "rb") as f:
+        return pickle.load(f)
+
+
+def test_diff_and_apply_roundtrip():
+    old = _load("live_matches_half_20251214.pkl")
+    new = _load("live_matches_full_20251214.pkl")
+    patch = diff(old, new)
+    assert apply(old, patch) == new
+    assert diff(new, new) is None
+
+    # only the changed match is stored
+    moved = copy.deepcopy(old)
+    moved["matches"][1]["minute"] = 46
+    patch = diff(old, moved)
+    items = patch["{"]["matches"]["["]["items"]
+    assert list(items) == [str(old["matches"][1]["id"])]
+    assert apply(old, patch) == moved
+
+
+def test_apply_handles_added_and_removed():
+    old = {"a": 1, "b": [{"id": 1, "x": 1}], "c": 3}
+    new = {"a": 1, "b": [{"id": 2, "x": 2}, {"id": 1, "x": 1}], "d": [1, 2]}
+    assert apply(old, diff(old, new)) == new
+
+
+def test_recorder_roundtrip(tmp_path):
+    path = str(tmp_path / "session.jsonl.gz")
+    snapshots = [
+        _load("live_matches_midway_20251215.pkl"),
+        _load("live_matches_midway2_20251215.pkl"),
+        _load("live_matches_midway2_20251215.pkl"),
+    ]
+    with SessionRecorder(path) as recorder:
+        for i, data in enumerate(snapshots):
+            recorder.record(ENDPOINT, {}, data, at=i * 60.0)
+
+    frames = list(read_recording(path))
+    assert [f["t"] for f in frames] == [0.0, 60.0, 120.0]
+    assert [f["data"] for f in frames] == snapshots
+
+
+def test_truncated_recording_reads_complete_frames(tmp_path):
+    path = tmp_path / "cut.jsonl.gz"
+    raw = gzip.decompress(Path(MATCHDAY).read_bytes())
+    # drop the tail of the last frame
+    path.write_bytes(gzip.compress(raw[:-20]))
+    assert len(list(read_recording(str(path)))) == 2
+
+
+def test_fixture_frames():
+    frames = list(read_recording(MATCHDAY))
+    assert [f["t"] for f in frames] == [0, 7800, 18720]
+    assert {f["endpoint"] for f in frames} == {ENDPOINT}
+    assert [f["data"]["resultSet"]["played"] for f in frames] == [1, 1, 4]
+
+
+def test_replay_steps_through_client_and_events():
+    client = ReplayClient(MATCHDAY, speed=None)
+    engine = MatchEventEngine()
+    client.add_matches_hook(engine.update)
+
+    scores = []
+    while True:
+        df, metadata = client.get_matches(league="PL")
+        scores.append(int(df["home_score"].sum() + df["away_score"].sum()))
+        if client.finished:
+            break
+
+    assert scores == [3, 10, 17]
+    assert metadata["resultSet"]["played"] == 4
+    assert len([e for e in engine.recent if isinstance(e, GoalEvent)]) == 14
+
+
+def test_replay_speed_uses_virtual_clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(recording.time, "monotonic", lambda: now[0])
+    client = ReplayClient(MATCHDAY, speed=60)
+
+    played = []
+    for wall_seconds in [0, 60, 130, 312, 400]:
+        now[0] = 1000.0 + wall_seconds
+        _, metadata = client.get_matches(league="PL")
+        played.append(metadata["resultSet"]["played"])
+    # frames recorded at 0s, 2h10m and 5h12m of match time
+    assert played == [1, 1, 1, 4, 4]
+    assert client.finished
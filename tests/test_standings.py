@@ -0,0 +1,220 @@
+import random
+import time
+
+import pandas as pd
+import pytest
+
+from lgdash.client import FootballDataClient
+from lgdash.fake_api import round_robin
+from lgdash.standings import (
+    LiveTable,
+    StandingsTimeline,
+    compute_standings,
+    season_metadata,
+)
+
+TEAMS = [(i, f"Team {chr(65 + i)}", f"T{chr(65 + i)}X") for i in range(20)]
+
+
+def _make_match(match_id, home, away, status, home_score, away_score, matchday=1):
+    return {
+        "id": match_id,
+        "utcDate": "2024-12-21T15:00:00Z",
+        "status": status,
+        "minute": None,
+        "injuryTime": None,
+        "matchday": matchday,
+        "stage": "REGULAR_SEASON",
+        "homeTeam": {"id": home[0], "shortName": home[1], "tla": home[2]},
+        "awayTeam": {"id": away[0], "shortName": away[1], "tla": away[2]},
+        "score": {"fullTime": {"home": home_score, "away": away_score}},
+    }
+
+
+def _season(played_rounds: int, seed: int = 7):
+    rng = random.Random(seed)
+    matches, match_id = [], 1
+    for home in TEAMS:
+        for away in TEAMS:
+            if home == away:
+                continue
+            finished = rng.random() < played_rounds / 38
+            scores = (rng.randint(0, 4), rng.randint(0, 3)) if finished else (None,) * 2
+            status = "FINISHED" if finished else "TIMED"
+            matches.append(_make_match(match_id, home, away, status, *scores))
+            match_id += 1
+    return matches
+
+
+def _expected_standings(matches):
+    """Reference table built the slow way, as the standings endpoint would."""
+    rows = {
+        t[0]: {"team": t[1], "tla": t[2], "w": 0, "d": 0, "l": 0, "gf": 0, "ga": 0}
+        for t in TEAMS
+    }
+    for m in matches:
+        if m["status"] != "FINISHED":
+            continue
+        h, a = m["score"]["fullTime"]["home"], m["score"]["fullTime"]["away"]
+        for team, gf, ga in [(m["homeTeam"]["id"], h, a), (m["awayTeam"]["id"], a, h)]:
+            row = rows[team]
+            row["gf"] += gf
+            row["ga"] += ga
+            row["w" if gf > ga else "d" if gf == ga else "l"] += 1
+    table = sorted(
+        rows.values(),
+        key=lambda r: (
+            -(3 * r["w"] + r["d"]),
+            -(r["gf"] - r["ga"]),
+            -r["gf"],
+            r["team"],
+        ),
+    )
+    return [
+        {
+            "position": i + 1,
+            "team": {"shortName": r["team"], "tla": r["tla"], "crest": None},
+            "points": 3 * r["w"] + r["d"],
+            "playedGames": r["w"] + r["d"] + r["l"],
+            "won": r["w"],
+            "draw": r["d"],
+            "lost": r["l"],
+            "goalsFor": r["gf"],
+            "goalsAgainst": r["ga"],
+            "goalDifference": r["gf"] - r["ga"],
+        }
+        for i, r in enumerate(table)
+    ]
+
+
+def test_matches_standings_endpoint_shape_and_values():
+    client = FootballDataClient("")
+    matches = _season(played_rounds=17)
+    df = client._build_matches_df(matches)
+
+    computed = compute_standings(df, "PL")
+    expected = client._build_standings_df(_expected_standings(matches))
+
+    pd.testing.assert_frame_equal(computed, expected, check_dtype=False)
+    assert list(computed.columns) == list(expected.columns)
+    assert (computed.dtypes.iloc[4:] == "Int64").all()
+
+
+def test_live_table_incremental_update_matches_full_rebuild():
+    client = FootballDataClient("")
+    matches = _season(played_rounds=20)
+    table = LiveTable(client._build_matches_df(matches), "PL")
+
+    # a few scheduled matches kick off and one finished score is corrected
+    scheduled = [m for m in matches if m["status"] == "TIMED"][:3]
+    live = [
+        dict(m, status="IN_PLAY", score={"fullTime": {"home": 1, "away": 0}})
+        for m in scheduled
+    ]
+    finished = next(m for m in matches if m["status"] == "FINISHED")
+    corrected = dict(finished, score={"fullTime": {"home": 9, "away": 0}})
+    assert table.update(client._build_matches_df(live + [corrected])) == 4
+    # same data again changes nothing
+    assert table.update(client._build_matches_df(live + [corrected])) == 0
+
+    replaced = {m["id"]: m for m in live + [corrected]}
+    rebuilt = LiveTable(
+        client._build_matches_df([replaced.get(m["id"], m) for m in matches]), "PL"
+    )
+    pd.testing.assert_frame_equal(table.table(), rebuilt.table())
+
+    # in-progress matches only count in live mode
+    not_live = compute_standings(
+        client._build_matches_df([replaced.get(m["id"], m) for m in matches]), "PL"
+    )
+    assert not_live["played"].sum() == table.table()["played"].sum() - 6
+
+
+@pytest.mark.benchmark
+def test_update_is_fast():
+    client = FootballDataClient("")
+    matches = _season(played_rounds=30)
+    table = LiveTable(client._build_matches_df(matches), "PL")
+    live = client._build_matches_df([dict(m, status="IN_PLAY") for m in matches[:10]])
+    start = time.perf_counter()
+    for _ in range(100):
+        table.update(live)
+    assert (time.perf_counter() - start) / 100 < 0.01
+
+
+def test_head_to_head_tiebreak():
+    client = FootballDataClient("")
+    a, b, c = TEAMS[:3]
+    matches = [
+        # A and B level on points, B won the meeting, A has better GD
+        _make_match(1, b, a, "FINISHED", 1, 0),
+        _make_match(2, a, c, "FINISHED", 5, 0),
+    ]
+    df = client._build_matches_df(matches)
+    assert list(compute_standings(df, "PL")["team"]) == [a[1], b[1], c[1]]
+    assert list(compute_standings(df, "SA")["team"]) == [b[1], a[1], c[1]]
+
+
+def test_season_metadata():
+    metadata = season_metadata(
+        {"resultSet": {"first": "2024-08-16", "last": "2025-05-25"}}
+    )
+    assert metadata["season"]["startDate"][:4] == "2024"
+    assert metadata["season"]["endDate"][:4] == "2025"
+
+
+def _rounds(played_rounds: int, seed: int = 3):
+    rng = random.Random(seed)
+    matches = []
+    for day, pairs in enumerate(round_robin(len(TEAMS))):
+        for home, away in pairs:
+            finished = day < played_rounds
+            scores = (rng.randint(0, 4), rng.randint(0, 3)) if finished else (None,) * 2
+            status = "FINISHED" if finished else "TIMED"
+            matches.append(
+                _make_match(
+                    len(matches) + 1,
+                    TEAMS[home],
+                    TEAMS[away],
+                    status,
+                    *scores,
+                    matchday=day + 1,
+                )
+            )
+    return matches
+
+
+def test_timeline_matches_table_rebuilt_per_matchday():
+    client = FootballDataClient("")
+    matches = _rounds(played_rounds=30)
+    timeline = StandingsTimeline(client._build_matches_df(matches), "PL")
+    assert (timeline.matchdays, timeline.played) == (38, 30)
+
+    for matchday in (1, 17, 30, 38):
+        upto = [
+            m if m["matchday"] <= matchday else dict(m, status="TIMED") for m in matches
+        ]
+        expected = compute_standings(client._build_matches_df(upto), "PL")
+        pd.testing.assert_frame_equal(timeline.table(matchday), expected)
+
+    positions = timeline.positions()
+    assert list(positions.columns) == list(range(1, 31))
+    assert list(positions.index) == list(timeline.table(30)["team"])
+    assert list(timeline.positions(last=5).columns) == list(range(26, 31))
+    assert len(list(timeline.records())) == 30 * len(TEAMS)
+
+
+@pytest.mark.benchmark
+def test_timeline_is_fast():
+    client = FootballDataClient("")
+    df = client._build_matches_df(_rounds(played_rounds=38))
+    start = time.perf_counter()
+    timeline = StandingsTimeline(df, "PL")
+    tables = [timeline.table(matchday) for matchday in range(1, 39)]
+    assert time.perf_counter() - start < 0.5
+    assert tables[-1]["played"].tolist() == [38] * len(TEAMS)
+
+
+def test_empty_timeline():
+    timeline = StandingsTimeline(pd.DataFrame(), "PL")
+    assert timeline.played == 0 and timeline.positions().empty
@@ -0,0 +1,99 @@
+import pandas as pd
+
+from lgdash import stats as stats_module
+from lgdash.cache import FileCache
+from lgdash.client import FootballDataClient
+from lgdash.stats import dataset_version, season_stats, team_results
+
+ARS = (57, "Arsenal", "ARS")
+CHE = (61, "Chelsea", "CHE")
+LIV = (64, "Liverpool", "LIV")
+
+
+def _match(match_id, day, home, away, home_score, away_score, status="FINISHED"):
+    return {
+        "id": match_id,
+        "utcDate": f"2024-12-{day:02d}T15:00:00Z",
+        "status": status,
+        "minute": None,
+        "injuryTime": None,
+        "matchday": day,
+        "homeTeam": {"id": home[0], "shortName": home[1], "tla": home[2]},
+        "awayTeam": {"id": away[0], "shortName": away[1], "tla": away[2]},
+        "score": {"fullTime": {"home": home_score, "away": away_score}},
+    }
+
+
+MATCHES = [
+    _match(1, 1, ARS, CHE, 2, 0),
+    _match(2, 2, LIV, ARS, 1, 1),
+    _match(3, 3, CHE, LIV, 0, 3),
+    _match(4, 4, CHE, ARS, 2, 1),
+    _match(5, 5, ARS, LIV, 0, 1),
+    _match(6, 6, LIV, CHE, None, None, status="TIMED"),
+]
+
+
+def _df(matches=MATCHES):
+    return FootballDataClient("")._build_matches_df(matches)
+
+
+def test_team_results_long_form():
+    results = team_results(_df())
+    assert len(results) == 10
+    arsenal = results[results["team"] == "Arsenal"]
+    assert "".join(arsenal["result"]) == "WDLL"
+    assert arsenal["points"].sum() == 4
+
+
+def test_form():
+    stats = season_stats(_df(), "PL", "2024")
+    form = stats.form()
+    assert form.set_index("team").loc["Liverpool", "form"] == "DWW"
+    assert form.iloc[0]["team"] == "Liverpool"
+    assert stats.form(team="ars", last=2)["form"].tolist() == ["LL"]
+
+
+def test_splits():
+    splits = season_stats(_df(), "PL", "2024").splits(team="Chelsea")
+    row = splits.iloc[0]
+    assert (row["home_played"], row["home_won"], row["home_lost"]) == (2, 1, 1)
+    assert (row["away_played"], row["away_lost"], row["away_points"]) == (1, 1, 0)
+
+
+def test_head_to_head():
+    summary, meetings = season_stats(_df(), "PL", "2024").head_to_head("ARS", "che")
+    assert (summary["won"], summary["lost"]) == (1, 1)
+    assert (summary["goals_for"], summary["goals_against"]) == (3, 2)
+    assert meetings["venue"].tolist() == ["HOME", "AWAY"]
+
+
+def test_unknown_team():
+    stats = season_stats(_df(), "PL", "2024")
+    try:
+        stats.form(team="Spurs")
+    except ValueError as e:
+        assert "Spurs" in str(e)
+    else:
+        raise AssertionError("expected ValueError")
+
+
+def test_cached_per_dataset_version(tmp_path, monkeypatch):
+    cache = FileCache(str(tmp_path))
+    first = season_stats(_df(), "PL", "2024", cache)
+    form, splits = first.form(), first.splits()
+
+    # a later run reads the tables instead of computing them
+    monkeypatch.setattr(stats_module, "team_results", None)
+    again = season_stats(_df(), "PL", "2024", cache)
+    pd.testing.assert_frame_equal(again.form(team="ars"), first.form(team="ars"))
+    pd.testing.assert_frame_equal(again.splits(), splits)
+    pd.testing.assert_frame_equal(again.form(), form)
+    monkeypatch.undo()
+
+    played = list(MATCHES)
+    played[-1] = _match(6, 6, LIV, CHE, 2, 2)
+    updated = season_stats(_df(played), "PL", "2024", cache)
+    assert updated.form(team="che")["form"].tolist() == ["LLWD"]
+    assert dataset_version(_df(played)) != dataset_version(_df())
+    assert dataset_version(pd.DataFrame()) == "empty"
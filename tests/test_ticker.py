@@ -0,0 +1,102 @@
+import json
+import subprocess
+import sys
+from datetime import date, datetime, timezone
+
+from lgdash.cache import FileCache, utc_date_key
+from lgdash.ticker import (
+    cached_matches,
+    format_match,
+    main,
+    snapshot_matches,
+    ticker_line,
+)
+
+NOW = datetime(2024, 12, 21, 16, 0, tzinfo=timezone.utc)
+
+
+def _match(home, away, status, score=(None, None), minute=None, kickoff="15:00"):
+    return {
+        "homeTeam": {"tla": home},
+        "awayTeam": {"tla": away},
+        "score": {"fullTime": {"home": score[0], "away": score[1]}},
+        "status": status,
+        "minute": minute,
+        "injuryTime": None,
+        "utcDate": f"2024-12-21T{kickoff}:00Z",
+    }
+
+
+MATCHES = [
+    _match("LIV", "MCI", "PAUSED", (0, 0), kickoff="15:30"),
+    _match("ARS", "CHE", "IN_PLAY", (2, 1), minute=67),
+    _match("TOT", "NEW", "TIMED", kickoff="20:00"),
+    _match("EVE", "FUL", "FINISHED", (1, 1), kickoff="12:30"),
+]
+
+
+def _row(**kwargs):
+    row = {
+        "home_team_code": "ARS",
+        "away_team_code": "CHE",
+        "home_score": 2,
+        "away_score": 1,
+        "status": "IN_PLAY",
+        "minute": 67,
+        "injury_time": None,
+        "utc_datetime": "2024-12-21T15:00:00Z",
+    }
+    row.update(kwargs)
+    return row
+
+
+def test_format_match():
+    assert format_match(_row()) == "ARS 2-1 CHE 67'"
+    assert format_match(_row(minute=90, injury_time=3)) == "ARS 2-1 CHE 90+3'"
+    assert format_match(_row(status="PAUSED")) == "ARS 2-1 CHE HT"
+    assert format_match(_row(status="POSTPONED")) == "ARS v CHE PP"
+    upcoming = _row(status="TIMED", home_score=None, away_score=None)
+    assert format_match(upcoming, timezone.utc) == "ARS v CHE 15:00"
+
+
+def test_ticker_line_from_cache(tmp_path):
+    cache = FileCache(str(tmp_path))
+    cache.set(utc_date_key("PL", date(2024, 12, 21)), {"matches": MATCHES}, 60)
+    rows = cached_matches(["PL", "SA"], NOW, cache)
+    assert len(rows) == 4
+    assert ticker_line(rows, NOW) == "ARS 2-1 CHE 67' | LIV 0-0 MCI HT"
+    assert ticker_line(rows, NOW, show_all=True, separator=" / ").split(" / ") == [
+        "EVE 1-1 FUL FT",
+        "ARS 2-1 CHE 67'",
+        "LIV 0-0 MCI HT",
+        "TOT v NEW 20:00",
+    ]
+
+
+def test_snapshot_formats(tmp_path):
+    raw = tmp_path / "raw.json"
+    raw.write_text(json.dumps({"matches": MATCHES}))
+    assert len(snapshot_matches(str(raw))) == 4
+    ndjson = tmp_path / "rows.ndjson"
+    ndjson.write_text("\n".join(json.dumps(_row(id=i)) for i in range(2)) + "\n")
+    assert [row["id"] for row in snapshot_matches(str(ndjson))] == [0, 1]
+
+
+def test_missing_snapshot_goes_to_stderr(tmp_path, capsys):
+    assert main(["--snapshot", str(tmp_path / "missing.json")]) == 1
+    assert capsys.readouterr().out == ""
+
+
+def test_ticker_skips_heavy_imports(tmp_path):
+    script = (
+        "import sys\n"
+        "from lgdash.ticker import main\n"
+        f"main(['--snapshot', {str(tmp_path / 'rows.json')!r}])\n"
+        "heavy = ('pandas', 'rich', 'requests', 'click')\n"
+        "print(sorted(m for m in heavy if m in sys.modules))\n"
+    )
+    (tmp_path / "rows.json").write_text(json.dumps([_row()]))
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,186 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from lgdash import client as client_module
+from lgdash.cache import FileCache
+from lgdash.client import FootballDataClient
+from lgdash.warm import CacheWarmer, peak_windows
+
+
+def _match(match_id, utc_date, status="TIMED"):
+    return {
+        "id": match_id,
+        "homeTeam": {"id": 1, "shortName": "Arsenal", "tla": "ARS"},
+        "awayTeam": {"id": 2, "shortName": "Chelsea", "tla": "CHE"},
+        "score": {"fullTime": {"home": None, "away": None}},
+        "status": status,
+        "minute": None,
+        "injuryTime": None,
+        "matchday": 17,
+        "stage": "REGULAR_SEASON",
+        "utcDate": utc_date,
+    }
+
+
+MATCHES = [
+    _match(1, "2024-12-20T20:00:00Z", "FINISHED"),
+    _match(2, "2024-12-21T15:00:00Z"),
+    _match(3, "2024-12-21T17:30:00Z"),
+]
+STANDINGS = {
+    "standings": [
+        {
+            "type": "TOTAL",
+            "table": [
+                {
+                    "position": 1,
+                    "team": {"shortName": "Arsenal", "tla": "ARS", "crest": ""},
+                    "points": 30,
+                    "playedGames": 16,
+                    "won": 9,
+                    "draw": 3,
+                    "lost": 4,
+                    "goalsFor": 30,
+                    "goalsAgainst": 15,
+                    "goalDifference": 15,
+                }
+            ],
+        }
+    ]
+}
+TEAMS = {
+    "teams": [
+        {
+            "id": 1,
+            "shortName": "Arsenal",
+            "name": "Arsenal FC",
+            "tla": "ARS",
+            "area": {"name": "England"},
+        }
+    ]
+}
+
+
+class FakeResponse:
+    status_code = 200
+    content = b"{}"
+    headers = {}
+
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+class _Frozen(datetime):
+    # the client's clock, at the warmers' 10:00
+    @classmethod
+    def now(cls, tz=None):
+        return datetime(2024, 12, 21, 10, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def warm_client(tmp_path, monkeypatch):
+    log = []
+
+    def fake_get(url, params=None, headers=None, timeout=None):
+        endpoint = url.split("/competitions/PL/")[1]
+        log.append(endpoint)
+        if endpoint == "standings":
+            return FakeResponse(STANDINGS)
+        if endpoint == "teams":
+            return FakeResponse(TEAMS)
+        matches = MATCHES
+        if params:
+            matches = [
+                m
+                for m in MATCHES
+                if params["dateFrom"] <= m["utcDate"][:10] <= params["dateTo"]
+            ]
+        return FakeResponse({"filters": {"season": "2024"}, "matches": matches})
+
+    monkeypatch.setattr(client_module.requests, "get", fake_get)
+    monkeypatch.setattr(client_module, "datetime", _Frozen)
+    client = FootballDataClient("", cache=FileCache(str(tmp_path)))
+    client._timezone = timezone.utc
+    return client, log
+
+
+def _at(hour, minute=0):
+    return lambda: datetime(2024, 12, 21, hour, minute, tzinfo=timezone.utc)
+
+
+def test_peak_windows_merge_overlapping_kickoffs():
+    kickoffs = [
+        datetime(2024, 12, 21, 12, 30, tzinfo=timezone.utc),
+        datetime(2024, 12, 21, 15, 0, tzinfo=timezone.utc),
+        datetime(2024, 12, 21, 20, 0, tzinfo=timezone.utc),
+    ]
+    windows = peak_windows(kickoffs)
+    assert [(s.strftime("%H:%M"), e.strftime("%H:%M")) for s, e in windows] == [
+        ("12:00", "17:30"),
+        ("19:30", "22:30"),
+    ]
+
+
+def test_warm_fills_cache_until_next_peak(warm_client, monkeypatch):
+    client, log = warm_client
+    ttls = {}
+    set_entry = client.cache.set
+
+    def recording_set(key, value, ttl):
+        ttls[key] = ttl
+        set_entry(key, value, ttl)
+
+    monkeypatch.setattr(client.cache, "set", recording_set)
+
+    warmer = CacheWarmer(client, ["PL"], days=1, per_minute=60000, clock=_at(10))
+    assert warmer.current_peak() is None
+    results = warmer.run()
+
+    assert [r.item for r in results] == ["fixtures", "standings", "teams", "season"]
+    assert all(r.requests == 1 and r.error is None for r in results)
+    assert log == ["matches", "standings", "teams", "matches"]
+    # the schedule just fetched puts the first kickoff at 15:00, so the
+    # busy window opens at 14:30
+    assert ttls["/v4/competitions/PL/standings?"] == 4.5 * 60 * 60
+    assert ttls["/v4/competitions/PL/matches?"] == 4.5 * 60 * 60
+
+    # a second run is served from the cache
+    results = warmer.run()
+    assert all(r.requests == 0 for r in results)
+    assert len(log) == 4
+
+
+def test_warm_refreshes_entries_expiring_before_the_window(warm_client):
+    client, log = warm_client
+    stale = {"standings": [{"type": "TOTAL", "table": []}]}
+    client.cache.set("/v4/competitions/PL/standings?", stale, 30)
+
+    warmer = CacheWarmer(client, ["PL"], days=1, per_minute=60000, clock=_at(10))
+    results = warmer.run()
+    assert {r.item: r.requests for r in results}["standings"] == 1
+    assert "standings" in log
+    assert client.cache.get("/v4/competitions/PL/standings?") == STANDINGS
+    # good until the window opens at 14:30
+    assert client.cache.get("/v4/competitions/PL/standings?", fresh_for=4 * 60 * 60)
+    assert client.fresh_for == 0
+
+
+def test_warm_stops_during_match_window(warm_client):
+    client, log = warm_client
+    CacheWarmer(client, ["PL"], days=1, per_minute=60000, clock=_at(10)).run()
+    log.clear()
+
+    warmer = CacheWarmer(client, ["PL"], days=1, per_minute=60000, clock=_at(16))
+    start, end = warmer.current_peak()
+    assert (start.hour, start.minute, end.hour, end.minute) == (14, 30, 20, 0)
+    assert warmer.run() == []
+    assert log == []
+
+    assert len(warmer.run(force=True)) == 4